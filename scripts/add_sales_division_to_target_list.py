@@ -1,5 +1,9 @@
 import json
 import re
+import sys
+
+from company_index import bounded_similarity, build_name_index, find_candidates
+from company_keys import canonical_name, phonetic_key, romanize_hangul
 
 def normalize_company_name(name):
     """기업명을 정규화하는 함수"""
@@ -22,22 +26,113 @@ def normalize_company_name(name):
     
     return ' '.join(words)
 
-def find_sales_division(company_name, sales_division_data):
-    """기업명에 해당하는 영업조직을 찾는 함수"""
-    normalized_company = normalize_company_name(company_name)
-    
+def build_sales_division_lookup(sales_division_data):
+    """정규화된 기업명(국문/영문) → 영업조직 사전을 한 번만 만드는 함수
+
+    같은 이름이 여러 레코드에 있으면 먼저 나온 레코드의 영업조직을 사용하고,
+    서로 다른 영업조직으로 충돌한 이름은 collisions에 모아 반환한다.
+    정규화 결과가 빈 이름(이름 없음, 접미사만 있는 이름 등)은 사전에 넣지 않는다.
+    """
+    lookup = {}
+    collisions = {}
+
     for record in sales_division_data:
-        # 한국어 기업명 매칭
-        normalized_kr = normalize_company_name(record['company_name_kr'])
-        if normalized_company == normalized_kr:
-            return record['sales_division']
-        
-        # 영어 기업명 매칭
-        normalized_en = normalize_company_name(record['company_name_en'])
-        if normalized_company == normalized_en:
-            return record['sales_division']
-    
-    return ''
+        sales_division = record['sales_division']
+        for key in (normalize_company_name(record['company_name_kr']),
+                    normalize_company_name(record['company_name_en'])):
+            if not key:
+                continue
+            if key not in lookup:
+                lookup[key] = sales_division
+            elif lookup[key] != sales_division:
+                collisions.setdefault(key, {lookup[key]}).add(sales_division)
+
+    return lookup, collisions
+
+def _romanized_name(name):
+    """발음 키 후보 채점용 이름 (접미사 제거 후 로마자 표기, 공백 없음)"""
+    return romanize_hangul(canonical_name(name)).replace(' ', '')
+
+def build_phonetic_lookup(sales_division_data):
+    """국문/영문 기업명의 발음 키 → 영업조직 후보 사전을 만드는 함수
+
+    국문 타겟 기업명과 영문 레코드(또는 그 반대)를 O(1) 조회로 연결하는 데 사용한다.
+    발음 키(자음 골격)는 서로 다른 기업끼리도 겹치므로('Tata Steel'/'Toto Steel' → 'tstl'),
+    둘 이상의 레코드나 영업조직에 걸친 키는 사전에서 빼고 collisions에 모아 반환한다.
+    후보에는 채점용 로마자 국문명/정규화 영문명을 함께 담는다.
+    """
+    records_by_key = {}
+    for position, record in enumerate(sales_division_data):
+        for name in (record['company_name_kr'], record['company_name_en']):
+            key = phonetic_key(name)
+            if key:
+                records_by_key.setdefault(key, {})[position] = record
+
+    phonetic_lookup = {}
+    collisions = {}
+    for key, records in records_by_key.items():
+        divisions = {record['sales_division'] for record in records.values()}
+        if len(records) > 1 or len(divisions) > 1:
+            collisions[key] = divisions
+            continue
+        record = next(iter(records.values()))
+        names = {_romanized_name(record['company_name_kr']), _romanized_name(record['company_name_en'])}
+        phonetic_lookup[key] = {
+            'sales_division': record['sales_division'],
+            'names': [name for name in names if name],
+        }
+
+    return phonetic_lookup, collisions
+
+def build_fuzzy_index(lookup):
+    """유사 매칭 폴백에 쓸 후보 인덱스를 만드는 함수"""
+    names = list(lookup)
+    return {'names': names, 'index': build_name_index(names)}
+
+def find_sales_division(company_name, lookup, fuzzy_index=None, similarity_threshold=0.9, phonetic_lookup=None):
+    """기업명에 해당하는 영업조직을 찾는 함수
+
+    정규화된 이름으로 사전을 조회하고, 없고 fuzzy_index가 주어지면 후보 인덱스로 좁힌 이름들 중
+    가장 유사한 이름의 영업조직을 반환한다.
+    둘 다 없으면 phonetic_lookup(국문↔영문 발음 키)의 후보를 로마자 표기끼리 채점해
+    similarity_threshold 이상일 때만 그 영업조직을 반환한다.
+    """
+    normalized_company = normalize_company_name(company_name)
+
+    if normalized_company and normalized_company in lookup:
+        return lookup[normalized_company]
+
+    sales_division = _find_fuzzy(normalized_company, lookup, fuzzy_index, similarity_threshold)
+    if not sales_division and phonetic_lookup:
+        sales_division = _find_phonetic(company_name, phonetic_lookup, similarity_threshold)
+    return sales_division
+
+def _find_fuzzy(normalized_company, lookup, fuzzy_index, similarity_threshold):
+    """후보 인덱스로 좁힌 이름들 중 가장 유사한 이름의 영업조직 (없으면 '')"""
+    if fuzzy_index is None or not normalized_company:
+        return ''
+
+    best_name = None
+    best_similarity = 0
+    for pos in sorted(find_candidates(fuzzy_index['index'], normalized_company)):
+        name = fuzzy_index['names'][pos]
+        similarity = bounded_similarity(normalized_company, name, max(similarity_threshold, best_similarity))
+        if similarity >= similarity_threshold and similarity > best_similarity:
+            best_name = name
+            best_similarity = similarity
+
+    return lookup[best_name] if best_name is not None else ''
+
+def _find_phonetic(company_name, phonetic_lookup, similarity_threshold):
+    """발음 키가 같은 후보를 로마자 표기 유사도로 채점해 임계값 이상이면 영업조직을 반환 (없으면 '')"""
+    candidate = phonetic_lookup.get(phonetic_key(company_name))
+    name = _romanized_name(company_name)
+    if candidate is None or not name:
+        return ''
+
+    similarity = max((bounded_similarity(name, candidate_name, similarity_threshold)
+                      for candidate_name in candidate['names']), default=0)
+    return candidate['sales_division'] if similarity >= similarity_threshold else ''
 
 def add_sales_division_to_target_list():
     """타겟 리스트에 영업조직 정보를 추가하는 함수"""
@@ -48,6 +143,27 @@ def add_sales_division_to_target_list():
     
     print(f"영업조직 데이터 로드: {len(sales_division_data)}개 레코드")
     
+    # 정규화된 기업명 → 영업조직 사전 생성
+    lookup, collisions = build_sales_division_lookup(sales_division_data)
+    print(f"기업명 사전 생성: {len(lookup)}개 키")
+    if collisions:
+        print(f"⚠️ 서로 다른 영업조직으로 충돌한 기업명: {len(collisions)}개 (먼저 나온 레코드 기준 적용)")
+        for key, divisions in list(collisions.items())[:10]:
+            print(f"   - {key}: {', '.join(sorted(divisions))}")
+    
+    # --fuzzy 옵션이 있으면 정확히 일치하지 않는 기업명에 유사 매칭 적용
+    fuzzy_index = build_fuzzy_index(lookup) if '--fuzzy' in sys.argv[1:] else None
+    
+    # --cross-script 옵션이 있으면 국문↔영문 발음 키로도 조회
+    phonetic_lookup = None
+    if '--cross-script' in sys.argv[1:]:
+        phonetic_lookup, phonetic_collisions = build_phonetic_lookup(sales_division_data)
+        print(f"발음 키 사전 생성: {len(phonetic_lookup)}개 키")
+        if phonetic_collisions:
+            print(f"⚠️ 여러 기업/영업조직이 겹친 발음 키: {len(phonetic_collisions)}개 (발음 키 매칭에서 제외)")
+            for key, divisions in list(phonetic_collisions.items())[:10]:
+                print(f"   - {key}: {', '.join(sorted(divisions))}")
+    
     # 타겟 리스트 파일 읽기
     with open('src/pages/MarketingReport/BusinessFeasibilitySections4.tsx', 'r', encoding='utf-8') as f:
         content = f.read()
@@ -70,7 +186,7 @@ def add_sales_division_to_target_list():
                 name_match = re.search(r"name: '([^']+)'", line)
                 if name_match:
                     company_name = name_match.group(1)
-                    sales_division = find_sales_division(company_name, sales_division_data)
+                    sales_division = find_sales_division(company_name, lookup, fuzzy_index, phonetic_lookup=phonetic_lookup)
                     
                     if sales_division:
                         # 영업조직 정보 추가
@@ -113,7 +229,7 @@ def add_sales_division_to_target_list():
                 name_match = re.search(r"name: '([^']+)'", line)
                 if name_match:
                     company_name = name_match.group(1)
-                    sales_division = find_sales_division(company_name, sales_division_data)
+                    sales_division = find_sales_division(company_name, lookup, fuzzy_index, phonetic_lookup=phonetic_lookup)
                     
                     if sales_division:
                         # 영업조직 정보 추가
@@ -0,0 +1,64 @@
+from collections import deque
+
+# Aho–Corasick 다중 문자열 검색
+# 여러 패턴(예: 영업조직 국문 기업명)을 하나의 오토마톤으로 만들어
+# 각 텍스트(예: KOTRA 현지주소)를 한 번만 훑으면서 포함된 패턴을 모두 찾는다.
+
+def build_automaton(patterns):
+    """패턴 리스트로 Aho–Corasick 오토마톤을 만드는 함수
+
+    패턴의 위치(0부터)가 패턴 번호가 되며, 빈 문자열 패턴은 무시한다.
+    """
+    goto = [{}]
+    fail = [0]
+    output = [[]]
+
+    # 1. 트라이 구성
+    for pattern_id, pattern in enumerate(patterns):
+        if not pattern:
+            continue
+        node = 0
+        for ch in pattern:
+            next_node = goto[node].get(ch)
+            if next_node is None:
+                next_node = len(goto)
+                goto[node][ch] = next_node
+                goto.append({})
+                fail.append(0)
+                output.append([])
+            node = next_node
+        output[node].append(pattern_id)
+
+    # 2. BFS로 실패 링크 연결 및 출력 병합
+    queue = deque(goto[0].values())
+    while queue:
+        node = queue.popleft()
+        for ch, next_node in goto[node].items():
+            queue.append(next_node)
+
+            state = fail[node]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            fail[next_node] = goto[state].get(ch, 0)
+
+            if output[fail[next_node]]:
+                output[next_node] = output[next_node] + output[fail[next_node]]
+
+    return {'goto': goto, 'fail': fail, 'output': output}
+
+def find_patterns(automaton, text):
+    """텍스트에 포함된 모든 패턴 번호 집합을 반환하는 함수"""
+    goto = automaton['goto']
+    fail = automaton['fail']
+    output = automaton['output']
+
+    found = set()
+    node = 0
+    for ch in text:
+        while node and ch not in goto[node]:
+            node = fail[node]
+        node = goto[node].get(ch, 0)
+        if output[node]:
+            found.update(output[node])
+
+    return found
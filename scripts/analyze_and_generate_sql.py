@@ -1,56 +1,149 @@
 import csv
 import os
+import sys
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from dedup_engine import COMPLETENESS, deduplicate
+
 # .env 파일 로드
 load_dotenv()
 
-def analyze_and_generate_sql():
-    """sales_division 기준으로 중복을 제거하고 SQL문을 생성하는 함수"""
-    
-    # Supabase 설정
-    supabase_url = os.getenv('VITE_SUPABASE_URL')
-    supabase_key = os.getenv('VITE_SUPABASE_KEY')
-    
-    if not supabase_url or not supabase_key:
-        print("❌ Supabase 환경변수가 설정되지 않았습니다.")
-        print("다음 환경변수를 설정해주세요:")
-        print("- VITE_SUPABASE_URL")
-        print("- VITE_SUPABASE_KEY")
-        return
+INSERT_COLUMNS = """  region, country, office, company_name_kr, company_name_en, company_name_cn,
+  local_address, local_zipcode, entry_type, investment_type, parent_company,
+  industry_major, industry_minor, sales_division, sales_division_match_type, sales_division_similarity"""
+
+def _insert_values(record):
+    """레코드를 INSERT VALUES 항목 리스트로 변환하는 함수"""
+    # SQL 인젝션 방지를 위한 이스케이프 처리
+    company_name_kr = record['company_name_kr'].replace("'", "''")
+    company_name_en = record['company_name_en'].replace("'", "''") if record['company_name_en'] else ''
+    company_name_cn = record['company_name_cn'].replace("'", "''") if record['company_name_cn'] else ''
+    local_address = record['local_address'].replace("'", "''") if record['local_address'] else ''
+    parent_company = record['parent_company'].replace("'", "''") if record['parent_company'] else ''
+    
+    values = [
+        f"'{record['region']}'",
+        f"'{record['country']}'",
+        f"'{record['office']}'",
+        f"'{company_name_kr}'",
+        f"'{company_name_en}'" if company_name_en else 'NULL',
+        f"'{company_name_cn}'" if company_name_cn else 'NULL',
+        f"'{local_address}'" if local_address else 'NULL',
+        f"'{record['local_zipcode']}'" if record['local_zipcode'] else 'NULL',
+        f"'{record['entry_type']}'" if record['entry_type'] else 'NULL',
+        f"'{record['investment_type']}'" if record['investment_type'] else 'NULL',
+        f"'{parent_company}'" if parent_company else 'NULL',
+        f"'{record['industry_major']}'" if record['industry_major'] else 'NULL',
+        f"'{record['industry_minor']}'" if record['industry_minor'] else 'NULL',
+        f"'{record['sales_division']}'",
+        f"'{record['sales_division_match_type']}'",
+        f"{record['sales_division_similarity']}"
+    ]
+    return values
+
+def generate_staging_sql(csv_records):
+    """기존 기업 조회 없이 서버에서 처리하는 SQL문을 생성하는 함수
+    
+    CSV 레코드를 임시 스테이징 테이블에 넣고,
+    sales_division이 없는 기존 기업은 UPDATE, kotra에 없는 기업은 INSERT ... WHERE NOT EXISTS로 추가한다.
+    """
+    if not csv_records:
+        return []
+    
+    sql_statements = ["BEGIN;", ""]
+    
+    sql_statements.append("-- CSV 레코드 스테이징")
+    sql_statements.append("CREATE TEMP TABLE kotra_staging_csv (")
+    sql_statements.append("  region TEXT, country TEXT, office TEXT, company_name_kr TEXT, company_name_en TEXT, company_name_cn TEXT,")
+    sql_statements.append("  local_address TEXT, local_zipcode TEXT, entry_type TEXT, investment_type TEXT, parent_company TEXT,")
+    sql_statements.append("  industry_major TEXT, industry_minor TEXT, sales_division TEXT, sales_division_match_type TEXT, sales_division_similarity FLOAT")
+    sql_statements.append(") ON COMMIT DROP;")
+    sql_statements.append("")
+    sql_statements.append("INSERT INTO kotra_staging_csv (")
+    sql_statements.append(INSERT_COLUMNS)
+    sql_statements.append(") VALUES")
+    for i, record in enumerate(csv_records):
+        values = _insert_values(record)
+        sql_statements.append(f"  ({', '.join(values)})" + ("," if i < len(csv_records) - 1 else ";"))
+    sql_statements.append("")
     
-    # Supabase 클라이언트 생성
-    supabase: Client = create_client(supabase_url, supabase_key)
+    sql_statements.append("-- 기존 기업 중 sales_division이 없는 기업 UPDATE")
+    sql_statements.append("UPDATE kotra k SET")
+    sql_statements.append("  sales_division = s.sales_division,")
+    sql_statements.append("  sales_division_match_type = s.sales_division_match_type,")
+    sql_statements.append("  sales_division_similarity = s.sales_division_similarity")
+    sql_statements.append("FROM kotra_staging_csv s")
+    sql_statements.append("WHERE k.company_name_kr = s.company_name_kr")
+    sql_statements.append("  AND (k.sales_division IS NULL OR TRIM(k.sales_division) = '');")
+    sql_statements.append("")
+    
+    sql_statements.append("-- kotra에 없는 신규 기업 INSERT")
+    sql_statements.append("INSERT INTO kotra (")
+    sql_statements.append(INSERT_COLUMNS)
+    sql_statements.append(")")
+    sql_statements.append("SELECT")
+    sql_statements.append("  s.region, s.country, s.office, s.company_name_kr, s.company_name_en, s.company_name_cn,")
+    sql_statements.append("  s.local_address, s.local_zipcode, s.entry_type, s.investment_type, s.parent_company,")
+    sql_statements.append("  s.industry_major, s.industry_minor, s.sales_division, s.sales_division_match_type, s.sales_division_similarity")
+    sql_statements.append("FROM kotra_staging_csv s")
+    sql_statements.append("WHERE NOT EXISTS (SELECT 1 FROM kotra k WHERE k.company_name_kr = s.company_name_kr);")
+    sql_statements.append("")
+    sql_statements.append("COMMIT;")
+    
+    return sql_statements
+
+def analyze_and_generate_sql(use_staging=False):
+    """sales_division 기준으로 중복을 제거하고 SQL문을 생성하는 함수
+    
+    use_staging=True이면 기존 기업명을 내려받지 않고, 스테이징 테이블과
+    INSERT ... WHERE NOT EXISTS로 서버에서 걸러내는 SQL문을 생성한다.
+    """
     
     print("=== sales_division 기준 중복 제거 및 SQL 생성 ===")
     
-    # 1단계: Supabase에서 sales_division이 있는 기업 목록 조회
-    print("\n1️⃣ Supabase에서 sales_division이 있는 기업 조회 중...")
-    try:
-        result = supabase.table('kotra').select('company_name_kr, sales_division').execute()
-        existing_companies = result.data
+    # 스테이징 방식은 기존 기업 판별을 SQL에 맡기므로 Supabase를 조회하지 않음
+    if not use_staging:
+        # Supabase 설정
+        supabase_url = os.getenv('VITE_SUPABASE_URL')
+        supabase_key = os.getenv('VITE_SUPABASE_KEY')
+    
+        if not supabase_url or not supabase_key:
+            print("❌ Supabase 환경변수가 설정되지 않았습니다.")
+            print("다음 환경변수를 설정해주세요:")
+            print("- VITE_SUPABASE_URL")
+            print("- VITE_SUPABASE_KEY")
+            return
+    
+        # Supabase 클라이언트 생성
+        supabase: Client = create_client(supabase_url, supabase_key)
+    
+        # 1단계: Supabase에서 sales_division이 있는 기업 목록 조회
+        print("\n1️⃣ Supabase에서 sales_division이 있는 기업 조회 중...")
+        try:
+            result = supabase.table('kotra').select('company_name_kr, sales_division').execute()
+            existing_companies = result.data
         
-        # sales_division이 있는 기업들
-        companies_with_sales_division = {
-            record['company_name_kr']: record['sales_division'] 
-            for record in existing_companies 
-            if record.get('sales_division') and record['sales_division'].strip()
-        }
+            # sales_division이 있는 기업들
+            companies_with_sales_division = {
+                record['company_name_kr']: record['sales_division'] 
+                for record in existing_companies 
+                if record.get('sales_division') and record['sales_division'].strip()
+            }
         
-        # sales_division이 없는 기업들
-        companies_without_sales_division = [
-            record['company_name_kr'] 
-            for record in existing_companies 
-            if not record.get('sales_division') or not record['sales_division'].strip()
-        ]
+            # sales_division이 없는 기업들
+            companies_without_sales_division = [
+                record['company_name_kr'] 
+                for record in existing_companies 
+                if not record.get('sales_division') or not record['sales_division'].strip()
+            ]
         
-        print(f"✅ sales_division이 있는 기업: {len(companies_with_sales_division)}개")
-        print(f"✅ sales_division이 없는 기업: {len(companies_without_sales_division)}개")
+            print(f"✅ sales_division이 있는 기업: {len(companies_with_sales_division)}개")
+            print(f"✅ sales_division이 없는 기업: {len(companies_without_sales_division)}개")
         
-    except Exception as e:
-        print(f"❌ Supabase 조회 중 오류: {str(e)}")
-        return
+        except Exception as e:
+            print(f"❌ Supabase 조회 중 오류: {str(e)}")
+            return
     
     # 2단계: CSV 파일 읽기
     print("\n2️⃣ CSV 파일 읽는 중...")
@@ -100,24 +193,23 @@ def analyze_and_generate_sql():
     # 3단계: 중복 제거 (sales_division 기준)
     print("\n3️⃣ sales_division 기준 중복 제거 중...")
     
-    # CSV 내에서 중복 제거 (company_name_kr 기준)
-    unique_csv_records = {}
-    for record in csv_records:
-        company_name = record['company_name_kr']
-        if company_name not in unique_csv_records:
-            unique_csv_records[company_name] = record
-        else:
-            # 이미 있는 경우, 더 완전한 정보를 가진 레코드 선택
-            existing = unique_csv_records[company_name]
-            existing_info_count = sum(1 for v in existing.values() if v and str(v).strip())
-            new_info_count = sum(1 for v in record.values() if v and str(v).strip())
-            
-            if new_info_count > existing_info_count:
-                unique_csv_records[company_name] = record
-    
-    csv_records = list(unique_csv_records.values())
+    # CSV 내에서 중복 제거 (company_name_kr 기준, 더 완전한 정보를 가진 레코드 선택)
+    csv_records, _ = deduplicate(csv_records, key='company_name_kr', rules=[('max', COMPLETENESS)])
     print(f"✅ CSV 내 중복 제거 후: {len(csv_records)}개")
     
+    if use_staging:
+        print("\n4️⃣ 스테이징 SQL문 생성 중...")
+        sql_statements = generate_staging_sql(csv_records)
+        
+        with open('data/kotra_sales_division_update.sql', 'w', encoding='utf-8') as f:
+            f.write("-- KOTRA 테이블 sales_division 업데이트 (스테이징 테이블 방식)\n")
+            f.write("-- 목적: CSV에서 sales_division 정보를 기존 DB에 추가 (기존 기업 판별은 서버에서 수행)\n\n")
+            f.write("\n".join(sql_statements))
+        
+        print(f"✅ SQL 파일 저장 완료: data/kotra_sales_division_update.sql")
+        print(f"  - 스테이징 레코드: {len(csv_records)}개")
+        return
+    
     # Supabase에 이미 sales_division이 있는 기업 제거
     new_records = []
     update_records = []
@@ -150,37 +242,11 @@ def analyze_and_generate_sql():
     if new_records:
         sql_statements.append("-- 신규 기업 INSERT")
         sql_statements.append("INSERT INTO kotra (")
-        sql_statements.append("  region, country, office, company_name_kr, company_name_en, company_name_cn,")
-        sql_statements.append("  local_address, local_zipcode, entry_type, investment_type, parent_company,")
-        sql_statements.append("  industry_major, industry_minor, sales_division, sales_division_match_type, sales_division_similarity")
+        sql_statements.append(INSERT_COLUMNS)
         sql_statements.append(") VALUES")
         
         for i, record in enumerate(new_records):
-            # SQL 인젝션 방지를 위한 이스케이프 처리
-            company_name_kr = record['company_name_kr'].replace("'", "''")
-            company_name_en = record['company_name_en'].replace("'", "''") if record['company_name_en'] else ''
-            company_name_cn = record['company_name_cn'].replace("'", "''") if record['company_name_cn'] else ''
-            local_address = record['local_address'].replace("'", "''") if record['local_address'] else ''
-            parent_company = record['parent_company'].replace("'", "''") if record['parent_company'] else ''
-            
-            values = [
-                f"'{record['region']}'",
-                f"'{record['country']}'",
-                f"'{record['office']}'",
-                f"'{company_name_kr}'",
-                f"'{company_name_en}'" if company_name_en else 'NULL',
-                f"'{company_name_cn}'" if company_name_cn else 'NULL',
-                f"'{local_address}'" if local_address else 'NULL',
-                f"'{record['local_zipcode']}'" if record['local_zipcode'] else 'NULL',
-                f"'{record['entry_type']}'" if record['entry_type'] else 'NULL',
-                f"'{record['investment_type']}'" if record['investment_type'] else 'NULL',
-                f"'{parent_company}'" if parent_company else 'NULL',
-                f"'{record['industry_major']}'" if record['industry_major'] else 'NULL',
-                f"'{record['industry_minor']}'" if record['industry_minor'] else 'NULL',
-                f"'{record['sales_division']}'",
-                f"'{record['sales_division_match_type']}'",
-                f"{record['sales_division_similarity']}"
-            ]
+            values = _insert_values(record)
             
             sql_statements.append(f"  ({', '.join(values)})" + ("," if i < len(new_records) - 1 else ";"))
     
@@ -222,4 +288,4 @@ def analyze_and_generate_sql():
     print(f"  - 예상 sales_division 증가: {len(new_records) + len(update_records)}개")
 
 if __name__ == "__main__":
-    analyze_and_generate_sql() 
\ No newline at end of file
+    analyze_and_generate_sql(use_staging='--staging' in sys.argv) 
\ No newline at end of file
@@ -7,6 +7,8 @@ import os
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from supabase_reader import iter_table_rows
+
 def analyze_current_data():
     """현재 Supabase 데이터를 분석하는 함수"""
     
@@ -24,14 +26,24 @@ def analyze_current_data():
     print("=== 현재 Supabase 데이터 분석 ===\n")
     
     try:
-        # 모든 기업 데이터 조회
-        all_data = supabase.table('kotra').select('*').execute()
+        # 필요한 컬럼만 페이지 단위로 읽으면서 지역별 분류
+        chennai_companies = []
+        mumbai_companies = []
+        other_chennai = []
+        total_count = 0
         
-        if all_data.data:
-            # 지역별 분류
-            chennai_companies = [c for c in all_data.data if c.get('office') in ['첸나이', '첸나이무역관']]
-            mumbai_companies = [c for c in all_data.data if c.get('office') == '뭄바이']
-            
+        for c in iter_table_rows(supabase, 'kotra', columns='id, office, sales_division, company_name_kr'):
+            total_count += 1
+            if c.get('office') in ['첸나이', '첸나이무역관']:
+                chennai_companies.append(c)
+            else:
+                if c.get('office') == '뭄바이':
+                    mumbai_companies.append(c)
+                # 기업명에 '첸나이'가 포함된 다른 지역 기업
+                if '첸나이' in (c.get('company_name_kr') or ''):
+                    other_chennai.append(c)
+        
+        if total_count:
             # 첸나이 분석
             chennai_total = len(chennai_companies)
             chennai_matched = len([c for c in chennai_companies if c.get('sales_division')])
@@ -66,11 +78,7 @@ def analyze_current_data():
                 needed_chennai = target_chennai_total - chennai_total
                 print(f"  1️⃣ 첸나이 기업 {needed_chennai}개 추가 필요")
                 
-                # 기업명에 '첸나이'가 포함된 다른 지역 기업 찾기
-                other_chennai = [c for c in all_data.data 
-                               if c.get('office') not in ['첸나이', '첸나이무역관'] 
-                               and '첸나이' in (c.get('company_name_kr') or '')]
-                
+                # 기업명에 '첸나이'가 포함된 다른 지역 기업
                 if other_chennai:
                     print(f"     - 기업명에 '첸나이' 포함된 다른 지역 기업: {len(other_chennai)}개")
                     for i, company in enumerate(other_chennai[:5], 1):
@@ -4,6 +4,8 @@ import json
 from datetime import datetime
 import os
 
+from sheet_detect import find_dense_row, find_year_columns
+
 def analyze_full_gtm_data():
     """GTM Excel 파일의 모든 시트를 분석하고 통합 데이터 모델을 생성"""
     
@@ -32,13 +34,8 @@ def analyze_full_gtm_data():
             df = pd.read_excel(excel_file, sheet_name=sheet_name, header=None)
             
             # 데이터가 있는 첫 행 찾기
-            first_data_row = 0
-            for i in range(min(10, len(df))):
-                row_data = df.iloc[i]
-                non_null_count = row_data.notna().sum()
-                if non_null_count > 3:  # 최소 3개 이상의 데이터가 있는 행
-                    first_data_row = i
-                    break
+            # (처음 10행 중 값이 4개 이상 있는 행, 없으면 0)
+            first_data_row = find_dense_row(df, min_values=4, max_rows=10) or 0
             
             # 헤더가 있을 가능성이 있는 경우 다시 읽기
             if first_data_row > 0:
@@ -111,7 +108,7 @@ def analyze_revenue_sheet(df, sheet_name):
     
     try:
         # 연도별/월별 매출 찾기
-        year_columns = [col for col in df.columns if str(col).isdigit() and 2020 <= int(str(col)) <= 2030]
+        year_columns = find_year_columns(df.columns, 2020, 2030)
         month_columns = [col for col in df.columns if any(m in str(col) for m in ['1월', '2월', '3월', '4월', '5월', '6월', '7월', '8월', '9월', '10월', '11월', '12월'])]
         
         if year_columns:
@@ -0,0 +1,120 @@
+import json
+import random
+import time
+
+# Supabase 적응형 배치 INSERT
+# 고정 배치 크기 대신 직렬화된 페이로드 크기와 응답 시간을 보고 배치 크기를 조정하고,
+# 일시적 오류는 지터를 준 지수 백오프로 재시도하며,
+# 데이터 오류로 실패한 배치는 반으로 나눠 다시 보내 문제 행만 골라낸다.
+
+MAX_BATCH_BYTES = 1_000_000      # 요청 한 번의 최대 JSON 크기
+INITIAL_BATCH_ROWS = 100
+MIN_BATCH_ROWS = 10
+MAX_BATCH_ROWS = 5000
+TARGET_SECONDS = 2.0             # 배치 한 번에 걸리길 원하는 시간
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+
+# 재시도하면 성공할 수 있는 Postgres 오류 클래스 (연결, 트랜잭션 롤백/데드락, 자원 부족, 쿼리 취소)
+TRANSIENT_SQLSTATE_CLASSES = ('08', '40', '53', '57')
+TRANSIENT_HTTP_STATUSES = ('408', '429', '500', '502', '503', '504')
+TRANSIENT_ERROR_NAMES = ('ConnectError', 'ConnectionError', 'ReadError', 'WriteError', 'NetworkError',
+                         'RemoteProtocolError', 'ProtocolError')
+
+def _row_bytes(row):
+    """행 하나를 JSON으로 보냈을 때의 바이트 수"""
+    return len(json.dumps(row, ensure_ascii=False, default=str).encode('utf-8')) + 1
+
+def is_transient_error(error):
+    """재시도할 가치가 있는 오류인지 판단하는 함수 (네트워크/타임아웃/서버 과부하 등)"""
+    name = type(error).__name__
+    if 'Timeout' in name or name in TRANSIENT_ERROR_NAMES:
+        return True
+
+    code = str(getattr(error, 'code', '') or '')
+    if code in TRANSIENT_HTTP_STATUSES:
+        return True
+    return len(code) == 5 and code[:2] in TRANSIENT_SQLSTATE_CLASSES
+
+def _backoff_seconds(attempt):
+    """attempt번째 재시도 전 대기 시간 (full jitter)"""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+def _insert_with_retry(supabase, table, batch, max_retries, on_conflict=None):
+    """배치를 INSERT(on_conflict가 있으면 UPSERT)하고 일시적 오류는 재시도하는 함수 (최종 실패 시 예외를 그대로 올림)"""
+    attempt = 0
+    while True:
+        try:
+            if on_conflict:
+                return supabase.table(table).upsert(batch, on_conflict=on_conflict).execute()
+            return supabase.table(table).insert(batch).execute()
+        except Exception as e:
+            if attempt >= max_retries or not is_transient_error(e):
+                raise
+            time.sleep(_backoff_seconds(attempt))
+            attempt += 1
+
+def _insert_bisect(supabase, table, rows, indices, max_retries, report, on_conflict=None):
+    """배치를 INSERT하고, 데이터 오류로 실패하면 반씩 나눠 문제 행을 찾는 함수"""
+    try:
+        _insert_with_retry(supabase, table, rows, max_retries, on_conflict)
+        report['inserted'] += len(rows)
+        report['requests'] += 1
+        return
+    except Exception as e:
+        report['requests'] += 1
+        # 재시도해도 안 되는 일시적 오류는 나눠 봐야 소용없으므로 배치 전체를 실패 처리
+        if len(rows) == 1 or is_transient_error(e):
+            for index, row in zip(indices, rows):
+                report['errors'].append({'index': index, 'row': row, 'error': str(e)})
+            return
+
+    middle = len(rows) // 2
+    _insert_bisect(supabase, table, rows[:middle], indices[:middle], max_retries, report, on_conflict)
+    _insert_bisect(supabase, table, rows[middle:], indices[middle:], max_retries, report, on_conflict)
+
+def insert_rows(supabase, table, rows, max_batch_bytes=MAX_BATCH_BYTES, initial_batch_rows=INITIAL_BATCH_ROWS,
+                target_seconds=TARGET_SECONDS, max_retries=MAX_RETRIES, progress=None, on_conflict=None):
+    """rows(딕셔너리 리스트)를 적응형 배치로 table에 INSERT하는 함수
+
+    - 배치는 행 수 상한과 직렬화 크기(max_batch_bytes)를 모두 넘지 않도록 자른다.
+    - 배치가 target_seconds의 절반보다 빨리 끝나면 행 수 상한을 두 배로, 넘기면 절반으로 조정한다.
+    - progress(삽입된 누적 행 수, 전체 행 수)가 주어지면 배치마다 호출한다.
+    - on_conflict(예: 'id')가 주어지면 INSERT 대신 해당 컬럼 기준 UPSERT로 보낸다.
+
+    반환값: {'inserted': 성공 행 수, 'errors': [{'index', 'row', 'error'}, ...], 'requests': 요청 수}
+    errors의 index는 rows 안에서의 위치다.
+    """
+    report = {'inserted': 0, 'errors': [], 'requests': 0}
+    batch_rows = max(MIN_BATCH_ROWS, min(initial_batch_rows, MAX_BATCH_ROWS))
+    row_sizes = [_row_bytes(row) for row in rows]
+
+    start = 0
+    while start < len(rows):
+        # 행 수 상한과 바이트 상한 안에서 배치 구성 (최소 한 행은 포함)
+        end = start
+        batch_bytes = 2
+        while end < len(rows) and end - start < batch_rows:
+            if end > start and batch_bytes + row_sizes[end] > max_batch_bytes:
+                break
+            batch_bytes += row_sizes[end]
+            end += 1
+
+        requests_before = report['requests']
+        started = time.perf_counter()
+        _insert_bisect(supabase, table, rows[start:end], list(range(start, end)), max_retries, report, on_conflict)
+        elapsed = time.perf_counter() - started
+
+        # 배치를 나눠 보낸 경우의 시간은 배치 크기와 무관하므로 조정에 쓰지 않음
+        if report['requests'] - requests_before == 1:
+            if elapsed < target_seconds / 2:
+                batch_rows = min(MAX_BATCH_ROWS, batch_rows * 2)
+            elif elapsed > target_seconds:
+                batch_rows = max(MIN_BATCH_ROWS, batch_rows // 2)
+
+        start = end
+        if progress:
+            progress(report['inserted'], len(rows))
+
+    return report
@@ -0,0 +1,287 @@
+import argparse
+import json
+import multiprocessing
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows에는 resource 모듈이 없음
+    resource = None
+
+from company_keys import romanize_hangul
+from match_sales_division import (
+    _candidate_positions,
+    build_kotra_index,
+    find_address_hits,
+    match_companies,
+    match_companies_parallel,
+)
+
+# 기업명 매칭 파이프라인 벤치마크
+# 합성 KOTRA/영업조직 데이터(오타, 접미사, 로마자 표기 노이즈 포함)를 생성해
+# 매칭 엔진별 실행 시간, 최대 메모리(RSS), 비교한 쌍의 수, 정밀도/재현율을 JSON으로 기록한다.
+#
+# 사용법:
+#   python scripts/benchmark_matching.py --sizes 1000 10000 100000 --output data/benchmark_matching.json
+#   python scripts/benchmark_matching.py --sizes 1000000 --engines indexed parallel --workers 8
+
+ENGINES = ['exhaustive', 'indexed', 'parallel', 'cross_script']
+
+# 기업명에 자주 쓰이는 음절/단어
+KR_SYLLABLES = list('한대성삼현동국신일우진영화산전자기술건설중공업물산제약식품화학정밀통신에너지글로벌케미칼스틸모비스'
+                    '오토텍코리아인터내셔널솔루션시스템네트웍스로지스틱스파워유니온테크')
+KR_SUFFIXES = ['인도법인', '법인', '']
+EN_SUFFIXES = ['India Pvt Ltd', 'Pvt Ltd', 'Private Limited', 'Ltd', 'Corporation', 'Inc', '']
+ADDRESS_AREAS = ['Andheri East', 'Powai', 'Bandra Kurla Complex', 'Guindy', 'Sriperumbudur', 'Oragadam', 'Nariman Point']
+# 합성 영업조직 값 접두어 (행마다 고유한 값으로 정답 행을 추적)
+BENCHMARK_DIVISION_PREFIX = 'BENCH'
+
+# 로마자 표기 흔들림 (예: 'seong' ↔ 'sung', 'eo' ↔ 'u')
+TRANSLITERATION_VARIANTS = [('eo', 'u'), ('eu', 'u'), ('ae', 'e'), ('seong', 'sung'), ('jeon', 'jun'), ('k', 'g')]
+
+def _korean_name(rng):
+    """자주 쓰이는 음절로 그럴듯한 국문 기업명을 만드는 함수"""
+    return ''.join(rng.choice(KR_SYLLABLES) for _ in range(rng.randint(2, 6)))
+
+def _english_name(name_kr):
+    """국문 기업명을 로마자 표기한 영문 기업명을 만드는 함수"""
+    return romanize_hangul(name_kr).capitalize()
+
+def _add_typo(rng, name):
+    """글자 하나를 지우거나, 바꾸거나, 순서를 뒤집는 오타를 넣는 함수"""
+    if len(name) < 4:
+        return name
+    pos = rng.randrange(1, len(name) - 1)
+    kind = rng.choice(['delete', 'replace', 'swap'])
+    if kind == 'delete':
+        return name[:pos] + name[pos + 1:]
+    if kind == 'replace':
+        return name[:pos] + rng.choice('aeiounrst') + name[pos + 1:]
+    return name[:pos - 1] + name[pos] + name[pos - 1] + name[pos + 1:]
+
+def _vary_transliteration(rng, name):
+    """로마자 표기를 다른 관용 표기로 바꾸는 함수"""
+    lowered = name.lower()
+    variants = [(a, b) for a, b in TRANSLITERATION_VARIANTS if a in lowered]
+    if not variants:
+        return name
+    a, b = rng.choice(variants)
+    return lowered.replace(a, b, 1).capitalize()
+
+def generate_kotra_df(size, seed=42):
+    """합성 KOTRA 데이터프레임을 생성하는 함수"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(size):
+        name_kr = _korean_name(rng)
+        company_kr = f'{name_kr} {rng.choice(KR_SUFFIXES)}'.strip()
+        # 일부 기업은 현지주소(건물명)에 기업명이 들어 있음
+        building = f'{company_kr} 빌딩' if rng.random() < 0.05 else f'{_korean_name(rng)} Tower'
+        rows.append({
+            'company_name_kr': company_kr,
+            'company_name_en': f'{_english_name(name_kr)} {i} {rng.choice(EN_SUFFIXES)}'.strip(),
+            'local_address': f'{rng.randint(1, 999)}, {building}, {rng.choice(ADDRESS_AREAS)}',
+        })
+    return pd.DataFrame(rows)
+
+def generate_sales_division_df(kotra_df, size, seed=7, typo_rate=0.3, suffix_rate=0.5, transliteration_rate=0.2,
+                               unmatched_rate=0.2):
+    """KOTRA 기업에 노이즈를 섞어 합성 영업조직 데이터프레임과 정답을 생성하는 함수
+
+    영업조직 값은 행마다 고유하게 만들어 매칭 결과에서 원래 행을 찾을 수 있게 한다.
+    반환값: (영업조직 데이터프레임, {영업조직 값: 정답 kotra 위치 또는 None})
+    """
+    rng = random.Random(seed)
+    rows = []
+    truth = {}
+    positions = rng.sample(range(len(kotra_df)), min(size, len(kotra_df)))
+
+    for i, pos in enumerate(positions):
+        sales_division = f'{BENCHMARK_DIVISION_PREFIX}-{i:07d}'
+
+        if rng.random() < unmatched_rate:
+            # KOTRA에 없는 기업 (정밀도 측정용)
+            name_kr = _korean_name(rng) + _korean_name(rng)
+            rows.append({'기업명(국문)': name_kr, '기업명(영문)': f'Unlisted {i} Pvt Ltd', '영업조직': sales_division})
+            truth[sales_division] = None
+            continue
+
+        kotra_row = kotra_df.iloc[pos]
+        name_kr = kotra_row['company_name_kr']
+        name_en = kotra_row['company_name_en']
+
+        if rng.random() < suffix_rate:
+            name_kr = name_kr.replace(' 인도법인', '').replace(' 법인', '') + rng.choice([' 인도법인', '(주)', ''])
+            name_en = name_en.split(' ', 2)[0] + ' ' + name_en.split(' ', 2)[1] + ' ' + rng.choice(EN_SUFFIXES)
+        if rng.random() < transliteration_rate:
+            name_en = _vary_transliteration(rng, name_en)
+        if rng.random() < typo_rate:
+            name_en = _add_typo(rng, name_en)
+
+        rows.append({'기업명(국문)': name_kr.strip(), '기업명(영문)': name_en.strip(), '영업조직': sales_division})
+        truth[sales_division] = pos
+
+    return pd.DataFrame(rows), truth
+
+def _peak_rss_mb():
+    """현재 프로세스의 최대 RSS(MB)를 반환하는 함수 (측정 불가 시 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _pairs_scored(engine, sales_division_df, kotra_df, kotra_index):
+    """엔진이 유사도를 계산하는 (영업조직 행, kotra 행) 쌍의 수를 세는 함수"""
+    rows = sales_division_df[sales_division_df['영업조직'].notna() & (sales_division_df['영업조직'] != '')]
+    if engine == 'exhaustive':
+        return len(rows) * len(kotra_df)
+
+    address_hits = find_address_hits(rows['기업명(국문)'], kotra_index['records'])
+    return sum(
+        len(_candidate_positions(kotra_index, company_kr, company_en, address_hits))
+        for company_kr, company_en in zip(rows['기업명(국문)'], rows['기업명(영문)'])
+    )
+
+def _accuracy(matches, truth):
+    """정답과 비교해 정밀도/재현율을 계산하는 함수"""
+    correct = sum(1 for match in matches if truth.get(match['sales_division']) == match['kotra_index'])
+    expected = sum(1 for pos in truth.values() if pos is not None)
+    return {
+        'precision': round(correct / len(matches), 4) if matches else None,
+        'recall': round(correct / expected, 4) if expected else None,
+    }
+
+def run_case(kotra_size, engine, options):
+    """한 가지 크기/엔진 조합을 실행해 측정값을 반환하는 함수"""
+    kotra_df = generate_kotra_df(kotra_size, seed=options['seed'])
+    sales_division_df, truth = generate_sales_division_df(
+        kotra_df, options['sales_rows'], seed=options['seed'] + 1,
+        typo_rate=options['typo_rate'], suffix_rate=options['suffix_rate'],
+        transliteration_rate=options['transliteration_rate'], unmatched_rate=options['unmatched_rate'],
+    )
+    data_rss = _peak_rss_mb()
+    threshold = options['similarity_threshold']
+
+    start = time.perf_counter()
+    if engine == 'exhaustive':
+        kotra_index = None
+        matches = match_companies(sales_division_df, kotra_df, threshold, use_index=False)
+    elif engine == 'parallel':
+        kotra_index = build_kotra_index(kotra_df)
+        matches = match_companies_parallel(sales_division_df, kotra_df, threshold, workers=options['workers'],
+                                           kotra_index=kotra_index)
+    else:
+        kotra_index = build_kotra_index(kotra_df, cross_script=(engine == 'cross_script'))
+        matches = match_companies(sales_division_df, kotra_df, threshold, kotra_index=kotra_index,
+                                  cross_script=(engine == 'cross_script'))
+    wall_seconds = time.perf_counter() - start
+    peak_rss = _peak_rss_mb()
+
+    if kotra_index is None:
+        kotra_index = build_kotra_index(kotra_df)
+
+    result = {
+        'kotra_rows': kotra_size,
+        'sales_division_rows': len(sales_division_df),
+        'engine': engine,
+        'wall_seconds': round(wall_seconds, 4),
+        'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+        'data_rss_mb': round(data_rss, 1) if data_rss is not None else None,
+        'pairs_scored': _pairs_scored(engine, sales_division_df, kotra_df, kotra_index),
+        'matches': len(matches),
+    }
+    result.update(_accuracy(matches, truth))
+    return result
+
+def _run_case_in_child(kotra_size, engine, options, queue):
+    """별도 프로세스에서 run_case를 실행해 엔진별 최대 RSS가 섞이지 않게 하는 함수"""
+    try:
+        queue.put(run_case(kotra_size, engine, options))
+    except Exception as e:
+        queue.put({'kotra_rows': kotra_size, 'engine': engine, 'error': str(e)})
+
+def _git_revision():
+    """현재 git 커밋 해시 (보고서 간 비교용, 없으면 None)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return None
+
+def run_benchmark(sizes, engines, options):
+    """크기/엔진 조합별로 벤치마크를 실행해 보고서 딕셔너리를 반환하는 함수"""
+    results = []
+    for size in sizes:
+        for engine in engines:
+            pairs = size * options['sales_rows']
+            if engine == 'exhaustive' and pairs > options['max_exhaustive_pairs']:
+                print(f"  [건너뜀] {engine} @ {size:,}행: {pairs:,}쌍 > --max-exhaustive-pairs")
+                continue
+
+            print(f"  {engine} @ KOTRA {size:,}행 실행 중...")
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=_run_case_in_child, args=(size, engine, options, queue))
+            process.start()
+            result = queue.get()
+            process.join()
+            results.append(result)
+
+            if 'error' in result:
+                print(f"    오류: {result['error']}")
+            else:
+                print(f"    {result['wall_seconds']:.2f}초, RSS {result['peak_rss_mb']}MB, "
+                      f"비교 {result['pairs_scored']:,}쌍, 정밀도 {result['precision']}, 재현율 {result['recall']}")
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': _git_revision(),
+        'options': options,
+        'results': results,
+    }
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='기업명 매칭 엔진 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='KOTRA 행 수 목록')
+    parser.add_argument('--sales-rows', type=int, default=1000, help='영업조직 행 수')
+    parser.add_argument('--engines', nargs='+', choices=ENGINES, default=['exhaustive', 'indexed'])
+    parser.add_argument('--workers', type=int, default=4, help='parallel 엔진의 프로세스 수')
+    parser.add_argument('--similarity-threshold', type=float, default=0.7)
+    parser.add_argument('--typo-rate', type=float, default=0.3)
+    parser.add_argument('--suffix-rate', type=float, default=0.5)
+    parser.add_argument('--transliteration-rate', type=float, default=0.2)
+    parser.add_argument('--unmatched-rate', type=float, default=0.2)
+    parser.add_argument('--max-exhaustive-pairs', type=int, default=10_000_000,
+                        help='전수 비교 엔진을 실행할 최대 쌍 수')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='data/benchmark_matching.json', help='JSON 보고서 경로')
+    args = parser.parse_args()
+
+    options = {
+        'sales_rows': args.sales_rows,
+        'workers': args.workers,
+        'similarity_threshold': args.similarity_threshold,
+        'typo_rate': args.typo_rate,
+        'suffix_rate': args.suffix_rate,
+        'transliteration_rate': args.transliteration_rate,
+        'unmatched_rate': args.unmatched_rate,
+        'max_exhaustive_pairs': args.max_exhaustive_pairs,
+        'seed': args.seed,
+    }
+
+    print("=== 기업명 매칭 벤치마크 ===")
+    report = run_benchmark(args.sizes, args.engines, options)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"보고서를 {args.output}에 저장했습니다.")
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import os
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from supabase_reader import iter_table_pages
+
 # .env 파일 로드
 load_dotenv()
 
@@ -21,12 +23,44 @@ def check_chennai_companies():
     
     print("=== 첸나이 기업 수 변화 원인 확인 ===")
     
-    # 1. 전체 기업 수 확인
+    # 1. 전체 기업 조회 (필요한 컬럼만 페이지 단위로 읽으면서 분류)
     print("\n1️⃣ 전체 기업 수 확인...")
+    
+    total_count = 0
+    chennai_companies = []
+    chennai_office_companies = []
+    chennai_trade_companies = []
+    chennai_in_name = []  # office가 첸나이 계열이 아니지만 국문 기업명에 '첸나이'가 포함된 기업
+    
     try:
-        all_result = supabase.table('kotra').select('*').execute()
-        all_companies = all_result.data
-        print(f"✅ 전체 기업 수: {len(all_companies)}개")
+        for page in iter_table_pages(supabase, 'kotra', columns='id, office, company_name_kr, company_name_en'):
+            total_count += len(page)
+            
+            for company in page:
+                office = company.get('office', '') or ''
+                company_name = company.get('company_name_kr', '') or ''
+                company_name_en = company.get('company_name_en', '') or ''
+                
+                # office가 '첸나이'인 기업
+                if office == '첸나이':
+                    chennai_office_companies.append(company)
+                    chennai_companies.append(company)
+                
+                # office가 '첸나이무역관'인 기업
+                elif office == '첸나이무역관':
+                    chennai_trade_companies.append(company)
+                    chennai_companies.append(company)
+                
+                # 기업명에 '첸나이'가 포함된 기업 (office가 다른 경우)
+                elif ('첸나이' in company_name or 
+                      'Chennai' in company_name_en or
+                      'chennai' in company_name.lower()):
+                    chennai_companies.append(company)
+                
+                if office not in ['첸나이', '첸나이무역관'] and '첸나이' in company_name:
+                    chennai_in_name.append(company)
+        
+        print(f"✅ 전체 기업 수: {total_count}개")
         
     except Exception as e:
         print(f"❌ 전체 기업 조회 중 오류: {str(e)}")
@@ -35,31 +69,6 @@ def check_chennai_companies():
     # 2. 첸나이 관련 기업들 확인
     print("\n2️⃣ 첸나이 관련 기업들 확인...")
     
-    chennai_companies = []
-    chennai_office_companies = []
-    chennai_trade_companies = []
-    
-    for company in all_companies:
-        office = company.get('office', '') or ''
-        company_name = company.get('company_name_kr', '') or ''
-        company_name_en = company.get('company_name_en', '') or ''
-        
-        # office가 '첸나이'인 기업
-        if office == '첸나이':
-            chennai_office_companies.append(company)
-            chennai_companies.append(company)
-        
-        # office가 '첸나이무역관'인 기업
-        elif office == '첸나이무역관':
-            chennai_trade_companies.append(company)
-            chennai_companies.append(company)
-        
-        # 기업명에 '첸나이'가 포함된 기업 (office가 다른 경우)
-        elif ('첸나이' in company_name or 
-              'Chennai' in company_name_en or
-              'chennai' in company_name.lower()):
-            chennai_companies.append(company)
-    
     print(f"📊 첸나이 관련 기업 분류:")
     print(f"  - office='첸나이': {len(chennai_office_companies)}개")
     print(f"  - office='첸나이무역관': {len(chennai_trade_companies)}개")
@@ -88,9 +97,6 @@ def check_chennai_companies():
         print("  4. 기존 하드코딩된 데이터에 오류가 있었을 수 있음")
         
         # office='첸나이'가 아닌 기업들 중 첸나이 관련 확인
-        other_chennai = [c for c in all_companies if c.get('office') not in ['첸나이', '첸나이무역관']]
-        chennai_in_name = [c for c in other_chennai if '첸나이' in (c.get('company_name_kr') or '')]
-        
         if chennai_in_name:
             print(f"\n📋 office가 '첸나이'가 아니지만 기업명에 '첸나이'가 포함된 기업들:")
             for i, company in enumerate(chennai_in_name[:10], 1):
@@ -7,6 +7,8 @@ import os
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from office_summary import office_totals
+
 def check_target_numbers():
     """목표 수치와 현재 수치를 비교하는 함수"""
     
@@ -35,23 +37,11 @@ def check_target_numbers():
     print()
     
     try:
-        # 첸나이 관련 기업 조회 (첸나이 + 첸나이무역관)
-        chennai_data = supabase.table('kotra').select('*').in_('office', ['첸나이', '첸나이무역관']).execute()
-        
-        # 뭄바이 기업 조회
-        mumbai_data = supabase.table('kotra').select('*').eq('office', '뭄바이').execute()
+        # 무역관별 요약에서 첸나이(첸나이 + 첸나이무역관)와 뭄바이 수치 계산
+        chennai_total, chennai_matched, chennai_ratio = office_totals(supabase, ['첸나이', '첸나이무역관'])
+        mumbai_total, mumbai_matched, mumbai_ratio = office_totals(supabase, ['뭄바이'])
         
-        if chennai_data.data and mumbai_data.data:
-            # 첸나이 통계
-            chennai_total = len(chennai_data.data)
-            chennai_matched = len([c for c in chennai_data.data if c.get('sales_division')])
-            chennai_ratio = chennai_matched / chennai_total * 100 if chennai_total > 0 else 0
-            
-            # 뭄바이 통계
-            mumbai_total = len(mumbai_data.data)
-            mumbai_matched = len([c for c in mumbai_data.data if c.get('sales_division')])
-            mumbai_ratio = mumbai_matched / mumbai_total * 100 if mumbai_total > 0 else 0
-            
+        if chennai_total and mumbai_total:
             print("📊 현재 Supabase 수치:")
             print(f"  - 첸나이: 총 {chennai_total}개, 영업조직 매칭 {chennai_matched}개 ({chennai_ratio:.1f}%)")
             print(f"  - 뭄바이: 총 {mumbai_total}개, 영업조직 매칭 {mumbai_matched}개 ({mumbai_ratio:.1f}%)")
@@ -1,9 +1,12 @@
-import pandas as pd
 import os
 from supabase import create_client, Client
 from dotenv import load_dotenv
 import logging
 
+from euro_pricing_ingest import coerce_numeric, to_records, transform_sheet
+from sheet_detect import find_text_row
+from workbook_loader import read_sheet
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -11,6 +14,37 @@ logger = logging.getLogger(__name__)
 # .env 파일 로드
 load_dotenv()
 
+# Countries 시트: 국가명 + 구간별 대표 값 (처음 50개 국가만 - 테이블이 너무 크므로)
+COUNTRIES_SPEC = {
+    'sheet': 'Countries',
+    'table': 'euro_pricing_countries',
+    'start': {'pattern': r'(?=.{3})[^\W\d_]+(?: +[^\W\d_]+)*',
+              'exclude': ['Used International Bandwidth by Country', '[HOME]']},
+    'max_rows': 50,
+    'blocks': [
+        {'start': 0, 'columns': ['country_name'], 'type': 'text', 'strip': True},
+        {'start': 2, 'columns': ['total_bandwidth_historical'], 'type': 'text'},
+        {'start': 8, 'columns': ['total_bandwidth_forecast'], 'type': 'text'},
+        {'start': 16, 'columns': ['backbone_providers_historical'], 'type': 'text'},
+        {'start': 23, 'columns': ['backbone_providers_forecast'], 'type': 'text'},
+        {'start': 31, 'columns': ['content_providers_historical'], 'type': 'text'},
+        {'start': 38, 'columns': ['content_providers_forecast'], 'type': 'text'},
+    ],
+}
+
+# Route Summary 시트: 경로명(Trans-Atlantic 처럼 '-'가 들어간 첫 행부터) + 구간별 대표 값
+ROUTE_SUMMARY_SPEC = {
+    'sheet': 'Route Summary',
+    'table': 'euro_pricing_route_summary',
+    'start': {'keywords': ['-'], 'exclude': ['Submarine Cable Route Summary', '[HOME]', 'Used Bandwidth (Gbps)']},
+    'blocks': [
+        {'start': 0, 'columns': ['route_name'], 'type': 'text', 'strip': True},
+        {'start': 5, 'columns': ['historical_data'], 'type': 'text'},
+        {'start': 8, 'columns': ['forecast_data'], 'type': 'text'},
+        {'start': 20, 'columns': ['change_data'], 'type': 'text'},
+    ],
+}
+
 def clear_and_recreate_tables(supabase):
     """기존 테이블 데이터 삭제"""
     tables_to_clear = [
@@ -34,17 +68,14 @@ def upload_regions_properly(supabase, excel_file_path):
     logger.info("🔄 Regions 시트 처리 중...")
     
     try:
-        df = pd.read_excel(excel_file_path, sheet_name='Regions')
+        df = read_sheet(excel_file_path, 'Regions')
         
         # 실제 데이터가 시작하는 행 찾기 (지역명이 있는 행)
-        data_start = None
-        for idx, row in df.iterrows():
-            if pd.notna(row.iloc[0]) and str(row.iloc[0]).strip() not in ['', 'Used International Bandwidth by Region', '[HOME]']:
-                # 지역명인지 확인
-                cell_value = str(row.iloc[0]).strip()
-                if any(region in cell_value for region in ['Asia', 'Europe', 'America', 'Africa', 'Middle East', 'Total']):
-                    data_start = idx
-                    break
+        data_start = find_text_row(
+            df.iloc[:, 0],
+            keywords=['Asia', 'Europe', 'America', 'Africa', 'Middle East', 'Total'],
+            exclude=['Used International Bandwidth by Region', '[HOME]']
+        )
         
         if data_start is not None:
             # 헤더 정보를 수동으로 설정
@@ -78,26 +109,14 @@ def upload_regions_properly(supabase, excel_file_path):
                 column_mapping[df_data.columns[col_idx]] = f"additional_data_{col_idx}"
                 col_idx += 1
             
-            # 데이터 변환
+            # 데이터 변환 (지역명이 있는 행만, 값은 블록 단위로 숫자 변환하고 숫자가 아니면 문자열 유지)
             df_renamed = df_data.rename(columns=column_mapping)
+            names = df_renamed['region_name']
+            df_renamed = df_renamed[names.notna() & (names.astype(str).str.strip() != '')]
             
-            # 레코드 생성
-            records = []
-            for _, row in df_renamed.iterrows():
-                if pd.notna(row['region_name']) and str(row['region_name']).strip() != '':
-                    record = {"region_name": str(row['region_name']).strip()}
-                    
-                    # 나머지 컬럼들 추가
-                    for col in df_renamed.columns[1:]:
-                        if col in row.index and pd.notna(row[col]):
-                            try:
-                                record[col] = float(row[col]) if str(row[col]).replace('.', '').replace('-', '').isdigit() else str(row[col])
-                            except:
-                                record[col] = str(row[col]) if pd.notna(row[col]) else None
-                        else:
-                            record[col] = None
-                    
-                    records.append(record)
+            values = coerce_numeric(df_renamed.iloc[:, 1:], keep_text=True)
+            values.insert(0, 'region_name', df_renamed['region_name'].astype(str).str.strip())
+            records = to_records(values)
             
             if records:
                 logger.info(f"  📤 {len(records)}개 레코드를 업로드 중...")
@@ -116,44 +135,18 @@ def upload_countries_properly(supabase, excel_file_path):
     logger.info("🔄 Countries 시트 처리 중...")
     
     try:
-        df = pd.read_excel(excel_file_path, sheet_name='Countries')
+        df = read_sheet(excel_file_path, 'Countries')
         
-        # 실제 데이터가 시작하는 행 찾기 (국가명이 있는 행)
-        data_start = None
-        for idx, row in df.iterrows():
-            if pd.notna(row.iloc[0]) and str(row.iloc[0]).strip() not in ['', 'Used International Bandwidth by Country', '[HOME]']:
-                # 국가명인지 확인 (알파벳으로 시작하고 적절한 길이)
-                cell_value = str(row.iloc[0]).strip()
-                if len(cell_value) > 2 and cell_value.replace(' ', '').isalpha():
-                    data_start = idx
-                    break
+        records = transform_sheet(df, COUNTRIES_SPEC)
         
-        if data_start is not None:
-            # 데이터 처리 (처음 50개 레코드만 - 테이블이 너무 크므로)
-            df_data = df.iloc[data_start:data_start+50].reset_index(drop=True)
-            
-            records = []
-            for _, row in df_data.iterrows():
-                if pd.notna(row.iloc[0]) and str(row.iloc[0]).strip() != '':
-                    record = {
-                        "country_name": str(row.iloc[0]).strip(),
-                        "total_bandwidth_historical": str(row.iloc[2]) if len(row) > 2 and pd.notna(row.iloc[2]) else None,
-                        "total_bandwidth_forecast": str(row.iloc[8]) if len(row) > 8 and pd.notna(row.iloc[8]) else None,
-                        "backbone_providers_historical": str(row.iloc[16]) if len(row) > 16 and pd.notna(row.iloc[16]) else None,
-                        "backbone_providers_forecast": str(row.iloc[23]) if len(row) > 23 and pd.notna(row.iloc[23]) else None,
-                        "content_providers_historical": str(row.iloc[31]) if len(row) > 31 and pd.notna(row.iloc[31]) else None,
-                        "content_providers_forecast": str(row.iloc[38]) if len(row) > 38 and pd.notna(row.iloc[38]) else None
-                    }
-                    records.append(record)
-            
-            if records:
-                logger.info(f"  📤 {len(records)}개 레코드를 업로드 중...")
-                result = supabase.table("euro_pricing_countries").insert(records).execute()
-                logger.info(f"  ✅ Countries 완료: {len(records)}개 레코드 업로드")
-            else:
-                logger.warning("  ⚠️ 업로드할 데이터가 없습니다.")
-        else:
+        if records is None:
             logger.warning("  ⚠️ 데이터 시작점을 찾을 수 없습니다.")
+        elif records:
+            logger.info(f"  📤 {len(records)}개 레코드를 업로드 중...")
+            result = supabase.table("euro_pricing_countries").insert(records).execute()
+            logger.info(f"  ✅ Countries 완료: {len(records)}개 레코드 업로드")
+        else:
+            logger.warning("  ⚠️ 업로드할 데이터가 없습니다.")
             
     except Exception as e:
         logger.error(f"❌ Countries 처리 오류: {str(e)}")
@@ -163,39 +156,18 @@ def upload_route_summary_properly(supabase, excel_file_path):
     logger.info("🔄 Route Summary 시트 처리 중...")
     
     try:
-        df = pd.read_excel(excel_file_path, sheet_name='Route Summary')
+        df = read_sheet(excel_file_path, 'Route Summary')
         
-        # 실제 데이터가 시작하는 행 찾기
-        data_start = None
-        for idx, row in df.iterrows():
-            if pd.notna(row.iloc[0]) and str(row.iloc[0]).strip() not in ['', 'Submarine Cable Route Summary', '[HOME]', 'Used Bandwidth (Gbps)']:
-                cell_value = str(row.iloc[0]).strip()
-                if '-' in cell_value or any(region in cell_value for region in ['Trans-Atlantic', 'Trans-Pacific', 'US-', 'Europe-', 'Intra-']):
-                    data_start = idx
-                    break
+        records = transform_sheet(df, ROUTE_SUMMARY_SPEC)
         
-        if data_start is not None:
-            df_data = df.iloc[data_start:].reset_index(drop=True)
-            
-            records = []
-            for _, row in df_data.iterrows():
-                if pd.notna(row.iloc[0]) and str(row.iloc[0]).strip() != '':
-                    record = {
-                        "route_name": str(row.iloc[0]).strip(),
-                        "historical_data": str(row.iloc[5]) if len(row) > 5 and pd.notna(row.iloc[5]) else None,
-                        "forecast_data": str(row.iloc[8]) if len(row) > 8 and pd.notna(row.iloc[8]) else None,
-                        "change_data": str(row.iloc[20]) if len(row) > 20 and pd.notna(row.iloc[20]) else None
-                    }
-                    records.append(record)
-            
-            if records:
-                logger.info(f"  📤 {len(records)}개 레코드를 업로드 중...")
-                result = supabase.table("euro_pricing_route_summary").insert(records).execute()
-                logger.info(f"  ✅ Route Summary 완료: {len(records)}개 레코드 업로드")
-            else:
-                logger.warning("  ⚠️ 업로드할 데이터가 없습니다.")
-        else:
+        if records is None:
             logger.warning("  ⚠️ 데이터 시작점을 찾을 수 없습니다.")
+        elif records:
+            logger.info(f"  📤 {len(records)}개 레코드를 업로드 중...")
+            result = supabase.table("euro_pricing_route_summary").insert(records).execute()
+            logger.info(f"  ✅ Route Summary 완료: {len(records)}개 레코드 업로드")
+        else:
+            logger.warning("  ⚠️ 업로드할 데이터가 없습니다.")
             
     except Exception as e:
         logger.error(f"❌ Route Summary 처리 오류: {str(e)}")
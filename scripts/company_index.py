@@ -0,0 +1,110 @@
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+import math
+
+# 기업명 후보(블로킹) 인덱스
+# 모든 행 쌍을 비교하는 대신 정규화된 기업명의 토큰/문자 n-gram 역색인으로
+# 유사도를 계산할 후보 행만 골라낸다. 입력은 이미 정규화된 이름이어야 한다.
+
+NGRAM_SIZE = 3
+
+def char_ngrams(text, n=NGRAM_SIZE):
+    """공백을 제거하고 양 끝을 패딩한 문자 n-gram 집합을 반환하는 함수"""
+    compact = ''.join(str(text).split())
+    if not compact:
+        return set()
+
+    padded = f' {compact} '
+    if len(padded) <= n:
+        return {padded}
+
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+def build_name_index(names, n=NGRAM_SIZE):
+    """정규화된 기업명 리스트로 토큰/n-gram 역색인을 만드는 함수
+
+    names의 순서(0부터의 위치)가 그대로 후보 번호가 된다.
+    값이 None인 항목은 결측으로 보고 색인하지 않으며,
+    정규화 결과가 빈 문자열인 이름은 'empty' 목록에 따로 모아 둔다.
+    """
+    tokens = defaultdict(list)
+    ngrams = defaultdict(list)
+    empty = []
+
+    for pos, name in enumerate(names):
+        if name is None:
+            continue
+        if name == '':
+            empty.append(pos)
+            continue
+
+        for token in set(name.split()):
+            tokens[token].append(pos)
+        for gram in char_ngrams(name, n):
+            ngrams[gram].append(pos)
+
+    return {
+        'n': n,
+        'size': len(names),
+        'tokens': dict(tokens),
+        'ngrams': dict(ngrams),
+        'empty': empty,
+    }
+
+def find_candidates(index, query, min_ngram_overlap=0.4, max_frequency=0.01):
+    """질의 기업명과 비교할 후보 위치 집합을 반환하는 함수
+
+    - 공유하는 토큰이 있으면 후보
+    - 질의 n-gram 중 min_ngram_overlap 비율 이상을 공유하면 후보
+    전체 행의 max_frequency 비율을 넘게 등장하는 흔한 토큰/n-gram(예: '인도법인')은
+    블로킹 키로 쓰지 않는다. 단, 질의의 n-gram 절반 이상이 흔하면(예: 'power')
+    드문 n-gram만으로는 후보를 놓치기 쉬우므로 전부 사용한다.
+    """
+    if query is None:
+        return set()
+    if query == '':
+        return set(index['empty'])
+
+    candidates = set()
+    limit = max(1, int(index['size'] * max_frequency))
+
+    for token in set(query.split()):
+        postings = index['tokens'].get(token)
+        if postings and len(postings) <= limit:
+            candidates.update(postings)
+
+    gram_postings = [index['ngrams'].get(gram, []) for gram in char_ngrams(query, index['n'])]
+    selective = [postings for postings in gram_postings if len(postings) <= limit]
+    if len(selective) * 2 >= len(gram_postings):
+        gram_postings = selective
+
+    if gram_postings:
+        required = max(1, math.ceil(len(gram_postings) * min_ngram_overlap))
+        counts = Counter()
+        for postings in gram_postings:
+            counts.update(postings)
+        candidates.update(pos for pos, count in counts.items() if count >= required)
+
+    return candidates
+
+def bounded_similarity(norm1, norm2, threshold=0.0):
+    """정규화된 두 기업명의 유사도를 threshold 기준으로 계산하는 함수
+
+    SequenceMatcher.ratio()와 같은 값을 반환하되, 값이 threshold 미만이 확실하면
+    비싼 ratio() 계산 없이 0을 반환한다. 값싼 상한부터 차례로 확인한다.
+    - 길이 상한: 2 * min(len) / (len1 + len2)  (real_quick_ratio와 동일)
+    - 문자 멀티셋 상한: 2 * |공통 문자| / (len1 + len2)  (quick_ratio와 동일)
+    """
+    if norm1 == norm2:
+        return 1.0
+
+    total = len(norm1) + len(norm2)
+    if 2.0 * min(len(norm1), len(norm2)) / total < threshold:
+        return 0
+
+    common = sum((Counter(norm1) & Counter(norm2)).values())
+    if 2.0 * common / total < threshold:
+        return 0
+
+    similarity = SequenceMatcher(None, norm1, norm2).ratio()
+    return similarity if similarity >= threshold else 0
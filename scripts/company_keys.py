@@ -0,0 +1,129 @@
+import re
+
+# 기업명 키 생성 (한글 로마자/자모/접미사 제거/발음 키)
+# 국문명과 영문명은 문자 체계가 달라 직접 비교할 수 없으므로,
+# 행마다 한 번 키를 만들어 두고 같은 키끼리 O(1) 조회로 묶기 위한 모듈
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+# 초성/중성/종성 (호환 자모)
+CHOSEONG = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+JUNGSEONG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ', 'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ',
+             'ㅡ', 'ㅢ', 'ㅣ']
+JONGSEONG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ',
+             'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+
+# 국어의 로마자 표기법 (음운 변화는 반영하지 않은 음절 단위 표기)
+ROMAN_CHOSEONG = ['g', 'kk', 'n', 'd', 'tt', 'r', 'm', 'b', 'pp', 's', 'ss', '', 'j', 'jj', 'ch', 'k', 't', 'p', 'h']
+ROMAN_JUNGSEONG = ['a', 'ae', 'ya', 'yae', 'eo', 'e', 'yeo', 'ye', 'o', 'wa', 'wae', 'oe', 'yo', 'u', 'wo', 'we', 'wi',
+                   'yu', 'eu', 'ui', 'i']
+ROMAN_JONGSEONG = ['', 'k', 'k', 'k', 'n', 'n', 'n', 't', 'l', 'k', 'm', 'l', 'l', 'l', 'p', 'l', 'm', 'p', 'p',
+                   't', 't', 'ng', 't', 't', 'k', 't', 'p', 't']
+
+# 정규화 시 제거할 법인 형태 단어 ('india'는 '인도법인'의 영문 표기에 해당)
+SUFFIX_WORDS = ['pvt', 'private', 'ltd', 'limited', 'corporation', 'corp', 'company', 'co', 'inc', 'india',
+                '인도법인', '법인', '주식회사', '유한회사']
+
+# 띄어쓰지 않고 이름 끝에 붙는 국문 접미사 (예: '삼성전자인도법인')
+GLUED_SUFFIXES = ['인도법인', '법인', '주식회사']
+
+# 발음 키용 자음 그룹 (유성/무성, r/l 등 표기 차이를 같은 문자로 묶음)
+PHONETIC_MAP = {
+    'g': 'k', 'k': 'k', 'c': 'k', 'q': 'k', 'x': 'k',
+    'd': 't', 't': 't',
+    'b': 'p', 'p': 'p', 'f': 'p', 'v': 'p',
+    'r': 'l', 'l': 'l',
+    'j': 'j', 'z': 'j',
+    's': 's', 'm': 'm', 'n': 'n',
+}
+
+# 너무 짧은 발음 키는 서로 다른 기업끼리 쉽게 겹치므로 사용하지 않음
+MIN_PHONETIC_KEY_LENGTH = 3
+
+def _is_hangul_syllable(ch):
+    return HANGUL_BASE <= ord(ch) <= HANGUL_LAST
+
+def decompose_jamo(text):
+    """한글 음절을 초성/중성/종성 자모로 분해하는 함수 (한글 외 문자는 그대로)"""
+    result = []
+    for ch in text:
+        if _is_hangul_syllable(ch):
+            offset = ord(ch) - HANGUL_BASE
+            result.append(CHOSEONG[offset // 588])
+            result.append(JUNGSEONG[(offset % 588) // 28])
+            result.append(JONGSEONG[offset % 28])
+        else:
+            result.append(ch)
+    return ''.join(result)
+
+def romanize_hangul(text):
+    """한글 음절을 로마자로 바꾸는 함수 (한글 외 문자는 소문자로 그대로)"""
+    result = []
+    for ch in text:
+        if _is_hangul_syllable(ch):
+            offset = ord(ch) - HANGUL_BASE
+            result.append(ROMAN_CHOSEONG[offset // 588])
+            result.append(ROMAN_JUNGSEONG[(offset % 588) // 28])
+            result.append(ROMAN_JONGSEONG[offset % 28])
+        else:
+            result.append(ch.lower())
+    return ''.join(result)
+
+def canonical_name(name):
+    """소문자화, 특수문자 제거, 법인 형태 접미사(pvt, ltd, 인도법인, 법인 등)를 제거한 기업명"""
+    if not isinstance(name, str) or not name:
+        return ''
+
+    name = re.sub(r'[^\w\s]', ' ', name.lower())
+    words = [word for word in name.split() if word not in SUFFIX_WORDS]
+
+    # 마지막 단어에 붙어 있는 국문 접미사 제거
+    if words:
+        for suffix in GLUED_SUFFIXES:
+            if words[-1].endswith(suffix) and len(words[-1]) > len(suffix):
+                words[-1] = words[-1][:-len(suffix)]
+                break
+
+    return ' '.join(words)
+
+def phonetic_key(name):
+    """국문/영문 기업명을 같은 공간에서 비교할 수 있는 발음(자음 골격) 키
+
+    로마자로 바꾼 뒤 모음과 h/w/y를 버리고, 비슷한 자음을 묶고, 연속된 같은 자음을 합친다.
+    예) '현대모비스' → 'ntmps', 'Hyundai Mobis' → 'ntmps'
+    """
+    romanized = romanize_hangul(canonical_name(name))
+
+    key = []
+    for ch in romanized:
+        mapped = PHONETIC_MAP.get(ch)
+        if mapped and (not key or key[-1] != mapped):
+            key.append(mapped)
+
+    key = ''.join(key)
+    return key if len(key) >= MIN_PHONETIC_KEY_LENGTH else ''
+
+def name_keys(name):
+    """기업명 하나에 대한 모든 키를 딕셔너리로 반환하는 함수"""
+    canonical = canonical_name(name)
+    return {
+        'canonical': canonical,
+        'romanized': romanize_hangul(canonical).replace(' ', ''),
+        'jamo': decompose_jamo(canonical).replace(' ', ''),
+        'phonetic': phonetic_key(name),
+    }
+
+def add_name_keys(df, kr_col, en_col):
+    """데이터프레임에 국문/영문 기업명 키 컬럼을 추가하는 함수 (행마다 한 번만 계산)
+
+    추가 컬럼: name_key_{canonical,romanized,jamo,phonetic}_kr, name_key_{canonical,phonetic}_en
+    """
+    kr_keys = [name_keys(name) for name in df[kr_col]]
+    for key in ['canonical', 'romanized', 'jamo', 'phonetic']:
+        df[f'name_key_{key}_kr'] = [keys[key] for keys in kr_keys]
+
+    df['name_key_canonical_en'] = [canonical_name(name) for name in df[en_col]]
+    df['name_key_phonetic_en'] = [phonetic_key(name) for name in df[en_col]]
+
+    return df
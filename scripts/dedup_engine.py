@@ -0,0 +1,144 @@
+import os
+import pickle
+import tempfile
+import zlib
+
+# 레코드 중복 제거 엔진
+# 키(예: company_name_kr)별로 한 건만 남기되, 어떤 레코드를 남길지는 선언적 규칙 목록으로 정한다.
+# 레코드마다 순위(rank)를 한 번만 계산하고 한 번 훑으면서 키별 최선 레코드만 유지하며,
+# 키 종류가 메모리 한도를 넘으면 키 해시로 나눈 임시 파일에 내려 파티션별로 처리한다.
+
+# 정보 완성도 (비어 있지 않은 값의 수)를 가리키는 특수 필드명
+COMPLETENESS = '_completeness'
+
+# 기본 유지 규칙 (위에서부터 우선 적용, 모두 같으면 먼저 나온 레코드 유지)
+# 1. sales_division이 있는 레코드 우선
+# 2. 정보 완성도가 높은 레코드 우선
+DEFAULT_RULES = [
+    ('prefer_value', 'sales_division'),
+    ('max', COMPLETENESS),
+]
+
+# 메모리에 유지할 최대 키 수와, 넘었을 때 나눌 파티션 수
+DEFAULT_MAX_GROUPS = 500_000
+SPILL_PARTITIONS = 64
+
+def _has_value(value):
+    return value is not None and str(value).strip() != ''
+
+def completeness_score(record):
+    """레코드에서 비어 있지 않은 값의 수"""
+    return sum(1 for value in record.values() if _has_value(value))
+
+def _rank(record, rules):
+    """규칙 목록에 따른 정렬 키 (작을수록 우선)
+
+    규칙: ('prefer_value', 필드) 값이 있는 레코드 우선,
+          ('max', 필드) 값이 큰 레코드 우선, ('min', 필드) 값이 작은 레코드 우선
+    필드 자리에 COMPLETENESS를 쓰면 정보 완성도를 사용한다.
+    """
+    completeness = None
+    rank = []
+    for rule, field in rules:
+        if field == COMPLETENESS:
+            if completeness is None:
+                completeness = completeness_score(record)
+            value = completeness
+        else:
+            value = record.get(field)
+
+        if rule == 'prefer_value':
+            rank.append(0 if _has_value(value) else 1)
+        elif rule == 'max':
+            rank.append(-(value or 0))
+        elif rule == 'min':
+            rank.append(value if value is not None else float('inf'))
+        else:
+            raise ValueError(f"알 수 없는 유지 규칙: {rule}")
+    return tuple(rank)
+
+def _key_function(key):
+    return key if callable(key) else (lambda record: record.get(key))
+
+def _reduce(entries, groups):
+    """(키, 순위, 레코드, 개수) 항목들을 키별 최선 레코드로 합치는 함수"""
+    for group_key, rank, record, count in entries:
+        current = groups.get(group_key)
+        if current is None:
+            groups[group_key] = [rank, record, count]
+        else:
+            current[2] += count
+            if rank < current[0]:
+                current[0] = rank
+                current[1] = record
+
+def _read_partition(path):
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+def dedup_records(records, key='company_name_kr', rules=DEFAULT_RULES, max_groups_in_memory=DEFAULT_MAX_GROUPS,
+                  spill_dir=None):
+    """키별로 유지할 레코드 하나와 그 키의 레코드 수를 (record, group_size)로 반환하는 제너레이터
+
+    key: 필드명 또는 레코드를 받아 키를 반환하는 함수. 키가 비어 있는 레코드는 제외한다.
+    rules: 유지 규칙 목록 (DEFAULT_RULES 참고). 순위가 같으면 먼저 나온 레코드를 유지한다.
+    메모리 안에서 끝나면 키가 처음 나온 순서로, 디스크로 내린 경우 파티션 순서로 반환한다.
+    """
+    key_of = _key_function(key)
+    groups = {}
+
+    def entries():
+        for position, record in enumerate(records):
+            group_key = key_of(record)
+            if not _has_value(group_key):
+                continue
+            yield group_key, _rank(record, rules) + (position,), record, 1
+
+    stream = entries()
+    for entry in stream:
+        _reduce([entry], groups)
+        if len(groups) > max_groups_in_memory:
+            break
+    else:
+        for rank, record, count in groups.values():
+            yield record, count
+        return
+
+    # 메모리 한도 초과: 지금까지의 결과와 남은 레코드를 키 해시별 파일로 나눠 저장
+    with tempfile.TemporaryDirectory(dir=spill_dir, prefix='dedup_') as temp_dir:
+        paths = [os.path.join(temp_dir, f'part_{i:03d}.pkl') for i in range(SPILL_PARTITIONS)]
+        partition_files = [open(path, 'wb') for path in paths]
+        try:
+            def spill(group_key, rank, record, count):
+                partition = zlib.crc32(repr(group_key).encode('utf-8')) % SPILL_PARTITIONS
+                pickle.dump((group_key, rank, record, count), partition_files[partition],
+                            protocol=pickle.HIGHEST_PROTOCOL)
+
+            for group_key, (rank, record, count) in groups.items():
+                spill(group_key, rank, record, count)
+            groups = None
+            for entry in stream:
+                spill(*entry)
+        finally:
+            for f in partition_files:
+                f.close()
+
+        for path in paths:
+            partition_groups = {}
+            _reduce(_read_partition(path), partition_groups)
+            for rank, record, count in sorted(partition_groups.values(), key=lambda group: group[0][-1]):
+                yield record, count
+
+def deduplicate(records, key='company_name_kr', rules=DEFAULT_RULES, **kwargs):
+    """중복을 제거한 레코드 리스트와 중복이 있던 키 수를 (records, duplicate_groups)로 반환하는 함수"""
+    survivors = []
+    duplicate_groups = 0
+    for record, count in dedup_records(records, key, rules, **kwargs):
+        survivors.append(record)
+        if count > 1:
+            duplicate_groups += 1
+    return survivors, duplicate_groups
@@ -0,0 +1,235 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from pg_copy import write_rows
+from sheet_detect import find_label_row, find_text_row
+from workbook_loader import read_sheet
+
+# Euro Pricing 시트 적재 엔진
+# 시트마다 업로드 함수를 따로 두는 대신, 시트별 선언적 명세(SHEET_SPECS)에 따라
+# 데이터 시작 행을 찾고, 컬럼 블록(시작 위치 → 대상 컬럼)을 블록 단위로 한 번에 변환해 일괄 적재한다.
+# 새 시트는 SHEET_SPECS에 명세만 추가하면 된다.
+#
+# 명세 항목
+#   sheet, table: 엑셀 시트 이름과 대상 테이블
+#   start: 데이터 시작 행 찾기 (없으면 첫 행부터 데이터)
+#     {'header_labels': [...]}  이 값 중 하나가 들어 있는 행을 헤더로 보고 다음 행부터 데이터
+#     {'keywords': [...]}        첫 컬럼 값에 키워드 중 하나가 들어 있는 첫 행부터 데이터
+#     {'requires': [...]}        (keywords와 함께) 첫 컬럼 값에 모두 들어 있어야 하는 문자열
+#     {'pattern': 정규식}         첫 컬럼 값 전체가 정규식과 일치하는 첫 행부터 데이터
+#     {'exclude': [...]}         (keywords/pattern과 함께) 제목 행 등 데이터 시작으로 보지 않을 첫 컬럼 값
+#   max_rows: 데이터 시작 행부터 읽을 최대 행 수 (없으면 끝까지)
+#   blocks: 컬럼 블록 목록 (첫 블록의 첫 컬럼이 비어 있는 행은 제외)
+#     {'start': 시작 컬럼 위치, 'columns': [대상 컬럼...], 'type': 'text' | 'numeric',
+#      'strip': 문자열 앞뒤 공백 제거 여부, 'fill': 빈 셀 값 (기본 None)}
+#     {'columns': [...], 'type': 'constant', 'value': 값}  시트에 없는 컬럼을 고정값으로 채움
+
+logger = logging.getLogger(__name__)
+
+YEARS = [str(year) for year in range(2017, 2031)]
+
+def year_columns(prefix, years=YEARS):
+    """['year_2017', ...] 처럼 접두사와 년도로 대상 컬럼 목록을 만드는 함수"""
+    return [f"{prefix}{year}" for year in years]
+
+# upload_all_complete의 키워드 목록을 따른다. 예전 upload_additional_sheets에 있던 'Potential'은
+# 9개 지역별 시트의 첫 컬럼에 나오지 않아(시작 행이 같음) 뺐다. ('Lit v Potential' 시트는 명세 대상이 아님)
+REGIONAL_KEYWORDS = ['Capacity', 'Used', 'Lit', 'Revenue', 'Price', 'Deployed']
+
+def regional_spec(sheet, table):
+    """지역별 상세 시트(Trans-Atlantic 등) 명세: 메트릭명 + 년도 값(1~14열) + 전년 대비 변화(16~28열)"""
+    return {
+        'sheet': sheet,
+        'table': table,
+        'start': {'keywords': REGIONAL_KEYWORDS},
+        'blocks': [
+            {'start': 0, 'columns': ['metric_name'], 'type': 'text', 'strip': True},
+            {'start': 1, 'columns': year_columns('year_'), 'type': 'numeric'},
+            {'start': 16, 'columns': year_columns('change_', YEARS[1:]), 'type': 'numeric'},
+            {'columns': ['cagr_2023_30'], 'type': 'constant', 'value': None},
+        ],
+    }
+
+SHEET_SPECS = [
+    {
+        'sheet': 'Country Routes',
+        'table': 'euro_pricing_country_routes',
+        'start': {'header_labels': ['Country1', 'Country2']},
+        'blocks': [
+            {'start': 0, 'columns': ['country1', 'country2', 'subregion1', 'subregion2', 'region1', 'region2'],
+             'type': 'text', 'fill': ''},
+            {'start': 6, 'columns': year_columns('year_'), 'type': 'numeric'},
+            {'start': 20, 'columns': ['cagr_2023_30'], 'type': 'text'},
+        ],
+    },
+    {
+        'sheet': 'Wholesale Prices',
+        'table': 'euro_pricing_wholesale_prices',
+        'start': {'requires': ['-'], 'keywords': ['London', 'New York', 'Tokyo', 'Frankfurt']},
+        'blocks': [
+            {'start': 0, 'columns': ['route_name'], 'type': 'text', 'strip': True},
+            {'start': 1, 'columns': year_columns('year_'), 'type': 'numeric'},
+            {'columns': ['cagr_2023_30'], 'type': 'constant', 'value': None},
+        ],
+    },
+    {
+        'sheet': 'Regions',
+        'table': 'euro_pricing_regions',
+        'start': {'keywords': ['Asia', 'Europe', 'America', 'Africa', 'Total']},
+        'blocks': [
+            {'start': 0, 'columns': ['region_name'], 'type': 'text', 'strip': True},
+            {'start': 1, 'columns': year_columns('historical_', YEARS[:7]), 'type': 'numeric'},
+            {'start': 8, 'columns': year_columns('forecast_', YEARS[7:]), 'type': 'numeric'},
+        ],
+    },
+    {
+        # 테이블이 너무 커서 처음 50개 국가만 적재
+        'sheet': 'Countries',
+        'table': 'euro_pricing_countries',
+        'start': {'pattern': r'[^\W\d_]{3,}'},
+        'max_rows': 50,
+        'blocks': [
+            {'start': 0, 'columns': ['country_name'], 'type': 'text', 'strip': True},
+            {'start': 2, 'columns': year_columns('total_bandwidth_'), 'type': 'numeric'},
+            {'start': 16, 'columns': year_columns('backbone_providers_'), 'type': 'numeric'},
+            {'start': 31, 'columns': year_columns('content_providers_'), 'type': 'numeric'},
+        ],
+    },
+    regional_spec('Trans-Atlantic', 'euro_pricing_trans_atlantic'),
+    regional_spec('Trans-Pacific', 'euro_pricing_trans_pacific'),
+    regional_spec('US-Latin America', 'euro_pricing_us_latin_america'),
+    regional_spec('Intra-Asia', 'euro_pricing_intra_asia'),
+    regional_spec('Europe-Middle East & Egypt', 'euro_pricing_europe_middle_east_and_egypt'),
+    regional_spec('Europe-East Asia', 'euro_pricing_europe_east_asia'),
+    regional_spec('Europe-South Asia', 'euro_pricing_europe_south_asia'),
+    regional_spec('East Asia-South Asia', 'euro_pricing_east_asia_south_asia'),
+    regional_spec('Europe-Sub-Saharan Africa', 'euro_pricing_europe_sub_saharan_africa'),
+]
+
+# 계산기 시트 (create_tables.sql의 euro_pricing_lease_iru_calculator, 전체 적재 대상은 아님)
+# 항목명은 두 번째 열, 값은 세 번째 열에 있다.
+LEASE_IRU_SPEC = {
+    'sheet': 'Lease-IRU Calculator',
+    'table': 'euro_pricing_lease_iru_calculator',
+    'blocks': [
+        {'start': 1, 'columns': ['parameter', 'value'], 'type': 'text', 'strip': True, 'fill': ''},
+        {'columns': ['unit', 'note'], 'type': 'constant', 'value': ''},
+    ],
+}
+
+def get_spec(sheet_name):
+    """시트 이름으로 명세를 찾는 함수"""
+    for spec in SHEET_SPECS:
+        if spec['sheet'] == sheet_name:
+            return spec
+    raise KeyError(f"명세가 없는 시트: {sheet_name}")
+
+def find_data_start(df, start):
+    """명세의 start 조건으로 데이터 시작 행 위치를 찾는 함수 (없으면 None)
+
+    시트 전체/첫 컬럼에 대한 마스크를 한 번에 만들어 첫 일치 행을 고른다. (sheet_detect 참고)
+    """
+    if 'header_labels' in start:
+        header_row = find_label_row(df, start['header_labels'])
+        return None if header_row is None else header_row + 1
+
+    conditions = {key: start[key] for key in ('keywords', 'requires', 'pattern', 'exclude') if key in start}
+    return find_text_row(df.iloc[:, 0], **conditions)
+
+def coerce_numeric(frame, keep_text=False):
+    """블록 전체를 컬럼 단위 pd.to_numeric(errors='coerce')로 float 값으로 바꾸는 함수
+
+    셀마다 float()을 try/except로 감싸는 대신 블록을 한 번에 변환한다.
+    숫자로 바꿀 수 없는 값은 None이 되며, keep_text=True이면 원래 값을 문자열로 남긴다.
+    """
+    values = frame.apply(pd.to_numeric, errors='coerce').astype('float64')
+    values = values.where(np.isfinite(values))
+    result = values.astype(object).where(values.notna(), None)
+    if keep_text:
+        text = frame.notna() & values.isna()
+        result = result.mask(text, frame.astype(object).where(text, '').map(str))
+    return result
+
+def to_records(frame):
+    """NaN/무한대를 한 번에 None으로 바꾼 뒤 레코드(딕셔너리) 리스트를 만드는 함수
+
+    to_dict('records')와 같은 결과지만, 이미 object 블록이므로 값 변환 없이 행 배열을 그대로 묶는다.
+    """
+    frame = frame.astype(object)
+    missing = frame.isna() | frame.isin([np.inf, -np.inf])
+    columns = list(frame.columns)
+    return [dict(zip(columns, row)) for row in frame.where(~missing, None).to_numpy().tolist()]
+
+def _block_frame(data, block):
+    """컬럼 블록 하나를 대상 컬럼 DataFrame으로 변환하는 함수 (시트에 없는 위치는 빈 셀로 취급)"""
+    columns = block['columns']
+    if block['type'] == 'constant':
+        return pd.DataFrame({column: [block['value']] * len(data) for column in columns}, index=data.index)
+
+    start = block['start']
+    source = data.iloc[:, start:start + len(columns)]
+    source = source.set_axis(columns[:source.shape[1]], axis=1).reindex(columns=columns)
+
+    if block['type'] == 'numeric':
+        return coerce_numeric(source)
+
+    if block['type'] == 'text':
+        present = source.notna()
+        text = source.astype(object).where(present, '').map(str)
+        if block.get('strip'):
+            text = text.apply(lambda column: column.str.strip())
+        return text.where(present, block.get('fill'))
+
+    raise ValueError(f"알 수 없는 블록 타입: {block['type']}")
+
+def transform_sheet(df, spec):
+    """시트 DataFrame을 명세에 따라 레코드 리스트로 변환하는 함수 (데이터 시작 행이 없으면 None)"""
+    data_start = find_data_start(df, spec['start']) if spec.get('start') else 0
+    if data_start is None:
+        return None
+
+    end = data_start + spec['max_rows'] if spec.get('max_rows') else None
+    data = df.iloc[data_start:end]
+
+    # 첫 블록의 첫 컬럼(이름/키)이 비어 있는 행 제외
+    key = data.iloc[:, spec['blocks'][0]['start']]
+    data = data[key.notna() & (key.astype(str).str.strip() != '')]
+
+    frame = pd.concat([_block_frame(data, block) for block in spec['blocks']], axis=1)
+    return to_records(frame)
+
+def log_write_errors(report):
+    """쓰기 결과의 행 단위 오류를 로그로 남기는 함수"""
+    for error in report['errors'][:10]:
+        logger.error(f"  ❌ {error['index']}번째 레코드 업로드 실패: {error['error']}")
+    if len(report['errors']) > 10:
+        logger.error(f"  ... 외 {len(report['errors']) - 10}개 레코드 실패")
+
+def ingest_sheet(supabase, excel_file_path, spec, conn=None):
+    """명세 하나에 해당하는 시트를 읽어 변환하고 대상 테이블에 적재하는 함수 (적재된 행 수 반환)"""
+    sheet_name = spec['sheet']
+    logger.info(f"🔄 {sheet_name} 시트 처리 중...")
+
+    try:
+        records = transform_sheet(read_sheet(excel_file_path, sheet_name), spec)
+        if records is None:
+            logger.warning(f"  ⚠️ {sheet_name}: 데이터 시작점을 찾을 수 없습니다.")
+            return 0
+        if not records:
+            logger.warning(f"  ⚠️ {sheet_name}: 업로드할 데이터가 없습니다.")
+            return 0
+
+        report = write_rows(supabase, spec['table'], records, conn=conn)
+        log_write_errors(report)
+        logger.info(f"  ✅ {sheet_name} 완료: {report['inserted']}개 레코드")
+        return report['inserted']
+
+    except Exception as e:
+        logger.error(f"❌ {sheet_name} 처리 오류: {str(e)}")
+        return 0
+
+def ingest_workbook(supabase, excel_file_path, specs=SHEET_SPECS, conn=None):
+    """명세 목록의 시트를 차례로 적재하고 {시트 이름: 적재 행 수}를 반환하는 함수"""
+    return {spec['sheet']: ingest_sheet(supabase, excel_file_path, spec, conn=conn) for spec in specs}
@@ -7,6 +7,8 @@ import os
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from supabase_reader import iter_table_rows
+
 def find_chennai_companies():
     """기업명에 '첸나이'가 포함된 다른 지역 기업을 찾는 함수"""
     
@@ -24,47 +26,45 @@ def find_chennai_companies():
     print("=== 기업명에 '첸나이' 포함된 다른 지역 기업 찾기 ===\n")
     
     try:
-        # 모든 기업 데이터 조회
-        all_data = supabase.table('kotra').select('*').execute()
+        # 기업명에 '첸나이'가 포함된 기업만 서버에서 걸러 페이지 단위로 조회
+        name_matches = iter_table_rows(
+            supabase, 'kotra',
+            columns='id, company_name_kr, company_name_en, office, sales_division',
+            filters=[('like', 'company_name_kr', '%첸나이%')]
+        )
+        
+        # 다른 지역 기업 찾기 (office가 NULL인 기업도 포함되도록 office 조건은 여기서 적용)
+        chennai_in_name = [c for c in name_matches if c.get('office') not in ['첸나이', '첸나이무역관']]
         
-        if all_data.data:
-            # 기업명에 '첸나이'가 포함된 다른 지역 기업 찾기
-            chennai_in_name = [c for c in all_data.data 
-                             if c.get('office') not in ['첸나이', '첸나이무역관'] 
-                             and '첸나이' in (c.get('company_name_kr') or '')]
+        print(f"📋 기업명에 '첸나이' 포함된 다른 지역 기업: {len(chennai_in_name)}개")
+        print()
+        
+        if chennai_in_name:
+            print("🔍 발견된 기업들:")
+            for i, company in enumerate(chennai_in_name, 1):
+                print(f"{i:2d}. {company.get('company_name_kr', '')}")
+                print(f"     - 영문명: {company.get('company_name_en', '')}")
+                print(f"     - 현재 office: {company.get('office', '')}")
+                print(f"     - 영업조직: {company.get('sales_division', '없음')}")
+                print()
+            
+            # 이동할 기업 선택 (상위 3개)
+            companies_to_move = chennai_in_name[:3]
+            
+            print(f"🎯 이동 대상 기업 (상위 3개):")
+            for i, company in enumerate(companies_to_move, 1):
+                print(f"{i}. {company.get('company_name_kr', '')} (현재: {company.get('office', '')} → 첸나이)")
             
-            print(f"📋 기업명에 '첸나이' 포함된 다른 지역 기업: {len(chennai_in_name)}개")
             print()
+            print("💡 다음 단계:")
+            print("1. 위 3개 기업의 office를 '첸나이'로 변경")
+            print("2. 영업조직 매칭 추가 작업")
+            print("3. 뭄바이 기업 수 조정")
             
-            if chennai_in_name:
-                print("🔍 발견된 기업들:")
-                for i, company in enumerate(chennai_in_name, 1):
-                    print(f"{i:2d}. {company.get('company_name_kr', '')}")
-                    print(f"     - 영문명: {company.get('company_name_en', '')}")
-                    print(f"     - 현재 office: {company.get('office', '')}")
-                    print(f"     - 영업조직: {company.get('sales_division', '없음')}")
-                    print()
-                
-                # 이동할 기업 선택 (상위 3개)
-                companies_to_move = chennai_in_name[:3]
-                
-                print(f"🎯 이동 대상 기업 (상위 3개):")
-                for i, company in enumerate(companies_to_move, 1):
-                    print(f"{i}. {company.get('company_name_kr', '')} (현재: {company.get('office', '')} → 첸나이)")
-                
-                print()
-                print("💡 다음 단계:")
-                print("1. 위 3개 기업의 office를 '첸나이'로 변경")
-                print("2. 영업조직 매칭 추가 작업")
-                print("3. 뭄바이 기업 수 조정")
-                
-                return companies_to_move
-            else:
-                print("❌ 기업명에 '첸나이'가 포함된 다른 지역 기업이 없습니다.")
-                print("💡 대안: 수동으로 3개 기업을 추가하거나 목표 수치를 조정해야 합니다.")
-                
+            return companies_to_move
         else:
-            print("❌ 데이터를 가져올 수 없습니다.")
+            print("❌ 기업명에 '첸나이'가 포함된 다른 지역 기업이 없습니다.")
+            print("💡 대안: 수동으로 3개 기업을 추가하거나 목표 수치를 조정해야 합니다.")
             
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
@@ -4,7 +4,10 @@ from supabase import create_client
 import os
 from dotenv import load_dotenv
 import json
-from difflib import SequenceMatcher
+
+from company_index import bounded_similarity, build_name_index, find_candidates
+from sheet_detect import find_year_columns
+from supabase_reader import fetch_table
 
 load_dotenv()
 
@@ -13,6 +16,54 @@ url = os.getenv("VITE_SUPABASE_URL")
 key = os.getenv("VITE_SUPABASE_ANON_KEY")
 supabase = create_client(url, key)
 
+def fetch_all_customers(page_size=1000):
+    """gtm_customers 전체를 id 기준 keyset 페이지 단위로 가져오는 함수 (서버 max-rows 제한 회피)"""
+    return fetch_table(supabase, 'gtm_customers', page_size=page_size)
+
+def match_customer_names(excel_customer_names, supabase_customer_names, threshold=0.8):
+    """Excel 고객명 전체를 Supabase 고객명과 대조하는 함수
+
+    n-gram 후보 인덱스로 비교 대상을 좁힌 뒤 유사도가 threshold를 넘는 가장 비슷한 이름을 찾는다.
+    반환값: (정확한 매칭 리스트, 유사 매칭 리스트, 매칭 없음 리스트)
+    """
+    supabase_names = [str(name) for name in supabase_customer_names]
+    supabase_name_set = set(supabase_names)
+    name_index = build_name_index(supabase_names)
+
+    exact_matches = []
+    partial_matches = []
+    no_matches = []
+
+    for excel_name in excel_customer_names:
+        excel_name_str = str(excel_name).strip()
+
+        # 정확한 매칭
+        if excel_name_str in supabase_name_set:
+            exact_matches.append(excel_name_str)
+            continue
+
+        # 부분 매칭 찾기 (후보 인덱스로 좁힌 이름만 비교)
+        best_match = None
+        best_score = 0
+
+        for pos in sorted(find_candidates(name_index, excel_name_str)):
+            supabase_name = supabase_names[pos]
+            score = bounded_similarity(excel_name_str, supabase_name, max(threshold, best_score))
+            if score > best_score and score > threshold:  # 80% 이상 유사도
+                best_score = score
+                best_match = supabase_name
+
+        if best_match:
+            partial_matches.append({
+                'excel': excel_name_str,
+                'supabase': best_match,
+                'score': best_score
+            })
+        else:
+            no_matches.append(excel_name_str)
+
+    return exact_matches, partial_matches, no_matches
+
 def analyze_data_mapping():
     """Excel과 Supabase 데이터 매핑 분석"""
     
@@ -35,7 +86,7 @@ def analyze_data_mapping():
     print("\n2. Supabase 데이터 로드")
     print("-" * 50)
     
-    # gtm_customers 데이터 가져오기 (샘플)
+    # gtm_customers 데이터 전체 가져오기 (페이지네이션)
     try:
         # 먼저 전체 개수 확인
         count_response = supabase.table('gtm_customers').select("*", count='exact', head=True).execute()
@@ -43,17 +94,8 @@ def analyze_data_mapping():
         print(f"  gtm_customers 전체: {total_count} 레코드")
         
         # 실제 데이터 가져오기
-        customers_response = supabase.table('gtm_customers').select("*").limit(1000).execute()
-        
-        if customers_response.data:
-            supabase_customers = pd.DataFrame(customers_response.data)
-            print(f"  샘플 로드: {len(supabase_customers)} 레코드")
-        else:
-            print("  데이터 로드 실패, 다시 시도")
-            # 페이지네이션으로 시도
-            customers_response = supabase.table('gtm_customers').select("*").range(0, 999).execute()
-            supabase_customers = pd.DataFrame(customers_response.data)
-            print(f"  샘플 로드 (range): {len(supabase_customers)} 레코드")
+        supabase_customers = pd.DataFrame(fetch_all_customers())
+        print(f"  전체 로드: {len(supabase_customers)} 레코드")
             
     except Exception as e:
         print(f"  오류 발생: {str(e)}")
@@ -86,38 +128,12 @@ def analyze_data_mapping():
                 print(f"  사용 가능한 컬럼: {list(supabase_customers.columns[:10]) if not supabase_customers.empty else 'None'}")
                 supabase_customer_names = []
             
-            # 정확한 매칭 찾기
-            exact_matches = []
-            partial_matches = []
-            no_matches = []
-            
-            for excel_name in excel_customer_names[:50]:  # 처음 50개만 테스트
-                excel_name_str = str(excel_name).strip()
-                
-                # 정확한 매칭
-                if excel_name_str in supabase_customer_names:
-                    exact_matches.append(excel_name_str)
-                else:
-                    # 부분 매칭 찾기
-                    best_match = None
-                    best_score = 0
-                    
-                    for supabase_name in supabase_customer_names:
-                        score = SequenceMatcher(None, excel_name_str, str(supabase_name)).ratio()
-                        if score > best_score and score > 0.8:  # 80% 이상 유사도
-                            best_score = score
-                            best_match = supabase_name
-                    
-                    if best_match:
-                        partial_matches.append({
-                            'excel': excel_name_str,
-                            'supabase': best_match,
-                            'score': best_score
-                        })
-                    else:
-                        no_matches.append(excel_name_str)
+            # 전체 고객 대조
+            exact_matches, partial_matches, no_matches = match_customer_names(
+                excel_customer_names, supabase_customer_names
+            )
             
-            print(f"\n  매칭 결과 (샘플 50개):")
+            print(f"\n  매칭 결과 (전체 {len(excel_customer_names)}개):")
             print(f"    - 정확한 매칭: {len(exact_matches)}개")
             print(f"    - 유사 매칭: {len(partial_matches)}개")
             print(f"    - 매칭 없음: {len(no_matches)}개")
@@ -160,7 +176,7 @@ def analyze_data_mapping():
         revenue_df = excel_data['매출집계']
         
         # 연도 컬럼 찾기
-        year_cols = [col for col in revenue_df.columns if str(col).isdigit() and 2020 <= int(str(col)) <= 2030]
+        year_cols = find_year_columns(revenue_df.columns, 2020, 2030)
         month_cols = [col for col in revenue_df.columns if '월' in str(col)]
         
         print(f"  연도별 컬럼: {year_cols}")
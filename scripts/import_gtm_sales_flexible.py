@@ -11,6 +11,8 @@ from supabase import create_client, Client
 from dotenv import load_dotenv
 import re
 
+from pg_copy import connect_for_backend, write_rows
+
 # 환경 변수 로드
 load_dotenv()
 
@@ -40,8 +42,54 @@ def parse_revenue_amount(value):
             return None
     return float(value)
 
-def import_flexible_structure():
-    """CSV를 유연한 구조로 import"""
+def write_sales_rows(master_rows, revenue_rows, conn=None):
+    """마스터/월별 매출 행을 일괄 UPSERT하고 실패한 서비스ID와 오류 메시지를 반환하는 함수
+    
+    conn이 있으면 두 테이블을 한 트랜잭션 안에서 Postgres COPY로 보내 하나라도 실패하면 전체를 롤백하고,
+    없으면 PostgREST 배치 UPSERT로 보내되 마스터 UPSERT에 실패한 서비스ID의 월별 매출은 보내지 않는다.
+    """
+    failed_service_ids = set()
+    errors = []
+    tables = [
+        ('gtm_sales_master', master_rows, 'service_id'),
+        ('gtm_sales_revenues', revenue_rows, 'service_id,revenue_month')
+    ]
+    
+    if conn is not None:
+        try:
+            with conn.transaction():
+                for table, rows, on_conflict in tables:
+                    if rows:
+                        write_rows(supabase, table, rows, conn=conn, on_conflict=on_conflict)
+        except Exception as e:
+            # 마스터/월별 매출 모두 반영되지 않음
+            failed_service_ids.update(row['service_id'] for _, rows, _ in tables for row in rows)
+            errors.append(f"COPY 업로드 중 오류 (전체 롤백): {str(e)}")
+        return failed_service_ids, errors
+    
+    for table, rows, on_conflict in tables:
+        # 마스터가 없는 월별 매출은 보내지 않음 (실패한 서비스ID로 이미 집계됨)
+        rows = [row for row in rows if row['service_id'] not in failed_service_ids]
+        if not rows:
+            continue
+        try:
+            report = write_rows(supabase, table, rows, on_conflict=on_conflict)
+        except Exception as e:
+            failed_service_ids.update(row['service_id'] for row in rows)
+            errors.append(f"{table} 업로드 중 오류: {str(e)}")
+            continue
+        
+        for error in report['errors']:
+            failed_service_ids.add(error['row']['service_id'])
+            errors.append(f"{table} 서비스ID {error['row']['service_id']} 처리 중 오류: {error['error']}")
+    
+    return failed_service_ids, errors
+
+def import_flexible_structure(backend='rest'):
+    """CSV를 유연한 구조로 import
+    
+    backend: 'rest'(PostgREST 배치 UPSERT) 또는 'copy'(SUPABASE_DB_URL로 직접 연결해 COPY)
+    """
     
     # CSV 파일 읽기
     csv_path = 'D:/Dev/epsilon-data-analyzer/data/gtm/Global_Sales.csv'
@@ -65,6 +113,11 @@ def import_flexible_structure():
     for col, month in revenue_columns:
         print(f"  - {col} -> {month}")
     
+    # 행별로 UPSERT할 데이터를 모은 뒤 한 번에 전송 (같은 키는 마지막 행 값 사용)
+    master_rows = {}
+    revenue_rows = {}
+    row_service_ids = []
+    
     for index, row in df.iterrows():
         try:
             # 서비스ID가 없으면 건너뛰기
@@ -73,8 +126,8 @@ def import_flexible_structure():
             
             service_id = str(row['서비스ID'])
             
-            # 1. 마스터 데이터 입력/업데이트
-            master_data = {
+            # 1. 마스터 데이터
+            master_rows[service_id] = {
                 'division': str(row['구분']) if pd.notna(row['구분']) else None,
                 'settlement_type': str(row['결산구분']) if pd.notna(row['결산구분']) else None,
                 'bm_manager': str(row['BM담당']) if pd.notna(row['BM담당']) else None,
@@ -90,32 +143,19 @@ def import_flexible_structure():
                 'capacity_unit': str(row['용량단위']) if pd.notna(row['용량단위']) else None
             }
             
-            # 마스터 테이블에 UPSERT
-            supabase.table('gtm_sales_master').upsert(
-                master_data,
-                on_conflict='service_id'
-            ).execute()
-            
-            # 2. 월별 매출 데이터 입력
+            # 2. 월별 매출 데이터
             for col_name, month_code in revenue_columns:
                 revenue_amount = parse_revenue_amount(row[col_name])
                 
                 # NULL이 아닌 경우만 입력 (0도 저장)
                 if revenue_amount is not None:
-                    revenue_data = {
+                    revenue_rows[(service_id, month_code)] = {
                         'service_id': service_id,
                         'revenue_month': month_code,
                         'revenue_amount': revenue_amount
                     }
-                    
-                    supabase.table('gtm_sales_revenues').upsert(
-                        revenue_data,
-                        on_conflict='service_id,revenue_month'
-                    ).execute()
             
-            success_count += 1
-            if (success_count % 10) == 0:
-                print(f"처리 완료: {success_count}개")
+            row_service_ids.append(service_id)
                 
         except Exception as e:
             error_count += 1
@@ -123,6 +163,25 @@ def import_flexible_structure():
             errors.append(error_msg)
             print(error_msg)
     
+    print(f"업로드 대상: 서비스 {len(master_rows)}개, 매출 레코드 {len(revenue_rows)}개")
+    
+    conn = connect_for_backend(backend)
+    try:
+        failed_service_ids, write_errors = write_sales_rows(list(master_rows.values()), list(revenue_rows.values()), conn)
+    finally:
+        if conn is not None:
+            conn.close()
+    
+    for error_msg in write_errors:
+        errors.append(error_msg)
+        print(error_msg)
+    
+    for service_id in row_service_ids:
+        if service_id in failed_service_ids:
+            error_count += 1
+        else:
+            success_count += 1
+    
     # 결과 출력
     print("\n=== 데이터 입력 완료 ===")
     print(f"성공: {success_count}개")
@@ -152,7 +211,7 @@ def import_flexible_structure():
     
     return success_count, error_count
 
-def add_new_month_data(csv_path, month_code):
+def add_new_month_data(csv_path, month_code, backend='rest'):
     """새로운 월 데이터만 추가하는 함수"""
     
     df = pd.read_csv(csv_path, encoding='utf-8-sig')
@@ -170,7 +229,7 @@ def add_new_month_data(csv_path, month_code):
     
     print(f"처리할 컬럼: {target_col}")
     
-    success_count = 0
+    revenue_rows = {}
     for index, row in df.iterrows():
         if pd.isna(row['서비스ID']) or row['서비스ID'] == '':
             continue
@@ -179,24 +238,33 @@ def add_new_month_data(csv_path, month_code):
         revenue_amount = parse_revenue_amount(row[target_col])
         
         if revenue_amount is not None:
-            revenue_data = {
+            revenue_rows[service_id] = {
                 'service_id': service_id,
                 'revenue_month': month_code,
                 'revenue_amount': revenue_amount
             }
-            
-            supabase.table('gtm_sales_revenues').upsert(
-                revenue_data,
-                on_conflict='service_id,revenue_month'
-            ).execute()
-            
-            success_count += 1
     
+    conn = connect_for_backend(backend)
+    try:
+        failed_service_ids, write_errors = write_sales_rows([], list(revenue_rows.values()), conn)
+    finally:
+        if conn is not None:
+            conn.close()
+    
+    for error_msg in write_errors:
+        print(error_msg)
+    
+    success_count = len(revenue_rows) - len(failed_service_ids)
     print(f"{month_code} 월 데이터 {success_count}개 추가 완료")
 
 if __name__ == "__main__":
     import sys
     
+    # --copy: PostgREST 대신 Postgres에 직접 연결해 COPY로 업로드
+    backend = 'copy' if '--copy' in sys.argv else 'rest'
+    if '--copy' in sys.argv:
+        sys.argv.remove('--copy')
+    
     if len(sys.argv) > 1 and sys.argv[1] == '--add-month':
         # 특정 월만 추가
         if len(sys.argv) < 3:
@@ -205,8 +273,8 @@ if __name__ == "__main__":
         
         month_code = sys.argv[2]
         csv_path = 'D:/Dev/epsilon-data-analyzer/data/gtm/Global_Sales.csv'
-        add_new_month_data(csv_path, month_code)
+        add_new_month_data(csv_path, month_code, backend)
     else:
         # 전체 데이터 import
-        success, errors = import_flexible_structure()
+        success, errors = import_flexible_structure(backend)
         print(f"\n최종 결과: 성공 {success}개, 실패 {errors}개")
\ No newline at end of file
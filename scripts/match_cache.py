@@ -0,0 +1,77 @@
+import json
+import os
+import sqlite3
+
+# 영업조직 매칭 결과 캐시 (SQLite)
+# 양쪽 행의 지문(fingerprint)을 키로 지난 실행의 매칭 결과를 보관해,
+# 바뀌지 않은 행은 다시 계산하지 않고 재사용하기 위한 모듈
+
+CACHE_VERSION = '1'
+
+def _connect(cache_path):
+    """캐시 DB에 연결하고 필요한 테이블을 만드는 함수"""
+    conn = sqlite3.connect(cache_path)
+    conn.executescript('''
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS kotra_rows (
+            fingerprint TEXT PRIMARY KEY
+        );
+        CREATE TABLE IF NOT EXISTS matches (
+            sales_fingerprint TEXT PRIMARY KEY,
+            kotra_fingerprint TEXT,
+            similarity REAL,
+            match_type TEXT
+        );
+    ''')
+    return conn
+
+def _settings(similarity_threshold):
+    """캐시를 재사용할 수 있는 조건(버전, 임계값)을 문자열로 만드는 함수"""
+    return json.dumps({'version': CACHE_VERSION, 'similarity_threshold': similarity_threshold})
+
+def load_match_cache(cache_path, similarity_threshold):
+    """캐시를 읽어 (지난 실행의 kotra 지문 집합, {영업조직 지문: 매칭}) 을 반환하는 함수
+
+    파일이 없거나 버전/임계값이 다르면 빈 캐시를 반환한다.
+    매칭 값은 (kotra 지문 또는 None, 유사도, 매칭 유형) 튜플이다.
+    """
+    if not os.path.exists(cache_path):
+        return set(), {}
+
+    conn = _connect(cache_path)
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'settings'").fetchone()
+        if row is None or row[0] != _settings(similarity_threshold):
+            return set(), {}
+
+        kotra_fingerprints = {fp for (fp,) in conn.execute('SELECT fingerprint FROM kotra_rows')}
+        matches = {
+            sales_fp: (kotra_fp, similarity, match_type)
+            for sales_fp, kotra_fp, similarity, match_type
+            in conn.execute('SELECT sales_fingerprint, kotra_fingerprint, similarity, match_type FROM matches')
+        }
+        return kotra_fingerprints, matches
+    finally:
+        conn.close()
+
+def save_match_cache(cache_path, similarity_threshold, kotra_fingerprints, matches):
+    """이번 실행의 kotra 지문과 매칭 결과로 캐시를 교체하는 함수"""
+    conn = _connect(cache_path)
+    try:
+        with conn:
+            conn.execute('DELETE FROM meta')
+            conn.execute('DELETE FROM kotra_rows')
+            conn.execute('DELETE FROM matches')
+            conn.execute("INSERT INTO meta (key, value) VALUES ('settings', ?)", (_settings(similarity_threshold),))
+            conn.executemany('INSERT INTO kotra_rows (fingerprint) VALUES (?)',
+                             ((fp,) for fp in kotra_fingerprints))
+            conn.executemany(
+                'INSERT INTO matches (sales_fingerprint, kotra_fingerprint, similarity, match_type) VALUES (?, ?, ?, ?)',
+                ((sales_fp, kotra_fp, similarity, match_type)
+                 for sales_fp, (kotra_fp, similarity, match_type) in matches.items())
+            )
+    finally:
+        conn.close()
@@ -1,7 +1,27 @@
 import pandas as pd
 import numpy as np
-from difflib import SequenceMatcher
 import re
+import argparse
+import hashlib
+import heapq
+import json
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from aho_corasick import build_automaton, find_patterns
+from company_index import bounded_similarity, build_name_index, find_candidates
+from company_keys import add_name_keys
+from match_cache import load_match_cache, save_match_cache
+
+# 증분 매칭 캐시 파일 (결과 CSV 옆에 저장)
+MATCH_CACHE_FILE = 'data/kotra_with_sales_division.match_cache.sqlite'
+
+# 발음 키 매칭에 쓰는 기업명 키 컬럼 (add_name_keys가 만드는 컬럼 중 일부)
+CROSS_SCRIPT_KEY_COLUMNS = ['name_key_romanized_kr', 'name_key_phonetic_kr',
+                            'name_key_canonical_en', 'name_key_phonetic_en']
+
+# 상위 k개 후보 검토 파일 (컬럼형 Parquet, pyarrow가 없으면 CSV)
+REVIEW_FILE = 'data/kotra_sales_division_review.parquet'
 
 def normalize_company_name(name):
     """기업명을 정규화하는 함수"""
@@ -24,21 +44,19 @@ def normalize_company_name(name):
     
     return ' '.join(words)
 
-def calculate_similarity(name1, name2):
-    """두 기업명의 유사도를 계산하는 함수"""
+def calculate_similarity(name1, name2, threshold=0.0):
+    """두 기업명의 유사도를 계산하는 함수
+
+    threshold를 주면 유사도가 그 미만인 경우 정확한 값 대신 0을 반환할 수 있다.
+    """
     if pd.isna(name1) or pd.isna(name2) or name1 == '' or name2 == '':
         return 0
     
     norm1 = normalize_company_name(name1)
     norm2 = normalize_company_name(name2)
     
-    if norm1 == norm2:
-        return 1.0
-    
-    # SequenceMatcher를 사용한 유사도 계산
-    similarity = SequenceMatcher(None, norm1, norm2).ratio()
-    
-    return similarity
+    # SequenceMatcher를 사용한 유사도 계산 (임계값 미만은 조기 제외)
+    return bounded_similarity(norm1, norm2, threshold)
 
 def safe_string_contains(text, substring):
     """안전한 문자열 포함 여부 확인"""
@@ -50,88 +68,499 @@ def safe_string_contains(text, substring):
     except:
         return False
 
-def match_companies(sales_division_df, kotra_df, similarity_threshold=0.8):
-    """기업명을 매칭하는 함수"""
-    
+def _normalized_or_none(name):
+    """결측/빈 이름은 None, 그 외에는 정규화된 이름을 반환하는 함수"""
+    if pd.isna(name) or name == '':
+        return None
+    return normalize_company_name(name)
+
+def _kotra_records(kotra_df):
+    """kotra 데이터프레임을 (인덱스, 국문명, 영문명, 현지주소, 정규화 국문명, 정규화 영문명)
+    튜플 리스트로 변환하는 함수 (정규화는 행마다 한 번만 수행)"""
+    columns = []
+    for col in ['company_name_kr', 'company_name_en', 'local_address']:
+        if col in kotra_df.columns:
+            columns.append(kotra_df[col].tolist())
+        else:
+            columns.append([''] * len(kotra_df))
+
+    kr_names, en_names, _ = columns
+    columns.append([_normalized_or_none(name) for name in kr_names])
+    columns.append([_normalized_or_none(name) for name in en_names])
+
+    return list(zip(kotra_df.index.tolist(), *columns))
+
+def _find_best_match(company_kr, company_en, sales_division, kotra_records, similarity_threshold):
+    """주어진 kotra 행들 중 영업조직 기업과 가장 유사한 행을 찾는 함수
+
+    kotra_records는 원래 순서대로 정렬되어 있어야 하며,
+    동점일 경우 먼저 나온 행(국문 > 영문 > 주소 순)이 유지된다.
+    """
+    best_match = None
+    best_similarity = 0
+
+    norm_kr = _normalized_or_none(company_kr)
+    norm_en = _normalized_or_none(company_en)
+
+    for record in kotra_records:
+        _, kotra_company_kr, kotra_company_en, kotra_local_address, kotra_norm_kr, kotra_norm_en = record
+        candidates = []
+
+        # 현재 최고점보다 낮은 점수는 채택될 수 없으므로 임계값을 함께 올려 조기 제외
+        threshold = max(similarity_threshold, best_similarity)
+
+        # 한국어 기업명 매칭
+        if company_kr and kotra_company_kr and norm_kr is not None and kotra_norm_kr is not None:
+            similarity_kr = bounded_similarity(norm_kr, kotra_norm_kr, threshold)
+            if similarity_kr >= similarity_threshold:
+                candidates.append((similarity_kr, 'korean_name'))
+
+        # 영어 기업명 매칭
+        if company_en and kotra_company_en and norm_en is not None and kotra_norm_en is not None:
+            similarity_en = bounded_similarity(norm_en, kotra_norm_en, threshold)
+            if similarity_en >= similarity_threshold:
+                candidates.append((similarity_en, 'english_name'))
+
+        # 주소에서 기업명 추출하여 매칭 (간단한 방법)
+        if kotra_local_address and company_kr:
+            # 주소에서 기업명이 포함되어 있는지 확인
+            if safe_string_contains(kotra_local_address, company_kr):
+                candidates.append((0.9, 'address'))  # 주소 매칭은 높은 점수
+
+        for similarity, match_type in candidates:
+            if similarity > best_similarity:
+                best_similarity = similarity
+                best_match = _build_match(record, company_kr, company_en, sales_division, similarity, match_type)
+
+    return best_match
+
+def _build_match(record, company_kr, company_en, sales_division, similarity, match_type):
+    """kotra 행과 영업조직 기업으로 매칭 결과 딕셔너리를 만드는 함수"""
+    kotra_idx, kotra_company_kr, kotra_company_en, kotra_local_address = record[:4]
+    return {
+        'kotra_index': kotra_idx,
+        'kotra_company_kr': kotra_company_kr,
+        'kotra_company_en': kotra_company_en,
+        'kotra_local_address': kotra_local_address,
+        'sales_division_company_kr': company_kr,
+        'sales_division_company_en': company_en,
+        'sales_division': sales_division,
+        'similarity': similarity,
+        'match_type': match_type
+    }
+
+def build_kotra_index(kotra_df, cross_script=False):
+    """kotra 데이터의 후보 검색용 인덱스를 만드는 함수 (한 번만 생성해 재사용)
+
+    cross_script=True이면 기업명 키(kotra_df는 바꾸지 않고 복사본에서 계산)로
+    국문/영문 발음 키 → 행 위치 버킷과 채점용 로마자 국문명/정규화 영문명을 함께 만든다.
+    """
+    kotra_index = _build_records_index(_kotra_records(kotra_df))
+
+    if cross_script:
+        keys = _name_key_frame(kotra_df, 'company_name_kr', 'company_name_en')
+        for script in ['kr', 'en']:
+            buckets = defaultdict(list)
+            for pos, key in enumerate(keys[f'name_key_phonetic_{script}']):
+                if key:
+                    buckets[key].append(pos)
+            kotra_index[f'phonetic_{script}'] = dict(buckets)
+        kotra_index['romanized_kr'] = keys['name_key_romanized_kr'].tolist()
+        kotra_index['canonical_en'] = [name.replace(' ', '') for name in keys['name_key_canonical_en']]
+
+    return kotra_index
+
+def _build_records_index(records):
+    """_kotra_records 형식의 튜플 리스트로 후보 검색용 인덱스를 만드는 함수"""
+    return {
+        'records': records,
+        'kr': build_name_index([record[4] for record in records]),
+        'en': build_name_index([record[5] for record in records]),
+    }
+
+def find_address_hits(company_names, kotra_records):
+    """현지주소에 국문 기업명이 포함된 kotra 행 위치를 찾는 함수
+
+    모든 국문 기업명으로 Aho–Corasick 오토마톤을 한 번 만들고
+    각 kotra 현지주소를 한 번씩만 훑는다.
+    반환값: {국문 기업명: [kotra 행 위치, ...]} (위치는 오름차순)
+    """
+    patterns = sorted({str(name) for name in company_names if not pd.isna(name) and name != ''})
+    automaton = build_automaton(patterns)
+
+    hits = defaultdict(list)
+    for pos, record in enumerate(kotra_records):
+        address = record[3]
+        if pd.isna(address) or not address:
+            continue
+        for pattern_id in find_patterns(automaton, str(address)):
+            hits[patterns[pattern_id]].append(pos)
+
+    return dict(hits)
+
+def _candidate_positions(kotra_index, company_kr, company_en, address_hits):
+    """영업조직 기업 하나와 비교할 kotra 행 위치를 오름차순으로 반환하는 함수"""
+    positions = set()
+    if company_kr:
+        positions |= find_candidates(kotra_index['kr'], _normalized_or_none(company_kr))
+    if company_en:
+        positions |= find_candidates(kotra_index['en'], _normalized_or_none(company_en))
+    if not pd.isna(company_kr) and company_kr != '':
+        positions.update(address_hits.get(str(company_kr), []))
+    return sorted(positions)
+
+def _name_key_frame(df, kr_col, en_col):
+    """발음 키 매칭용 기업명 키 컬럼만 담은 데이터프레임 (원본 df에는 컬럼을 추가하지 않음)"""
+    if all(column in df.columns for column in CROSS_SCRIPT_KEY_COLUMNS):
+        return df[CROSS_SCRIPT_KEY_COLUMNS]
+    keys = add_name_keys(df[[kr_col, en_col]].copy(), kr_col, en_col)
+    return keys[CROSS_SCRIPT_KEY_COLUMNS]
+
+def _cross_script_match(kotra_index, keys, similarity_threshold):
+    """영업조직 국문명 ↔ kotra 영문명, 영업조직 영문명 ↔ kotra 국문명의 발음 키가 같은 kotra 행을
+    로마자 표기끼리의 유사도로 채점해 가장 높은 (행 위치, 유사도)를 반환하는 함수 (없으면 None)
+
+    발음 키(자음 골격)는 서로 다른 기업끼리도 겹치므로,
+    기업이 둘 이상 모인 버킷은 어느 행인지 가릴 수 없어 사용하지 않는다.
+    """
+    romanized_kr, phonetic_kr, canonical_en, phonetic_en = keys
+    lookups = [
+        (phonetic_kr, 'phonetic_en', romanized_kr, kotra_index['canonical_en']),
+        (phonetic_en, 'phonetic_kr', canonical_en.replace(' ', ''), kotra_index['romanized_kr']),
+    ]
+
+    best = None
+    for phonetic, bucket_name, name, kotra_names in lookups:
+        if not phonetic or not name:
+            continue
+        positions = kotra_index[bucket_name].get(phonetic, [])
+        if len(positions) != 1:
+            continue
+        pos = positions[0]
+        threshold = max(similarity_threshold, best[1]) if best else similarity_threshold
+        similarity = bounded_similarity(name, kotra_names[pos], threshold)
+        if similarity >= similarity_threshold and (best is None or similarity > best[1]):
+            best = (pos, similarity)
+    return best
+
+def match_companies(sales_division_df, kotra_df, similarity_threshold=0.8, use_index=True, kotra_index=None,
+                    address_hits=None, cross_script=False):
+    """기업명을 매칭하는 함수
+
+    use_index=True이면 토큰/n-gram 후보 인덱스와 주소 포함 검색(Aho–Corasick)으로
+    비교 대상을 좁힌 뒤 유사도를 계산하고,
+    False이면 모든 kotra 행과 비교하는 기존 전수 비교 방식으로 동작한다.
+    cross_script=True이면 같은 문자 체계끼리 임계값 이상인 후보가 없을 때만
+    국문명과 영문명의 발음 키가 같은 kotra 행을 로마자 표기 유사도로 채점해 'cross_script' 유형으로 매칭한다.
+    """
+
+    if kotra_index is None:
+        if use_index or cross_script:
+            kotra_index = build_kotra_index(kotra_df, cross_script=cross_script)
+        else:
+            kotra_index = {'records': _kotra_records(kotra_df)}
+    records = kotra_index['records']
+
+    if cross_script:
+        sales_keys = list(_name_key_frame(sales_division_df, '기업명(국문)', '기업명(영문)')
+                          .itertuples(index=False, name=None))
+
+    if use_index and address_hits is None:
+        address_hits = find_address_hits(sales_division_df['기업명(국문)'], records)
+
     # 매칭 결과를 저장할 리스트
     matches = []
-    
+
     # 영업조직 데이터에서 기업명 추출
-    for idx, row in sales_division_df.iterrows():
+    for row_pos, (idx, row) in enumerate(sales_division_df.iterrows()):
         company_kr = row['기업명(국문)']
         company_en = row['기업명(영문)']
         sales_division = row['영업조직']
-        
+
         if pd.isna(sales_division) or sales_division == '':
             continue
-            
-        best_match = None
-        best_similarity = 0
-        
-        # kotra 데이터와 비교
-        for kotra_idx, kotra_row in kotra_df.iterrows():
-            kotra_company_kr = kotra_row.get('company_name_kr', '')
-            kotra_company_en = kotra_row.get('company_name_en', '')
-            kotra_local_address = kotra_row.get('local_address', '')
-            
-            # 한국어 기업명 매칭
-            if company_kr and kotra_company_kr:
-                similarity_kr = calculate_similarity(company_kr, kotra_company_kr)
-                if similarity_kr > best_similarity and similarity_kr >= similarity_threshold:
-                    best_similarity = similarity_kr
-                    best_match = {
-                        'kotra_index': kotra_idx,
-                        'kotra_company_kr': kotra_company_kr,
-                        'kotra_company_en': kotra_company_en,
-                        'kotra_local_address': kotra_local_address,
-                        'sales_division_company_kr': company_kr,
-                        'sales_division_company_en': company_en,
-                        'sales_division': sales_division,
-                        'similarity': similarity_kr,
-                        'match_type': 'korean_name'
-                    }
-            
-            # 영어 기업명 매칭
-            if company_en and kotra_company_en:
-                similarity_en = calculate_similarity(company_en, kotra_company_en)
-                if similarity_en > best_similarity and similarity_en >= similarity_threshold:
-                    best_similarity = similarity_en
-                    best_match = {
-                        'kotra_index': kotra_idx,
-                        'kotra_company_kr': kotra_company_kr,
-                        'kotra_company_en': kotra_company_en,
-                        'kotra_local_address': kotra_local_address,
-                        'sales_division_company_kr': company_kr,
-                        'sales_division_company_en': company_en,
-                        'sales_division': sales_division,
-                        'similarity': similarity_en,
-                        'match_type': 'english_name'
-                    }
-            
-            # 주소에서 기업명 추출하여 매칭 (간단한 방법)
-            if kotra_local_address and company_kr:
-                # 주소에서 기업명이 포함되어 있는지 확인
-                if safe_string_contains(kotra_local_address, company_kr):
-                    similarity_addr = 0.9  # 주소 매칭은 높은 점수
-                    if similarity_addr > best_similarity:
-                        best_similarity = similarity_addr
-                        best_match = {
-                            'kotra_index': kotra_idx,
-                            'kotra_company_kr': kotra_company_kr,
-                            'kotra_company_en': kotra_company_en,
-                            'kotra_local_address': kotra_local_address,
-                            'sales_division_company_kr': company_kr,
-                            'sales_division_company_en': company_en,
-                            'sales_division': sales_division,
-                            'similarity': similarity_addr,
-                            'match_type': 'address'
-                        }
-        
+
+        if use_index:
+            positions = _candidate_positions(kotra_index, company_kr, company_en, address_hits)
+            kotra_records = [records[pos] for pos in positions]
+        else:
+            kotra_records = records
+
+        best_match = _find_best_match(company_kr, company_en, sales_division, kotra_records, similarity_threshold)
+
+        # 같은 문자 체계의 이름/주소 매칭이 없을 때만 발음 키 매칭 시도
+        if cross_script and best_match is None:
+            cross_match = _cross_script_match(kotra_index, sales_keys[row_pos], similarity_threshold)
+            if cross_match is not None:
+                pos, similarity = cross_match
+                best_match = _build_match(records[pos], company_kr, company_en, sales_division,
+                                          similarity, 'cross_script')
+
         if best_match:
             matches.append(best_match)
-    
+
     return matches
 
+# 병렬 매칭 시 각 워커 프로세스가 공유하는 읽기 전용 kotra 인덱스
+_worker_kotra_index = None
+
+def _init_match_worker(kotra_index):
+    """워커 프로세스 시작 시 kotra 인덱스를 한 번만 받아 두는 함수"""
+    global _worker_kotra_index
+    _worker_kotra_index = kotra_index
+
+def _match_shard(args):
+    """영업조직 데이터 조각 하나를 워커의 kotra 인덱스로 매칭하는 함수"""
+    shard_df, similarity_threshold, address_hits, cross_script = args
+    return match_companies(shard_df, None, similarity_threshold, kotra_index=_worker_kotra_index,
+                           address_hits=address_hits, cross_script=cross_script)
+
+def match_companies_parallel(sales_division_df, kotra_df, similarity_threshold=0.8, workers=2, kotra_index=None,
+                             cross_script=False):
+    """영업조직 데이터를 여러 프로세스로 나누어 매칭하는 함수
+
+    kotra 인덱스는 워커 초기화 시 한 번만 전달되고(작업마다 피클링하지 않음),
+    각 조각은 연속된 행 범위이므로 조각 순서대로 이어 붙이면 직렬 실행과 같은 결과가 된다.
+    주소 포함 검색은 전체 기업명에 대해 부모 프로세스에서 한 번만 수행한다.
+    """
+    if kotra_index is None:
+        kotra_index = build_kotra_index(kotra_df, cross_script=cross_script)
+
+    if workers <= 1 or len(sales_division_df) == 0:
+        return match_companies(sales_division_df, kotra_df, similarity_threshold, kotra_index=kotra_index,
+                               cross_script=cross_script)
+
+    # 워커 간 부하를 고르게 하기 위해 워커 수보다 잘게 나눈다
+    columns = ['기업명(국문)', '기업명(영문)', '영업조직']
+    if cross_script:
+        # 키 컬럼은 조각에만 붙이고 호출 측 데이터프레임에는 추가하지 않음
+        keys = _name_key_frame(sales_division_df, '기업명(국문)', '기업명(영문)')
+        sales_division_df = pd.concat([sales_division_df[columns], keys], axis=1)
+        columns += CROSS_SCRIPT_KEY_COLUMNS
+    shard_count = min(len(sales_division_df), workers * 4)
+    shard_size = -(-len(sales_division_df) // shard_count)
+    address_hits = find_address_hits(sales_division_df['기업명(국문)'], kotra_index['records'])
+
+    shards = []
+    for start in range(0, len(sales_division_df), shard_size):
+        shard_df = sales_division_df[columns].iloc[start:start + shard_size]
+        shard_hits = {}
+        for name in shard_df['기업명(국문)']:
+            if not pd.isna(name) and str(name) in address_hits:
+                shard_hits[str(name)] = address_hits[str(name)]
+        shards.append((shard_df, similarity_threshold, shard_hits, cross_script))
+
+    matches = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_match_worker, initargs=(kotra_index,)) as executor:
+        for shard_matches in executor.map(_match_shard, shards):
+            matches.extend(shard_matches)
+
+    return matches
+
+def _fingerprint(*values):
+    """매칭에 쓰이는 필드 값들로 행 지문(SHA-1)을 만드는 함수"""
+    payload = json.dumps([None if value is None else str(value) for value in values], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def _kotra_fingerprint(record):
+    """kotra 행의 정규화 국문/영문명과 현지주소로 지문을 만드는 함수"""
+    address = record[3]
+    if pd.isna(address) or address == '':
+        address = None
+    return _fingerprint(record[4], record[5], address)
+
+def _sales_fingerprint(company_kr, company_en):
+    """영업조직 행의 국문명(주소 포함 검색에 원문 사용)과 정규화 영문명으로 지문을 만드는 함수"""
+    if pd.isna(company_kr) or company_kr == '':
+        company_kr = None
+    return _fingerprint(company_kr, _normalized_or_none(company_en))
+
+def match_companies_incremental(sales_division_df, kotra_df, similarity_threshold=0.8, cache_path=MATCH_CACHE_FILE):
+    """지난 실행의 매칭 캐시를 재사용해 바뀐 행만 다시 계산하는 함수
+
+    - 영업조직 행의 지문이 캐시에 있고, 캐시된 최적 kotra 행이 그대로 남아 있으면
+      새로 추가/수정된 kotra 행과만 비교해 캐시된 결과와 합친다.
+    - 그 외(새/수정된 영업조직 행, 최적 kotra 행이 사라진 경우)는 전체 kotra와 다시 비교한다.
+    결과는 match_companies와 같은 형식이며, 실행 후 캐시를 이번 결과로 교체한다.
+    """
+    records = _kotra_records(kotra_df)
+    kotra_fingerprints = [_kotra_fingerprint(record) for record in records]
+    fingerprint_positions = {}
+    label_positions = {}
+    for pos, (record, fp) in enumerate(zip(records, kotra_fingerprints)):
+        fingerprint_positions.setdefault(fp, pos)
+        label_positions.setdefault(record[0], pos)
+
+    previous_fingerprints, cached_matches = load_match_cache(cache_path, similarity_threshold)
+
+    rows = []
+    for company_kr, company_en, sales_division in zip(sales_division_df['기업명(국문)'],
+                                                        sales_division_df['기업명(영문)'],
+                                                        sales_division_df['영업조직']):
+        if pd.isna(sales_division) or sales_division == '':
+            continue
+        sales_fp = _sales_fingerprint(company_kr, company_en)
+        cached = cached_matches.get(sales_fp)
+        reusable = cached is not None and (cached[0] is None or cached[0] in fingerprint_positions)
+        rows.append((company_kr, company_en, sales_division, sales_fp, cached if reusable else None))
+
+    # 새로 추가되었거나 수정된 kotra 행만 모은 인덱스
+    delta_positions = [pos for pos, fp in enumerate(kotra_fingerprints) if fp not in previous_fingerprints]
+    delta_records = [records[pos] for pos in delta_positions]
+    reused_names = [row[0] for row in rows if row[4] is not None]
+    delta_index = _build_records_index(delta_records)
+    delta_hits = find_address_hits(reused_names, delta_records)
+
+    # 전체 재계산이 필요한 행이 있을 때만 전체 인덱스를 만든다
+    rescored_names = [row[0] for row in rows if row[4] is None]
+    if rescored_names:
+        full_index = _build_records_index(records)
+        full_hits = find_address_hits(rescored_names, records)
+
+    matches = []
+    new_cache = {}
+    for company_kr, company_en, sales_division, sales_fp, cached in rows:
+        if cached is None:
+            candidates = [records[pos] for pos in _candidate_positions(full_index, company_kr, company_en, full_hits)]
+            best_match = _find_best_match(company_kr, company_en, sales_division, candidates, similarity_threshold)
+        else:
+            candidates = [delta_records[pos] for pos in _candidate_positions(delta_index, company_kr, company_en, delta_hits)]
+            best_match = _find_best_match(company_kr, company_en, sales_division, candidates, similarity_threshold)
+
+            kotra_fp, similarity, match_type = cached
+            if kotra_fp is not None:
+                cached_pos = fingerprint_positions[kotra_fp]
+                if (best_match is None
+                        or similarity > best_match['similarity']
+                        or (similarity == best_match['similarity']
+                            and cached_pos < label_positions[best_match['kotra_index']])):
+                    best_match = _build_match(records[cached_pos], company_kr, company_en, sales_division,
+                                              similarity, match_type)
+
+        if best_match:
+            matches.append(best_match)
+            winner_fp = kotra_fingerprints[label_positions[best_match['kotra_index']]]
+            new_cache[sales_fp] = (winner_fp, best_match['similarity'], best_match['match_type'])
+        else:
+            new_cache[sales_fp] = (None, 0.0, None)
+
+    save_match_cache(cache_path, similarity_threshold, set(kotra_fingerprints), new_cache)
+
+    print(f"캐시 재사용: {len(reused_names)}개 행 (새/수정 KOTRA {len(delta_records)}개 행과만 비교), "
+          f"전체 재계산: {len(rescored_names)}개 행")
+
+    return matches
+
+def _score_record(record, norm_kr, norm_en, company_kr, company_en, threshold):
+    """kotra 행 하나에 대한 (최고 유사도, 매칭 유형)을 반환하는 함수 (threshold 미만이면 (0, None))
+
+    동점이면 국문 > 영문 > 주소 순으로 유형을 고른다 (_find_best_match와 같은 순서).
+    """
+    _, kotra_company_kr, kotra_company_en, kotra_local_address, kotra_norm_kr, kotra_norm_en = record[:6]
+    best = (0, None)
+
+    if company_kr and kotra_company_kr and norm_kr is not None and kotra_norm_kr is not None:
+        similarity = bounded_similarity(norm_kr, kotra_norm_kr, threshold)
+        if similarity >= threshold and similarity > best[0]:
+            best = (similarity, 'korean_name')
+
+    if company_en and kotra_company_en and norm_en is not None and kotra_norm_en is not None:
+        similarity = bounded_similarity(norm_en, kotra_norm_en, threshold)
+        if similarity >= threshold and similarity > best[0]:
+            best = (similarity, 'english_name')
+
+    if kotra_local_address and company_kr and safe_string_contains(kotra_local_address, company_kr):
+        if 0.9 > best[0]:
+            best = (0.9, 'address')
+
+    return best
+
+def retrieve_top_k(sales_division_df, kotra_df, k=5, min_similarity=0.5, kotra_index=None, address_hits=None):
+    """영업조직 행마다 유사도 상위 k개의 kotra 후보를 반환하는 함수 (검토용)
+
+    후보 인덱스로 좁힌 행만 점수를 매기고, 크기 k의 최소 힙으로 상위 후보만 유지한다.
+    힙이 가득 차면 힙의 최저 점수를 임계값으로 써서 낮은 후보는 조기 제외한다.
+    동점이면 kotra 원래 순서가 앞선 행이 먼저 온다.
+    반환값: 후보 딕셔너리 리스트 (query_index, rank 및 match_companies 결과와 같은 필드)
+    """
+    if kotra_index is None:
+        kotra_index = build_kotra_index(kotra_df)
+    records = kotra_index['records']
+
+    if address_hits is None:
+        address_hits = find_address_hits(sales_division_df['기업명(국문)'], records)
+
+    candidates = []
+    for idx, row in sales_division_df.iterrows():
+        company_kr = row['기업명(국문)']
+        company_en = row['기업명(영문)']
+        sales_division = row['영업조직']
+
+        if pd.isna(sales_division) or sales_division == '':
+            continue
+
+        norm_kr = _normalized_or_none(company_kr)
+        norm_en = _normalized_or_none(company_en)
+
+        # (유사도, -위치, 매칭 유형) 최소 힙: 가장 약한 후보가 맨 위
+        heap = []
+        for pos in _candidate_positions(kotra_index, company_kr, company_en, address_hits):
+            threshold = heap[0][0] if len(heap) == k else min_similarity
+            similarity, match_type = _score_record(records[pos], norm_kr, norm_en, company_kr, company_en,
+                                                   max(threshold, min_similarity))
+            if match_type is None:
+                continue
+            entry = (similarity, -pos, match_type)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+        for rank, (similarity, neg_pos, match_type) in enumerate(sorted(heap, reverse=True), start=1):
+            candidate = {'query_index': idx, 'rank': rank}
+            candidate.update(_build_match(records[-neg_pos], company_kr, company_en, sales_division,
+                                          similarity, match_type))
+            candidates.append(candidate)
+
+    return candidates
+
+def write_review_file(candidates, path=REVIEW_FILE):
+    """상위 k개 후보를 컬럼형 검토 파일로 한 번에 저장하는 함수
+
+    .parquet 경로는 Parquet으로 저장하며, pyarrow가 없으면 같은 이름의 CSV로 저장한다.
+    반환값: 실제로 저장한 경로
+    """
+    review_df = pd.DataFrame(candidates)
+    if path.endswith('.parquet'):
+        try:
+            review_df.to_parquet(path, index=False)
+            return path
+        except ImportError:
+            path = path[:-len('.parquet')] + '.csv'
+            print(f"pyarrow가 설치되어 있지 않아 CSV로 저장합니다: {path}")
+
+    review_df.to_csv(path, index=False, encoding='utf-8-sig')
+    return path
+
+def read_review_file(path=REVIEW_FILE):
+    """검토 파일을 읽는 함수"""
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+def matches_from_review(review_df, similarity_threshold=0.8):
+    """검토 파일을 다시 계산 없이 임계값만 바꿔 match_companies 형식의 결과로 바꾸는 함수
+
+    각 영업조직 행에서 순위가 가장 높은 후보 중 유사도가 임계값 이상이거나
+    주소 매칭인 후보를 채택한다.
+    """
+    if review_df.empty:
+        return []
+
+    accepted = review_df[(review_df['similarity'] >= similarity_threshold) | (review_df['match_type'] == 'address')]
+    best = accepted.sort_values(['query_index', 'rank']).drop_duplicates('query_index')
+    return best.drop(columns=['query_index', 'rank']).to_dict('records')
+
 def update_kotra_with_sales_division(kotra_df, matches):
     """kotra 데이터프레임에 영업조직 컬럼을 추가하는 함수"""
     
@@ -151,6 +580,17 @@ def update_kotra_with_sales_division(kotra_df, matches):
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description='KOTRA 기업에 영업조직을 매칭합니다.')
+    # 매칭 방식은 하나만 선택 (함께 주면 하나가 조용히 무시되지 않도록 오류 처리)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--workers', type=int, default=1, help='매칭에 사용할 프로세스 수 (기본값: 1)')
+    mode.add_argument('--incremental', action='store_true',
+                      help=f'{MATCH_CACHE_FILE} 캐시를 사용해 바뀐 행만 다시 매칭')
+    mode.add_argument('--top-k', type=int, default=0,
+                      help=f'영업조직 행마다 상위 k개 후보를 {REVIEW_FILE}에 저장하고 그 결과로 매칭')
+    parser.add_argument('--cross-script', action='store_true',
+                        help='국문명 ↔ 영문명 발음 키 매칭 사용 (증분 모드에서는 사용하지 않음)')
+    args = parser.parse_args()
     
     # CSV 파일 읽기
     print("CSV 파일을 읽는 중...")
@@ -165,7 +605,21 @@ def main():
     
     # 매칭 실행
     print("기업명 매칭을 시작합니다...")
-    matches = match_companies(sales_division_df, kotra_df, similarity_threshold=0.7)
+    if args.top_k > 0:
+        candidates = retrieve_top_k(sales_division_df, kotra_df, k=args.top_k)
+        review_file = write_review_file(candidates)
+        print(f"상위 {args.top_k}개 후보 {len(candidates)}건을 {review_file}에 저장했습니다.")
+        matches = matches_from_review(pd.DataFrame(candidates), similarity_threshold=0.7)
+    elif args.incremental:
+        print(f"증분 매칭을 사용합니다 (캐시: {MATCH_CACHE_FILE})")
+        matches = match_companies_incremental(sales_division_df, kotra_df, similarity_threshold=0.7)
+    elif args.workers > 1:
+        print(f"{args.workers}개 프로세스로 병렬 매칭합니다.")
+        matches = match_companies_parallel(sales_division_df, kotra_df, similarity_threshold=0.7, workers=args.workers,
+                                           cross_script=args.cross_script)
+    else:
+        matches = match_companies(sales_division_df, kotra_df, similarity_threshold=0.7,
+                                  cross_script=args.cross_script)
     
     print(f"매칭된 기업 수: {len(matches)}개")
     
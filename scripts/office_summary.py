@@ -0,0 +1,31 @@
+# KOTRA 무역관별 요약 조회
+# kotra_office_summary 뷰(supabase/migrations/20250904_kotra_office_summary.sql)를 한 번 읽어
+# 실행 중에는 캐시해 두고, 여러 무역관(예: 첸나이 + 첸나이무역관)을 합친 수치를 계산한다.
+
+_summary_cache = {}
+
+def get_office_summary(supabase, refresh=False):
+    """{무역관: {'total': 전체 기업 수, 'matched': 영업조직 매칭 수, 'ratio': 매칭 비율(%)}}을 반환하는 함수
+
+    같은 클라이언트로 다시 호출하면 캐시된 결과를 반환한다. refresh=True이면 다시 조회한다.
+    """
+    cache_key = id(supabase)
+    if refresh or cache_key not in _summary_cache:
+        result = supabase.table('kotra_office_summary').select('office, total_count, matched_count').execute()
+        _summary_cache[cache_key] = {
+            row['office']: {
+                'total': row['total_count'],
+                'matched': row['matched_count'],
+                'ratio': row['matched_count'] / row['total_count'] * 100 if row['total_count'] else 0
+            }
+            for row in result.data or []
+        }
+    return _summary_cache[cache_key]
+
+def office_totals(supabase, offices):
+    """여러 무역관을 합친 (전체 기업 수, 영업조직 매칭 수, 매칭 비율(%))을 반환하는 함수"""
+    summary = get_office_summary(supabase)
+    total = sum(summary.get(office, {}).get('total', 0) for office in offices)
+    matched = sum(summary.get(office, {}).get('matched', 0) for office in offices)
+    ratio = matched / total * 100 if total > 0 else 0
+    return total, matched, ratio
@@ -1,6 +1,9 @@
 import pandas as pd
 import json
 
+# 업데이트 SQL 한 문장(VALUES 목록)에 넣는 레코드 수
+UPDATE_CHUNK_SIZE = 1000
+
 def prepare_supabase_upload():
     """Supabase 업로드를 위한 데이터를 준비하는 함수"""
     
@@ -86,39 +89,75 @@ WHERE company_name_kr = '현대자동차';
     
     return upload_data
 
-def generate_update_sql():
-    """업데이트용 SQL 스크립트를 생성하는 함수"""
+def _sql_literal(value):
+    """SQL 리터럴로 변환 (None은 NULL, 문자열은 작은따옴표 이스케이프)"""
+    if value is None or value != value:
+        return 'NULL'
+    if isinstance(value, (int, float)):
+        return repr(float(value))
+    return "'" + str(value).replace("'", "''") + "'"
+
+def generate_update_sql(chunk_size=UPDATE_CHUNK_SIZE, create_index=True):
+    """업데이트용 SQL 스크립트를 생성하는 함수
+    
+    레코드마다 UPDATE 문을 만드는 대신, chunk_size개씩 VALUES 목록으로 묶어
+    UPDATE ... FROM (VALUES ...) 한 문장으로 조인해 갱신한다.
+    create_index=True이면 company_name_kr 인덱스 생성문을 함께 넣는다.
+    """
     
     # 업로드 데이터 읽기
     with open('data/supabase_upload_data.json', 'r', encoding='utf-8') as f:
         upload_data = json.load(f)
     
+    # 같은 기업명이 여러 번 나오면 마지막 값 사용 (기존 문장별 UPDATE의 결과와 동일)
+    records = list({record['company_name_kr']: record for record in upload_data}.values())
+    
     # SQL 스크립트 생성
     sql_statements = []
     
-    for record in upload_data:
-        company_name_kr = record['company_name_kr'].replace("'", "''")  # SQL 인젝션 방지
-        sales_division = record['sales_division'].replace("'", "''")
-        match_type = record['sales_division_match_type']
-        similarity = record['sales_division_similarity']
+    if create_index:
+        sql_statements.append("-- 기업명 조인용 인덱스 (이미 있으면 건너뜀)")
+        sql_statements.append("CREATE INDEX IF NOT EXISTS idx_kotra_company_name_kr ON kotra (company_name_kr);")
+        sql_statements.append("")
+    
+    sql_statements.append("BEGIN;")
+    
+    chunk_count = (len(records) + chunk_size - 1) // chunk_size
+    for chunk_no, i in enumerate(range(0, len(records), chunk_size), 1):
+        chunk = records[i:i + chunk_size]
         
-        sql = f"""UPDATE kotra 
+        values = ",\n".join(
+            f"    ({_sql_literal(record['company_name_kr'])}, {_sql_literal(record['sales_division'])}, "
+            f"{_sql_literal(record['sales_division_match_type'])}, {_sql_literal(record['sales_division_similarity'])})"
+            for record in chunk
+        )
+        
+        sql = f"""
+-- {chunk_no}/{chunk_count} ({len(chunk)}개)
+UPDATE kotra AS k
 SET 
-    sales_division = '{sales_division}',
-    sales_division_match_type = '{match_type}',
-    sales_division_similarity = {similarity}
-WHERE company_name_kr = '{company_name_kr}';"""
+    sales_division = v.sales_division,
+    sales_division_match_type = v.match_type,
+    sales_division_similarity = v.similarity::FLOAT
+FROM (VALUES
+{values}
+) AS v(company_name_kr, sales_division, match_type, similarity)
+WHERE k.company_name_kr = v.company_name_kr;"""
         
         sql_statements.append(sql)
     
+    sql_statements.append("")
+    sql_statements.append("COMMIT;")
+    
     # SQL 파일로 저장
     with open('data/update_kotra_sales_division.sql', 'w', encoding='utf-8') as f:
         f.write("-- KOTRA 테이블 영업조직 정보 업데이트\n")
         f.write("-- 생성일: " + pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S") + "\n\n")
         f.write("\n".join(sql_statements))
+        f.write("\n")
     
     print(f"업데이트 SQL 스크립트가 생성되었습니다: data/update_kotra_sales_division.sql")
-    print(f"총 {len(sql_statements)}개의 UPDATE 문이 포함되어 있습니다.")
+    print(f"총 {len(records)}개 레코드를 {chunk_count}개의 UPDATE ... FROM (VALUES) 문으로 묶었습니다.")
 
 if __name__ == "__main__":
     # 업로드 데이터 준비
@@ -7,6 +7,8 @@ import os
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from office_summary import office_totals
+
 def restore_original_data():
     """기존 하드코딩된 데이터를 복원하는 함수"""
     
@@ -59,12 +61,10 @@ def restore_original_data():
     
     # 현재 Supabase 데이터 확인
     try:
-        current_data = supabase.table('kotra').select('*').in_('office', ['첸나이', '첸나이무역관']).execute()
+        # 무역관별 요약에서 첸나이(첸나이 + 첸나이무역관) 수치 계산
+        current_total, current_matched, _ = office_totals(supabase, ['첸나이', '첸나이무역관'])
         
-        if current_data.data:
-            current_total = len(current_data.data)
-            current_matched = len([c for c in current_data.data if c.get('sales_division')])
-            
+        if current_total:
             print(f"📊 현재 Supabase 상태:")
             print(f"  - 총 기업: {current_total}개")
             print(f"  - 영업조직 매칭: {current_matched}개")
@@ -0,0 +1,87 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# 엑셀 시트 구조 탐지
+# 헤더 행, 데이터 시작 행, 년도 컬럼 등을 iterrows()로 한 행씩 문자열 변환하며 찾는 대신,
+# 시트 전체에 대한 불리언 마스크(년도처럼 보이는 셀, 키워드 포함 여부, 비어 있지 않은 셀 수)를 한 번에 만들고
+# numpy argmax로 조건을 만족하는 첫 행을 고른다. Euro Pricing 업로더와 GTM 분석 스크립트가 함께 쓴다.
+#
+# 반환하는 행 번호는 모두 위치(iloc 기준)이며, 찾지 못하면 None이다.
+
+YEAR_MIN = 2015
+YEAR_MAX = 2035
+
+def first_true(mask):
+    """불리언 마스크에서 처음 True인 위치 (없으면 None)"""
+    values = np.asarray(mask, dtype=bool)
+    if not values.any():
+        return None
+    return int(np.argmax(values))
+
+def year_mask(frame, min_year=YEAR_MIN, max_year=YEAR_MAX):
+    """셀마다 년도(min_year~max_year의 정수, 2017 / 2017.0 / '2017')처럼 보이는지 나타내는 마스크"""
+    if isinstance(frame, pd.Series):
+        values = pd.to_numeric(frame, errors='coerce')
+    else:
+        values = frame.apply(pd.to_numeric, errors='coerce')
+    values = values.astype('float64')
+    return (values % 1 == 0) & (values >= min_year) & (values <= max_year)
+
+def find_year_header_row(df, min_years=5, min_year=YEAR_MIN, max_year=YEAR_MAX):
+    """년도처럼 보이는 셀이 min_years개 이상인 첫 행 (년도가 나열된 헤더 행)"""
+    return first_true(year_mask(df, min_year, max_year).sum(axis=1) >= min_years)
+
+def find_year_columns(labels, min_year=YEAR_MIN, max_year=YEAR_MAX):
+    """컬럼명 목록에서 년도 컬럼만 골라 원래 순서대로 반환하는 함수"""
+    labels = list(labels)
+    mask = year_mask(pd.Series(labels, dtype=object), min_year, max_year)
+    return [label for label, is_year in zip(labels, mask) if is_year]
+
+def find_label_row(df, labels):
+    """labels 중 하나와 정확히 같은 셀이 있는 첫 행 (예: 'Country1'이 있는 헤더 행)"""
+    return first_true(df.isin(list(labels)).any(axis=1))
+
+def _stripped_text(frame):
+    """값을 문자열로 바꾸고 앞뒤 공백을 제거 (빈 셀은 <NA>)"""
+    text = frame.astype(object).where(frame.notna()).astype('string')
+    if isinstance(text, pd.Series):
+        return text.str.strip()
+    return text.apply(lambda column: column.str.strip())
+
+def filled_mask(frame):
+    """셀마다 값이 있는지(NaN도 빈/공백 문자열도 아님) 나타내는 마스크"""
+    return (frame.notna() & (_stripped_text(frame) != '')).fillna(False).astype(bool)
+
+def find_filled_row(df):
+    """값이 있는 셀이 하나라도 있는 첫 행"""
+    return first_true(filled_mask(df).any(axis=1))
+
+def text_mask(series, keywords=None, requires=None, pattern=None, exclude=None):
+    """컬럼 값(앞뒤 공백 제거)이 조건을 만족하는지 나타내는 마스크
+
+    keywords: 하나라도 포함, requires: 모두 포함, pattern: 정규식 전체 일치, exclude: 값이 같으면 제외
+    빈 셀은 항상 False
+    """
+    text = _stripped_text(series)
+    mask = filled_mask(series)
+
+    if keywords:
+        mask &= text.str.contains('|'.join(re.escape(keyword) for keyword in keywords), regex=True)
+    for required in requires or []:
+        mask &= text.str.contains(required, regex=False)
+    if pattern is not None:
+        mask &= text.str.fullmatch(pattern)
+    if exclude:
+        mask &= ~text.isin(list(exclude))
+    return mask.fillna(False).astype(bool)
+
+def find_text_row(series, **conditions):
+    """text_mask 조건을 만족하는 첫 행"""
+    return first_true(text_mask(series, **conditions))
+
+def find_dense_row(df, min_values, max_rows=None):
+    """비어 있지 않은 셀이 min_values개 이상인 첫 행 (max_rows가 있으면 그 안에서만 찾음)"""
+    frame = df.iloc[:max_rows] if max_rows else df
+    return first_true(frame.notna().sum(axis=1) >= min_values)
@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# Supabase 테이블 스트리밍 조회
+# select('*').execute() 한 번으로는 PostgREST max-rows 제한에 걸려 결과가 잘리므로,
+# 기본키 기준 keyset 페이지네이션(OFFSET 없이 key > 마지막 키)으로 끝까지 읽는다.
+# 현재 페이지를 처리하는 동안 다음 페이지를 미리 요청해 둔다.
+
+DEFAULT_PAGE_SIZE = 1000
+
+def _select_columns(columns, key):
+    """조회할 컬럼 문자열을 만드는 함수 (keyset 진행을 위해 기본키는 항상 포함)"""
+    if columns == '*':
+        return columns, False
+
+    names = [name.strip() for name in columns.split(',') if name.strip()]
+    if key in names:
+        return ','.join(names), False
+    return ','.join(names + [key]), True
+
+def _fetch_page(supabase, table, select, filters, key, after, page_size):
+    """key > after 인 행을 key 순으로 page_size개 가져오는 함수"""
+    query = supabase.table(table).select(select)
+    for op, column, value in filters:
+        # op는 supabase-py 필터 메서드명 (eq, neq, gt, gte, lt, lte, like, ilike, is_, in_ 등)
+        query = getattr(query, op)(column, value)
+    if after is not None:
+        query = query.gt(key, after)
+    return query.order(key).limit(page_size).execute().data or []
+
+def iter_table_pages(supabase, table, columns='*', filters=None, key='id', page_size=DEFAULT_PAGE_SIZE,
+                     prefetch=True):
+    """테이블을 기본키 순서로 한 페이지(행 딕셔너리 리스트)씩 반환하는 제너레이터
+
+    columns: 'id, office, company_name_kr' 처럼 필요한 컬럼만 지정 (기본 '*')
+    filters: [('eq', 'office', '첸나이'), ('like', 'company_name_kr', '%첸나이%')] 형태의 필터 목록
+    서버의 max-rows가 page_size보다 작아도 누락되지 않도록 빈 페이지가 올 때까지 읽는다.
+    """
+    filters = list(filters or [])
+    select, drop_key = _select_columns(columns, key)
+
+    def fetch(after):
+        return _fetch_page(supabase, table, select, filters, key, after, page_size)
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        page = fetch(None)
+        while page:
+            last_key = page[-1][key]
+
+            # 현재 페이지를 넘기기 전에 다음 페이지 요청 시작
+            next_page = executor.submit(fetch, last_key) if executor else None
+
+            if drop_key:
+                for row in page:
+                    row.pop(key, None)
+            yield page
+
+            page = next_page.result() if next_page else fetch(last_key)
+    finally:
+        if executor:
+            executor.shutdown(wait=True)
+
+def iter_table_rows(supabase, table, columns='*', filters=None, key='id', page_size=DEFAULT_PAGE_SIZE,
+                    prefetch=True):
+    """테이블의 행을 하나씩 반환하는 제너레이터"""
+    for page in iter_table_pages(supabase, table, columns, filters, key, page_size, prefetch):
+        yield from page
+
+def iter_table_chunks(supabase, table, columns='*', filters=None, key='id', page_size=DEFAULT_PAGE_SIZE,
+                      prefetch=True):
+    """테이블을 페이지 단위 pandas DataFrame으로 반환하는 제너레이터"""
+    for page in iter_table_pages(supabase, table, columns, filters, key, page_size, prefetch):
+        yield pd.DataFrame(page)
+
+def fetch_table(supabase, table, columns='*', filters=None, key='id', page_size=DEFAULT_PAGE_SIZE):
+    """테이블 전체(필터 적용)를 행 딕셔너리 리스트로 반환하는 함수"""
+    return list(iter_table_rows(supabase, table, columns, filters, key, page_size))
@@ -4,6 +4,9 @@ from supabase import create_client, Client
 from dotenv import load_dotenv
 import logging
 
+from sheet_detect import find_year_header_row
+from workbook_loader import read_sheet
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -33,15 +36,11 @@ def test_single_sheet():
         sheet_name = 'Country Routes'
         logger.info(f"🔄 시트 '{sheet_name}' 처리 중...")
         
-        df = pd.read_excel(excel_file_path, sheet_name=sheet_name)
+        df = read_sheet(excel_file_path, sheet_name)
         logger.info(f"  - 원본 데이터 형태: {df.shape}")
         
         # 헤더 행 찾기 (숫자 연도가 있는 행)
-        header_row = None
-        for idx, row in df.iterrows():
-            if any(str(cell).isdigit() and len(str(cell)) == 4 for cell in row if pd.notna(cell)):
-                header_row = idx
-                break
+        header_row = find_year_header_row(df, min_years=1, min_year=1000, max_year=9999)
         
         if header_row is not None:
             # 헤더 행을 컬럼명으로 설정
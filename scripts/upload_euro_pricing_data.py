@@ -5,6 +5,10 @@ from supabase import create_client, Client
 from dotenv import load_dotenv
 import logging
 
+from euro_pricing_ingest import to_records
+from sheet_detect import find_filled_row, find_year_header_row
+from workbook_loader import get_sheet_names, read_sheet
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -40,8 +44,7 @@ def upload_euro_pricing_data():
     
     try:
         # Excel 파일의 모든 시트 읽기
-        excel_file = pd.ExcelFile(excel_file_path)
-        sheet_names = excel_file.sheet_names
+        sheet_names = get_sheet_names(excel_file_path)
         
         logger.info(f"📊 발견된 시트: {sheet_names}")
         
@@ -50,7 +53,7 @@ def upload_euro_pricing_data():
             
             try:
                 # 시트 데이터 읽기
-                df = pd.read_excel(excel_file_path, sheet_name=sheet_name)
+                df = read_sheet(excel_file_path, sheet_name)
                 
                 logger.info(f"  - 데이터 형태: {df.shape}")
                 logger.info(f"  - 컬럼: {list(df.columns)}")
@@ -88,11 +91,7 @@ def preprocess_dataframe(df, sheet_name):
     if 'Country Routes' in sheet_name:
         # Country Routes 시트는 실제 데이터가 있는 시트
         # 헤더 행 찾기 (숫자 연도가 있는 행)
-        header_row = None
-        for idx, row in df.iterrows():
-            if any(str(cell).isdigit() and len(str(cell)) == 4 for cell in row if pd.notna(cell)):
-                header_row = idx
-                break
+        header_row = find_year_header_row(df, min_years=1, min_year=1000, max_year=9999)
         
         if header_row is not None:
             # 헤더 행을 컬럼명으로 설정
@@ -106,11 +105,7 @@ def preprocess_dataframe(df, sheet_name):
     elif any(keyword in sheet_name for keyword in ['Trans-Atlantic', 'Trans-Pacific', 'US-Latin America', 'Intra-Asia', 'Europe-']):
         # 지역별 배포/가격/수익 시트
         # 헤더 행 찾기
-        header_row = None
-        for idx, row in df.iterrows():
-            if any(str(cell).isdigit() and len(str(cell)) == 4 for cell in row if pd.notna(cell)):
-                header_row = idx
-                break
+        header_row = find_year_header_row(df, min_years=1, min_year=1000, max_year=9999)
         
         if header_row is not None:
             # 헤더 행을 컬럼명으로 설정
@@ -124,11 +119,7 @@ def preprocess_dataframe(df, sheet_name):
     elif 'Wholesale Prices' in sheet_name:
         # 가격 데이터 시트
         # 헤더 행 찾기
-        header_row = None
-        for idx, row in df.iterrows():
-            if any(str(cell).isdigit() and len(str(cell)) == 4 for cell in row if pd.notna(cell)):
-                header_row = idx
-                break
+        header_row = find_year_header_row(df, min_years=1, min_year=1000, max_year=9999)
         
         if header_row is not None:
             df = df.iloc[header_row:].reset_index(drop=True)
@@ -153,12 +144,11 @@ def preprocess_dataframe(df, sheet_name):
     else:
         # 기타 시트들은 기본 처리
         # 첫 번째 유효한 행을 헤더로 사용
-        for idx, row in df.iterrows():
-            if any(pd.notna(cell) and str(cell).strip() != '' for cell in row):
-                df = df.iloc[idx:].reset_index(drop=True)
-                df.columns = df.iloc[0]
-                df = df.iloc[1:].reset_index(drop=True)
-                break
+        header_row = find_filled_row(df)
+        if header_row is not None:
+            df = df.iloc[header_row:].reset_index(drop=True)
+            df.columns = df.iloc[0]
+            df = df.iloc[1:].reset_index(drop=True)
     
     # 컬럼명 정리 (공백 제거, 소문자 변환, 특수문자 처리)
     if not df.empty:
@@ -201,27 +191,13 @@ def upload_to_supabase(supabase, df, table_name, sheet_name):
     """Supabase에 데이터 업로드"""
     
     try:
-        # 데이터를 딕셔너리 리스트로 변환
-        records = df.to_dict('records')
+        # 데이터를 딕셔너리 리스트로 변환 (JSON 호환을 위해 NaN/무한대는 한 번에 None으로)
+        cleaned_records = to_records(df)
         
-        if not records:
+        if not cleaned_records:
             logger.warning(f"  ⚠️ 시트 '{sheet_name}'에 업로드할 데이터가 없습니다.")
             return
         
-        # JSON 호환성을 위한 추가 처리
-        cleaned_records = []
-        for record in records:
-            cleaned_record = {}
-            for key, value in record.items():
-                # 무한대 값과 NaN 값 처리
-                if pd.isna(value) or value is None:
-                    cleaned_record[key] = None
-                elif isinstance(value, (int, float)) and (value == float('inf') or value == float('-inf')):
-                    cleaned_record[key] = None
-                else:
-                    cleaned_record[key] = value
-            cleaned_records.append(cleaned_record)
-        
         logger.info(f"  📤 {len(cleaned_records)}개 레코드를 '{table_name}' 테이블에 업로드 중...")
         
         # Supabase에 데이터 삽입
@@ -296,8 +272,7 @@ def analyze_excel_structure():
         return
     
     try:
-        excel_file = pd.ExcelFile(excel_file_path)
-        sheet_names = excel_file.sheet_names
+        sheet_names = get_sheet_names(excel_file_path)
         
         logger.info("=== Excel 파일 구조 분석 ===")
         logger.info(f"📊 총 시트 수: {len(sheet_names)}")
@@ -306,7 +281,7 @@ def analyze_excel_structure():
             logger.info(f"\n{i}. 시트: '{sheet_name}'")
             
             try:
-                df = pd.read_excel(excel_file_path, sheet_name=sheet_name)
+                df = read_sheet(excel_file_path, sheet_name)
                 logger.info(f"   - 행 수: {df.shape[0]}")
                 logger.info(f"   - 열 수: {df.shape[1]}")
                 logger.info(f"   - 컬럼: {list(df.columns)}")
@@ -1,15 +1,178 @@
+import hashlib
 import json
+import sys
+import uuid
 import requests
 import os
 import csv
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from batch_insert import insert_rows
+from dedup_engine import dedup_records, deduplicate
+from pg_copy import connect_for_backend, copy_insert_missing
+from supabase_reader import iter_table_rows
+
 # .env 파일 로드
 load_dotenv()
 
-def check_and_remove_duplicates():
-    """기존 DB에서 중복 데이터를 확인하고 제거하는 함수"""
+# 영업조직 일괄 업데이트 시 RPC 한 번에 보내는 레코드 수
+BULK_UPDATE_CHUNK_SIZE = 1000
+
+# 스테이징 업로드에 쓰는 service role 키 환경변수 (kotra_staging은 RLS로 anon/authenticated에 막혀 있음)
+SERVICE_ROLE_KEY_ENV = 'SUPABASE_SERVICE_ROLE_KEY'
+
+# KOTRA CSV 파일
+CSV_FILE_PATH = 'data/kotra_mumbai_chennai_linkde_salesdivision_v01.csv'
+
+# CSV 동기화 시 행 지문을 계산하고 수정 시 덮어쓰는 컬럼
+# sales_division* 컬럼은 매칭 스크립트/bulk_update_sales_division이 관리하므로 동기화 대상에서 제외
+# (신규 기업을 추가할 때만 CSV 값으로 채운다)
+SYNC_COLUMNS = [
+    'region', 'country', 'office', 'company_name_kr', 'company_name_en', 'company_name_cn',
+    'local_address', 'local_zipcode', 'entry_type', 'investment_type', 'parent_company',
+    'industry_major', 'industry_minor'
+]
+
+# 클라이언트 측 중복 제거 시 DELETE 한 번에 보내는 id 수
+DELETE_CHUNK_SIZE = 200
+
+def remove_duplicates_client_side(supabase, delete_chunk_size=DELETE_CHUNK_SIZE):
+    """kotra 테이블을 스트리밍으로 읽어 중복 제거 엔진으로 유지할 레코드를 고르고 나머지를 삭제하는 함수
+    
+    서버 측 함수(remove_kotra_duplicates)를 쓸 수 없을 때 사용한다. 유지 규칙은 서버 측 함수와 같다.
+    반환값: (중복이 있던 회사 수, 삭제된 레코드 수, 실패한 레코드 수)
+    """
+    candidate_ids = []
+    
+    def rows_with_name():
+        # id 순으로 읽으므로 순위가 같으면 id가 작은 레코드가 유지됨
+        for row in iter_table_rows(supabase, 'kotra'):
+            if row.get('company_name_kr'):
+                candidate_ids.append(row['id'])
+            yield row
+    
+    keep_ids = set()
+    duplicate_companies = 0
+    for record, count in dedup_records(rows_with_name(), key='company_name_kr'):
+        keep_ids.add(record['id'])
+        if count > 1:
+            duplicate_companies += 1
+    
+    remove_ids = [record_id for record_id in candidate_ids if record_id not in keep_ids]
+    
+    removed_count = 0
+    failed_count = 0
+    for i in range(0, len(remove_ids), delete_chunk_size):
+        chunk = remove_ids[i:i + delete_chunk_size]
+        try:
+            result = supabase.table('kotra').delete().in_('id', chunk).execute()
+            removed_count += len(result.data or [])
+            failed_count += len(chunk) - len(result.data or [])
+        except Exception as e:
+            failed_count += len(chunk)
+            print(f"  ❌ 삭제 오류: ID {chunk[0]}~{chunk[-1]} - {str(e)}")
+    
+    return duplicate_companies, removed_count, failed_count
+
+def read_kotra_csv(csv_file_path=CSV_FILE_PATH):
+    """KOTRA CSV 파일을 읽어 kotra 테이블 컬럼으로 매핑한 레코드 리스트를 반환하는 함수"""
+    
+    # CSV 데이터를 Supabase 형식으로 변환
+    kotra_records = []
+    
+    with open(csv_file_path, 'r', encoding='utf-8') as f:
+        csv_reader = csv.DictReader(f)
+        
+        # 컬럼명 정리 (BOM 제거)
+        fieldnames = [field.strip('\ufeff') for field in csv_reader.fieldnames]
+        print(f"컬럼명: {fieldnames}")
+        
+        for row in csv_reader:
+            # CSV 컬럼을 Supabase 테이블 컬럼에 매핑
+            kotra_record = {
+                'region': row.get('지역', ''),
+                'country': row.get('진출국가', ''),
+                'office': row.get('관할무역관', ''),
+                'company_name_kr': row.get('기업명(국문)', ''),
+                'company_name_en': row.get('기업명(영문)', ''),
+                'company_name_cn': row.get('기업명(중문)', ''),
+                'local_address': row.get('주소', ''),
+                'local_zipcode': row.get('우편번호', ''),
+                'entry_type': row.get('진출형태', ''),
+                'investment_type': row.get('투자형태', ''),
+                'parent_company': row.get('모기업명', ''),
+                'industry_major': row.get('업종 대분류', ''),
+                'industry_minor': row.get('업종 중분류', ''),
+                'sales_division': row.get('영업본부', ''),
+                'sales_division_match_type': 'csv_import',
+                'sales_division_similarity': 1.0
+            }
+            
+            kotra_records.append(kotra_record)
+    
+    return kotra_records
+
+def row_fingerprint(record):
+    """동기화 대상 컬럼 값으로 만든 행 지문 (MD5)"""
+    values = ['' if record.get(column) is None else str(record.get(column)) for column in SYNC_COLUMNS]
+    return hashlib.md5(json.dumps(values, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def _sync_row(record, **extra):
+    """수정/지문 기록용 행 (SYNC_COLUMNS만 담아 영업조직 컬럼을 덮어쓰지 않음)"""
+    return dict({column: record.get(column) for column in SYNC_COLUMNS}, **extra)
+
+def diff_kotra_rows(local_records, remote_rows, remote_contents=None):
+    """CSV 레코드와 DB의 (id, company_name_kr, row_hash)를 비교해 변경분을 구하는 함수
+    
+    company_name_kr을 논리 키로 사용한다. DB에 같은 기업명이 여러 건이면 id가 가장 작은 행과 비교한다.
+    row_hash가 아직 없는 행(동기화 전에 올라온 행)은 remote_contents({id: SYNC_COLUMNS 값})의
+    내용으로 비교해, 같으면 지문만 기록하고 다르면 수정 대상으로 삼는다.
+    삭제 대상은 이전 동기화로 row_hash가 기록된 행 중 CSV에 없는 행으로 한정한다
+    (다른 경로로 올라온 행은 지우지 않음).
+    반환값: (추가할 레코드, 수정할 행(id 포함), 지문만 기록할 행(id 포함), 삭제할 id 리스트)
+    """
+    remote_contents = remote_contents or {}
+    remote_by_name = {}
+    for row in remote_rows:
+        remote_by_name.setdefault(row['company_name_kr'], row)
+    
+    inserts = []
+    updates = []
+    backfills = []
+    local_names = set()
+    
+    for record in local_records:
+        company_name = record['company_name_kr']
+        local_names.add(company_name)
+        record = dict(record, row_hash=row_fingerprint(record))
+        
+        remote = remote_by_name.get(company_name)
+        if remote is None:
+            inserts.append(record)
+            continue
+        
+        if not remote.get('row_hash'):
+            content = remote_contents.get(remote['id'])
+            if content is not None and row_fingerprint(content) == record['row_hash']:
+                # 내용은 같고 지문만 없는 행: DB 값을 그대로 두고 지문만 기록
+                backfills.append(_sync_row(content, id=remote['id'], row_hash=record['row_hash']))
+                continue
+        elif remote['row_hash'] == record['row_hash']:
+            continue
+        
+        updates.append(_sync_row(record, id=remote['id'], row_hash=record['row_hash']))
+    
+    deletes = [row['id'] for row in remote_rows
+               if row.get('row_hash') and row['company_name_kr'] not in local_names]
+    
+    return inserts, updates, backfills, deletes
+
+def check_and_remove_duplicates(server_side=True):
+    """기존 DB에서 중복 데이터를 확인하고 제거하는 함수
+    
+    server_side=False이면 서버 측 함수 대신 클라이언트에서 중복 제거 엔진으로 처리한다.
+    """
     
     # Supabase 설정 (환경변수에서 가져오기)
     supabase_url = os.getenv('VITE_SUPABASE_URL')
@@ -27,99 +190,114 @@ def check_and_remove_duplicates():
     
     print("=== 중복 데이터 확인 및 제거 ===")
     
-    try:
-        # 모든 데이터 조회
-        result = supabase.table('kotra').select('*').execute()
-        all_records = result.data
-        
-        print(f"총 레코드 수: {len(all_records)}")
-        
-        # company_name_kr 기준으로 중복 확인
-        company_counts = {}
-        for record in all_records:
-            company_name = record.get('company_name_kr', '')
-            if company_name:
-                if company_name in company_counts:
-                    company_counts[company_name].append(record)
-                else:
-                    company_counts[company_name] = [record]
-        
-        # 중복이 있는 회사들 찾기
-        duplicates = {name: records for name, records in company_counts.items() if len(records) > 1}
-        
-        if not duplicates:
+    if not server_side:
+        duplicate_companies, removed_count, failed_count = remove_duplicates_client_side(supabase)
+        if not duplicate_companies:
             print("✅ 중복 데이터가 없습니다.")
             return
         
-        print(f"중복이 발견된 회사 수: {len(duplicates)}")
+        print(f"중복이 발견된 회사 수: {duplicate_companies}")
+        print(f"\n=== 중복 제거 완료 ===")
+        print(f"총 삭제된 레코드: {removed_count}개")
+        if failed_count:
+            print(f"삭제 실패 레코드: {failed_count}개")
+        return
+    
+    try:
+        # 서버 측 함수로 중복 확인과 삭제를 한 번에 처리
+        # (supabase/migrations/20250901_remove_kotra_duplicates.sql)
+        result = supabase.rpc('remove_kotra_duplicates').execute()
+        summary = result.data[0] if result.data else {}
         
-        # 중복 제거 로직
-        total_removed = 0
+        duplicate_companies = summary.get('duplicate_companies', 0)
+        removed_count = summary.get('removed_count', 0)
+        remaining_count = summary.get('remaining_count', 0)
         
-        for company_name, records in duplicates.items():
-            print(f"\n📋 {company_name} - {len(records)}개 레코드")
-            
-            # 중복 제거 전략: 가장 완전한 데이터를 유지
-            # 1. sales_division이 있는 레코드 우선
-            # 2. 더 많은 정보가 있는 레코드 우선
-            # 3. ID가 작은 레코드 우선 (더 오래된 데이터)
-            
-            # 유지할 레코드 선택
-            keep_record = None
-            remove_records = []
-            
-            for record in records:
-                if not keep_record:
-                    keep_record = record
-                    continue
-                
-                # sales_division이 있는 레코드 우선
-                current_has_sales = bool(keep_record.get('sales_division'))
-                new_has_sales = bool(record.get('sales_division'))
-                
-                if new_has_sales and not current_has_sales:
-                    remove_records.append(keep_record)
-                    keep_record = record
-                elif current_has_sales and not new_has_sales:
-                    remove_records.append(record)
-                else:
-                    # 둘 다 sales_division이 있거나 둘 다 없는 경우
-                    # 더 많은 정보가 있는 레코드 선택
-                    current_info_count = sum(1 for v in keep_record.values() if v is not None and v != '')
-                    new_info_count = sum(1 for v in record.values() if v is not None and v != '')
-                    
-                    if new_info_count > current_info_count:
-                        remove_records.append(keep_record)
-                        keep_record = record
-                    else:
-                        remove_records.append(record)
-            
-            print(f"  유지: ID {keep_record.get('id')} (sales_division: {keep_record.get('sales_division', '없음')})")
-            
-            # 중복 레코드 삭제
-            for record in remove_records:
-                try:
-                    delete_result = supabase.table('kotra').delete().eq('id', record['id']).execute()
-                    if delete_result.data:
-                        total_removed += 1
-                        print(f"  삭제: ID {record.get('id')}")
-                    else:
-                        print(f"  ❌ 삭제 실패: ID {record.get('id')}")
-                except Exception as e:
-                    print(f"  ❌ 삭제 오류: ID {record.get('id')} - {str(e)}")
+        if not duplicate_companies:
+            print("✅ 중복 데이터가 없습니다.")
+            print(f"총 레코드 수: {remaining_count}")
+            return
         
+        print(f"중복이 발견된 회사 수: {duplicate_companies}")
         print(f"\n=== 중복 제거 완료 ===")
-        print(f"총 삭제된 레코드: {total_removed}개")
-        
-        # 최종 데이터 수 확인
-        final_result = supabase.table('kotra').select('*').execute()
-        print(f"최종 레코드 수: {len(final_result.data)}")
+        print(f"총 삭제된 레코드: {removed_count}개")
+        print(f"최종 레코드 수: {remaining_count}")
         
     except Exception as e:
         print(f"❌ 중복 제거 중 오류 발생: {str(e)}")
+        print("supabase/migrations/20250901_remove_kotra_duplicates.sql 함수가 생성되어 있는지 확인하세요.")
 
-def upload_csv_to_supabase():
-    """CSV 파일의 내용을 Supabase kotra 테이블에 추가하는 함수"""
+def load_via_staging(supabase, records):
+    """후보 레코드를 kotra_staging에 올리고 서버에서 kotra에 없는 기업만 추가하는 함수
+    
+    supabase/migrations/20250903_kotra_staging_merge.sql 의 테이블과 함수를 사용한다.
+    supabase는 service role 키(SUPABASE_SERVICE_ROLE_KEY)로 만든 클라이언트여야 한다.
+    스테이징 INSERT가 일부라도 실패하면 부분 배치를 병합하지 않고 배치를 지운다.
+    병합이 실패해도 배치를 지운 뒤 예외를 다시 발생시킨다.
+    반환값: (병합 결과 {'staged_count', 'inserted_count', 'skipped_count'}, 스테이징 INSERT 오류 리스트)
+    """
+    batch_id = uuid.uuid4().hex
+    staged_rows = [dict(record, batch_id=batch_id) for record in records]
+    
+    try:
+        report = insert_rows(supabase, 'kotra_staging', staged_rows)
+        if report['errors']:
+            clear_staging_batch(supabase, batch_id)
+            return {'staged_count': report['inserted'], 'inserted_count': 0, 'skipped_count': 0}, report['errors']
+        
+        result = supabase.rpc('merge_kotra_staging', {'p_batch_id': batch_id}).execute()
+    except Exception:
+        clear_staging_batch(supabase, batch_id)
+        raise
+    summary = result.data[0] if result.data else {}
+    
+    return summary, report['errors']
+
+def clear_staging_batch(supabase, batch_id):
+    """병합하지 못한 배치의 스테이징 행을 지우는 함수 (정리 실패는 출력만 하고 무시)"""
+    try:
+        supabase.table('kotra_staging').delete().eq('batch_id', batch_id).execute()
+    except Exception as e:
+        print(f"⚠️ 스테이징 배치 {batch_id} 정리 실패: {str(e)}")
+
+def upload_via_staging(supabase_url, records):
+    """service role 키로 스테이징 병합 업로드를 시도하는 함수
+    
+    키가 없거나 스테이징 INSERT/병합이 실패(권한 거부, 마이그레이션 미적용 등)하면
+    kotra를 바꾸지 않고 False를 반환해 호출 측이 클라이언트 측 필터링으로 진행하게 한다.
+    """
+    service_key = os.getenv(SERVICE_ROLE_KEY_ENV)
+    if not service_key:
+        print(f"⚠️ {SERVICE_ROLE_KEY_ENV} 환경변수가 없어 스테이징 업로드를 사용할 수 없습니다.")
+        return False
+    
+    try:
+        summary, errors = load_via_staging(create_client(supabase_url, service_key), records)
+    except Exception as e:
+        print(f"⚠️ 스테이징 병합 중 오류 (배치 삭제, kotra 변경 없음): {str(e)}")
+        print("supabase/migrations/20250903_kotra_staging_merge.sql 이 적용되어 있는지 확인하세요.")
+        return False
+    
+    if errors:
+        for error in errors[:10]:
+            print(f"⚠️ {error['row'].get('company_name_kr', '')} 스테이징 오류: {error['error']}")
+        print(f"⚠️ 스테이징 오류 {len(errors)}개로 병합하지 않았습니다. (배치 삭제, kotra 변경 없음)")
+        return False
+    
+    print(f"\n=== CSV 업로드 완료 (스테이징) ===")
+    print(f"성공: {summary.get('inserted_count', 0)}개")
+    print(f"이미 있는 기업 (건너뜀): {summary.get('skipped_count', 0)}개")
+    print(f"총 처리: {len(records)}개")
+    return True
+
+def upload_csv_to_supabase(use_staging=False, backend='rest'):
+    """CSV 파일의 내용을 Supabase kotra 테이블에 추가하는 함수
+    
+    기본적으로 기존 기업명을 모두 내려받아 클라이언트에서 걸러낸다.
+    use_staging=True이면 service role 키로 스테이징 테이블을 거쳐 서버에서 기존 기업을 걸러내고,
+    스테이징을 쓸 수 없으면 클라이언트 측 필터링으로 진행한다.
+    backend='copy'이면 SUPABASE_DB_URL로 직접 연결해 임시 테이블에 COPY한 뒤 같은 트랜잭션에서 걸러 추가한다.
+    """
     
     # Supabase 설정 (환경변수에서 가져오기)
     supabase_url = os.getenv('VITE_SUPABASE_URL')
@@ -136,107 +314,51 @@ def upload_csv_to_supabase():
     supabase: Client = create_client(supabase_url, supabase_key)
     
     # CSV 파일 읽기
-    csv_file_path = 'data/kotra_mumbai_chennai_linkde_salesdivision_v01.csv'
-    
-    if not os.path.exists(csv_file_path):
-        print(f"CSV 파일을 찾을 수 없습니다: {csv_file_path}")
+    if not os.path.exists(CSV_FILE_PATH):
+        print(f"CSV 파일을 찾을 수 없습니다: {CSV_FILE_PATH}")
         return
     
-    print(f"CSV 파일을 읽는 중: {csv_file_path}")
-    
-    # CSV 데이터를 Supabase 형식으로 변환
-    kotra_records = []
-    
-    with open(csv_file_path, 'r', encoding='utf-8') as f:
-        csv_reader = csv.DictReader(f)
-        
-        # 컬럼명 정리 (BOM 제거)
-        fieldnames = [field.strip('\ufeff') for field in csv_reader.fieldnames]
-        print(f"컬럼명: {fieldnames}")
-        
-        for row in csv_reader:
-            # CSV 컬럼을 Supabase 테이블 컬럼에 매핑
-            kotra_record = {
-                'region': row.get('지역', ''),
-                'country': row.get('진출국가', ''),
-                'office': row.get('관할무역관', ''),
-                'company_name_kr': row.get('기업명(국문)', ''),
-                'company_name_en': row.get('기업명(영문)', ''),
-                'company_name_cn': row.get('기업명(중문)', ''),
-                'local_address': row.get('주소', ''),
-                'local_zipcode': row.get('우편번호', ''),
-                'entry_type': row.get('진출형태', ''),
-                'investment_type': row.get('투자형태', ''),
-                'parent_company': row.get('모기업명', ''),
-                'industry_major': row.get('업종 대분류', ''),
-                'industry_minor': row.get('업종 중분류', ''),
-                'sales_division': row.get('영업본부', ''),
-                'sales_division_match_type': 'csv_import',
-                'sales_division_similarity': 1.0
-            }
-            
-            kotra_records.append(kotra_record)
+    print(f"CSV 파일을 읽는 중: {CSV_FILE_PATH}")
+    kotra_records = read_kotra_csv(CSV_FILE_PATH)
     
     print(f"CSV에서 읽은 총 레코드 수: {len(kotra_records)}")
     
-    # CSV 내에서 중복 제거
+    # CSV 내에서 중복 제거 (sales_division이 있는 레코드 우선, 정보 완성도가 높은 레코드 우선)
     print("=== CSV 내 중복 제거 ===")
-    company_counts = {}
-    for record in kotra_records:
-        company_name = record.get('company_name_kr', '')
-        if company_name:
-            if company_name in company_counts:
-                company_counts[company_name].append(record)
-            else:
-                company_counts[company_name] = [record]
-    
-    # 중복이 있는 회사들 찾기
-    duplicates = {name: records for name, records in company_counts.items() if len(records) > 1}
+    deduplicated_records, duplicate_count = deduplicate(kotra_records, key='company_name_kr')
     
-    if duplicates:
-        print(f"CSV 내 중복이 발견된 회사 수: {len(duplicates)}")
-        
-        # 중복 제거: sales_division이 있는 레코드 우선, 정보 완성도가 높은 레코드 우선
-        deduplicated_records = []
-        
-        for company_name, records in company_counts.items():
-            if len(records) == 1:
-                # 중복이 없는 경우 그대로 추가
-                deduplicated_records.append(records[0])
-            else:
-                # 중복이 있는 경우 가장 좋은 레코드 선택
-                print(f"📋 {company_name} - {len(records)}개 레코드 중 1개 선택")
-                
-                # 가장 좋은 레코드 선택 (sales_division 우선, 정보 완성도 우선)
-                best_record = records[0]
-                for record in records[1:]:
-                    current_has_sales = bool(best_record.get('sales_division'))
-                    new_has_sales = bool(record.get('sales_division'))
-                    
-                    if new_has_sales and not current_has_sales:
-                        best_record = record
-                    elif current_has_sales == new_has_sales:
-                        # 둘 다 sales_division이 있거나 둘 다 없는 경우
-                        # 정보 완성도가 높은 레코드 선택
-                        current_info_count = sum(1 for v in best_record.values() if v is not None and v != '')
-                        new_info_count = sum(1 for v in record.values() if v is not None and v != '')
-                        
-                        if new_info_count > current_info_count:
-                            best_record = record
-                
-                deduplicated_records.append(best_record)
-                print(f"  선택: sales_division={best_record.get('sales_division', '없음')}")
+    if duplicate_count:
+        print(f"CSV 내 중복이 발견된 회사 수: {duplicate_count}")
     else:
         print("CSV 내 중복 데이터가 없습니다.")
-        deduplicated_records = kotra_records
     
     print(f"중복 제거 후 레코드 수: {len(deduplicated_records)}")
     
+    if backend == 'copy':
+        try:
+            with connect_for_backend(backend) as conn:
+                inserted_count = copy_insert_missing(conn, 'kotra', deduplicated_records, ['company_name_kr'])
+        except Exception as e:
+            print(f"❌ COPY 업로드 중 오류 (전체 롤백): {str(e)}")
+            return
+        
+        print(f"\n=== CSV 업로드 완료 (COPY) ===")
+        print(f"성공: {inserted_count}개")
+        print(f"이미 있는 기업 (건너뜀): {len(deduplicated_records) - inserted_count}개")
+        print(f"총 처리: {len(deduplicated_records)}개")
+        return
+    
+    if use_staging:
+        # 스테이징 테이블에 올린 뒤 서버에서 INSERT ... WHERE NOT EXISTS로 신규 기업만 추가
+        if upload_via_staging(supabase_url, deduplicated_records):
+            return
+        print("클라이언트 측 필터링으로 업로드합니다.")
+    
     # 기존 데이터 확인 (중복 방지)
     existing_companies = set()
     try:
-        existing_data = supabase.table('kotra').select('company_name_kr').execute()
-        existing_companies = {record['company_name_kr'] for record in existing_data.data}
+        existing_companies = {record['company_name_kr'] for record in
+                              iter_table_rows(supabase, 'kotra', columns='company_name_kr')}
         print(f"기존 DB에 있는 기업 수: {len(existing_companies)}")
     except Exception as e:
         print(f"기존 데이터 조회 중 오류: {str(e)}")
@@ -250,35 +372,152 @@ def upload_csv_to_supabase():
     
     print(f"새로 추가할 레코드: {len(new_records)}개")
     
-    # 배치로 데이터 삽입
-    batch_size = 10
-    success_count = 0
+    # 적응형 배치로 데이터 삽입 (실패한 배치는 나눠서 문제 행만 골라냄)
+    report = insert_rows(
+        supabase, 'kotra', new_records,
+        progress=lambda inserted, total: print(f"  진행: {inserted}/{total}개 추가")
+    )
+    success_count = report['inserted']
+    error_count = len(report['errors'])
+    
+    for error in report['errors']:
+        print(f"❌ {error['row'].get('company_name_kr', '')} 추가 오류: {error['error']}")
+    
+    print(f"\n=== CSV 업로드 완료 ===")
+    print(f"성공: {success_count}개")
+    print(f"실패: {error_count}개")
+    print(f"총 처리: {len(new_records)}개")
+
+def sync_csv_to_supabase(csv_file_path=CSV_FILE_PATH, delete_missing=True):
+    """CSV 파일과 kotra 테이블을 행 지문으로 비교해 변경분(추가/수정/삭제)만 반영하는 함수
+    
+    DB에서는 id, company_name_kr, row_hash만 읽으므로 변경이 없으면 가벼운 조회 한 번으로 끝난다.
+    (supabase/migrations/20250902_add_kotra_row_hash.sql 컬럼 필요)
+    """
+    
+    # Supabase 설정 (환경변수에서 가져오기)
+    supabase_url = os.getenv('VITE_SUPABASE_URL')
+    supabase_key = os.getenv('VITE_SUPABASE_KEY')
+    
+    if not supabase_url or not supabase_key:
+        print("Supabase 환경변수가 설정되지 않았습니다.")
+        print("다음 환경변수를 설정해주세요:")
+        print("- VITE_SUPABASE_URL")
+        print("- VITE_SUPABASE_KEY")
+        return
+    
+    # Supabase 클라이언트 생성
+    supabase: Client = create_client(supabase_url, supabase_key)
+    
+    if not os.path.exists(csv_file_path):
+        print(f"CSV 파일을 찾을 수 없습니다: {csv_file_path}")
+        return
+    
+    print("=== CSV ↔ Supabase 동기화 ===")
+    local_records, _ = deduplicate(read_kotra_csv(csv_file_path), key='company_name_kr')
+    print(f"CSV 레코드 수 (중복 제거 후): {len(local_records)}")
+    
+    try:
+        remote_rows = [row for row in iter_table_rows(supabase, 'kotra', columns='id, company_name_kr, row_hash')
+                       if row.get('company_name_kr')]
+    except Exception as e:
+        print(f"❌ 기존 데이터 지문 조회 중 오류: {str(e)}")
+        return
+    print(f"DB 레코드 수: {len(remote_rows)}")
+    
+    # 지문이 아직 없는 행(첫 동기화 전에 올라온 행)만 내용을 읽어 비교
+    remote_contents = {}
+    if any(not row.get('row_hash') for row in remote_rows):
+        try:
+            for row in iter_table_rows(supabase, 'kotra', columns=', '.join(['id'] + SYNC_COLUMNS),
+                                       filters=[('is_', 'row_hash', 'null')]):
+                remote_contents[row['id']] = row
+        except Exception as e:
+            print(f"❌ 지문 없는 행 조회 중 오류: {str(e)}")
+            return
+    
+    inserts, updates, backfills, deletes = diff_kotra_rows(local_records, remote_rows, remote_contents)
+    if not delete_missing:
+        deletes = []
+    
+    print(f"추가: {len(inserts)}개, 수정: {len(updates)}개, 지문 기록: {len(backfills)}개, 삭제: {len(deletes)}개")
+    
+    if not inserts and not updates and not backfills and not deletes:
+        print("✅ 변경된 데이터가 없습니다.")
+        return
+    
     error_count = 0
     
-    for i in range(0, len(new_records), batch_size):
-        batch = new_records[i:i + batch_size]
+    if inserts:
+        report = insert_rows(supabase, 'kotra', inserts)
+        error_count += len(report['errors'])
+        for error in report['errors']:
+            print(f"❌ {error['row'].get('company_name_kr', '')} 추가 오류: {error['error']}")
+        print(f"✅ 추가 완료: {report['inserted']}개")
+    
+    if updates:
+        report = insert_rows(supabase, 'kotra', updates, on_conflict='id')
+        error_count += len(report['errors'])
+        for error in report['errors']:
+            print(f"❌ {error['row'].get('company_name_kr', '')} 수정 오류: {error['error']}")
+        print(f"✅ 수정 완료: {report['inserted']}개")
+    
+    if backfills:
+        report = insert_rows(supabase, 'kotra', backfills, on_conflict='id')
+        error_count += len(report['errors'])
+        for error in report['errors']:
+            print(f"❌ {error['row'].get('company_name_kr', '')} 지문 기록 오류: {error['error']}")
+        print(f"✅ 지문 기록 완료: {report['inserted']}개")
+    
+    removed_count = 0
+    for i in range(0, len(deletes), DELETE_CHUNK_SIZE):
+        chunk = deletes[i:i + DELETE_CHUNK_SIZE]
+        try:
+            result = supabase.table('kotra').delete().in_('id', chunk).execute()
+            removed_count += len(result.data or [])
+        except Exception as e:
+            error_count += len(chunk)
+            print(f"❌ 삭제 오류: ID {chunk[0]}~{chunk[-1]} - {str(e)}")
+    if deletes:
+        print(f"✅ 삭제 완료: {removed_count}개")
+    
+    print(f"\n=== 동기화 완료 ===")
+    print(f"실패: {error_count}개")
+
+def bulk_update_sales_division(supabase, records, chunk_size=BULK_UPDATE_CHUNK_SIZE):
+    """영업조직 정보를 RPC 한 번에 chunk_size개씩 일괄 업데이트하는 함수
+    
+    supabase/migrations/20250901_bulk_update_kotra_sales_division.sql 의 함수를 호출한다.
+    반환값: [(record, 업데이트된 행 수 또는 None, 오류 메시지 또는 None), ...]
+    """
+    results = []
+    
+    for i in range(0, len(records), chunk_size):
+        chunk = records[i:i + chunk_size]
         
         try:
-            result = supabase.table('kotra').insert(batch).execute()
+            response = supabase.rpc('bulk_update_kotra_sales_division', {
+                'p_company_names': [record['company_name_kr'] for record in chunk],
+                'p_sales_divisions': [record['sales_division'] for record in chunk],
+                'p_match_types': [record['sales_division_match_type'] for record in chunk],
+                'p_similarities': [record['sales_division_similarity'] for record in chunk]
+            }).execute()
             
-            if result.data:
-                success_count += len(batch)
-                print(f"✅ 배치 {i//batch_size + 1} 추가 성공: {len(batch)}개")
-            else:
-                error_count += len(batch)
-                print(f"❌ 배치 {i//batch_size + 1} 추가 실패")
+            updated_counts = {row['company_name_kr']: row['updated_count'] for row in (response.data or [])}
+            for record in chunk:
+                results.append((record, updated_counts.get(record['company_name_kr'], 0), None))
                 
         except Exception as e:
-            error_count += len(batch)
-            print(f"❌ 배치 {i//batch_size + 1} 추가 오류: {str(e)}")
+            for record in chunk:
+                results.append((record, None, str(e)))
     
-    print(f"\n=== CSV 업로드 완료 ===")
-    print(f"성공: {success_count}개")
-    print(f"실패: {error_count}개")
-    print(f"총 처리: {len(new_records)}개")
+    return results
 
-def upload_to_supabase():
-    """Supabase에 영업조직 데이터를 업로드하는 함수"""
+def upload_to_supabase(bulk=True):
+    """Supabase에 영업조직 데이터를 업로드하는 함수
+    
+    bulk=True이면 RPC로 일괄 업데이트하고, False이면 기업별로 한 건씩 업데이트한다.
+    """
     
     # Supabase 설정 (환경변수에서 가져오기)
     supabase_url = os.getenv('VITE_SUPABASE_URL')
@@ -304,6 +543,23 @@ def upload_to_supabase():
     success_count = 0
     error_count = 0
     
+    if bulk:
+        for record, updated_count, error in bulk_update_sales_division(supabase, upload_data):
+            if error:
+                error_count += 1
+                print(f"❌ {record['company_name_kr']} 업데이트 오류: {error}")
+            elif updated_count:
+                success_count += 1
+                print(f"✅ {record['company_name_kr']} 업데이트 성공")
+            else:
+                error_count += 1
+                print(f"❌ {record['company_name_kr']} 업데이트 실패 - 매칭되는 레코드 없음")
+        
+        print(f"\n=== 업로드 완료 ===")
+        print(f"성공: {success_count}개")
+        print(f"실패: {error_count}개")
+        return
+    
     for record in upload_data:
         try:
             # company_name_kr로 매칭하여 업데이트
@@ -360,22 +616,9 @@ GROUP BY company_name_kr
 HAVING COUNT(*) > 1
 ORDER BY count DESC;
 
--- 2. 중복 제거 (가장 오래된 레코드 유지, sales_division이 있는 레코드 우선)
-WITH duplicates AS (
-  SELECT id, company_name_kr, sales_division,
-         ROW_NUMBER() OVER (
-           PARTITION BY company_name_kr 
-           ORDER BY 
-             CASE WHEN sales_division IS NOT NULL AND sales_division != '' THEN 0 ELSE 1 END,
-             id
-         ) as rn
-  FROM kotra 
-  WHERE company_name_kr IS NOT NULL AND company_name_kr != ''
-)
-DELETE FROM kotra 
-WHERE id IN (
-  SELECT id FROM duplicates WHERE rn > 1
-);
+-- 2. 중복 제거 (sales_division이 있는 레코드 > 정보가 많은 레코드 > 오래된 레코드 순으로 유지)
+-- supabase/migrations/20250901_remove_kotra_duplicates.sql 함수 실행
+SELECT * FROM remove_kotra_duplicates();
 """
 
 if __name__ == "__main__":
@@ -386,8 +629,9 @@ if __name__ == "__main__":
     print("4. CSV 파일에서 새 데이터 추가")
     print("5. 중복 데이터 확인 및 제거")
     print("6. 중복 제거 SQL")
+    print("7. CSV 파일과 동기화 (변경분만 반영)")
     
-    choice = input("\n선택하세요 (1-6): ")
+    choice = input("\n선택하세요 (1-7): ")
     
     if choice == "1":
         print("\n=== 컬럼 생성 SQL ===")
@@ -401,7 +645,10 @@ if __name__ == "__main__":
         upload_to_supabase()
         
     elif choice == "4":
-        upload_csv_to_supabase()
+        # --copy: PostgREST 대신 Postgres에 직접 연결해 COPY로 업로드
+        # --staging: service role 키(SUPABASE_SERVICE_ROLE_KEY)로 스테이징 테이블을 거쳐 서버에서 병합
+        upload_csv_to_supabase(use_staging='--staging' in sys.argv,
+                               backend='copy' if '--copy' in sys.argv else 'rest')
         
     elif choice == "5":
         check_and_remove_duplicates()
@@ -410,5 +657,8 @@ if __name__ == "__main__":
         print("\n=== 중복 제거 SQL ===")
         print(get_duplicate_removal_sql())
         
+    elif choice == "7":
+        sync_csv_to_supabase()
+        
     else:
         print("잘못된 선택입니다.") 
\ No newline at end of file
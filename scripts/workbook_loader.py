@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+
+import pandas as pd
+
+# 엑셀 워크북 공유 로더
+# 같은 워크북의 여러 시트를 읽을 때 시트마다 pd.read_excel로 파일(zip)을 다시 열고 파싱하지 않도록,
+# 워크북은 한 번만 읽기 전용(openpyxl read_only, 행 스트리밍)으로 열어 두고
+# 파싱한 시트는 실행 중 캐시에 보관해 같은 시트를 다시 요청하면 바로 돌려준다.
+#
+# 파싱한 시트는 디스크(SHEET_CACHE_DIR)에도 Parquet으로 저장해 다음 실행에서는 엑셀을 열지 않고
+# 메모리 맵 Arrow 읽기로 불러온다. 캐시 키는 워크북 내용 해시와 PARSER_VERSION이므로
+# 워크북이 바뀌면 자동으로 새로 파싱한다. (pyarrow가 없으면 디스크 캐시 없이 동작)
+
+# 시트 파싱 결과가 달라지도록 로더를 고치면 올려서 기존 디스크 캐시를 무효화
+PARSER_VERSION = '1'
+SHEET_CACHE_DIR = os.path.join('data', '.sheet_cache')
+
+# 엑셀 셀 값이 섞인 object 컬럼을 Parquet에 저장할 때 타입별로 나눌 값 종류
+_VALUE_TYPES = {'str': str, 'bool': bool, 'int': int, 'float': float}
+
+_workbooks = {}
+_sheets = {}
+_hashes = {}
+
+def _workbook_key(excel_file_path):
+    return os.path.abspath(excel_file_path)
+
+def open_workbook(excel_file_path):
+    """워크북을 한 번만 열어 pd.ExcelFile로 반환하는 함수 (이후 호출은 열린 워크북을 재사용)"""
+    key = _workbook_key(excel_file_path)
+    if key not in _workbooks:
+        _workbooks[key] = pd.ExcelFile(excel_file_path, engine='openpyxl')
+    return _workbooks[key]
+
+def workbook_hash(excel_file_path):
+    """워크북 파일 내용의 SHA-256 (파일 크기/수정 시각이 같으면 다시 계산하지 않음)"""
+    stat = os.stat(excel_file_path)
+    key = (_workbook_key(excel_file_path), stat.st_size, stat.st_mtime_ns)
+    if key not in _hashes:
+        digest = hashlib.sha256()
+        with open(excel_file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        _hashes[key] = digest.hexdigest()
+    return _hashes[key]
+
+def _cache_dir(excel_file_path):
+    """워크북 내용 해시와 파서 버전별 캐시 디렉토리 경로"""
+    stem = os.path.splitext(os.path.basename(excel_file_path))[0]
+    return os.path.join(SHEET_CACHE_DIR, f"{stem}_{workbook_hash(excel_file_path)[:16]}_v{PARSER_VERSION}")
+
+def _cache_file(excel_file_path, sheet_name):
+    safe_name = re.sub(r'[^0-9A-Za-z]+', '_', sheet_name).strip('_')
+    suffix = hashlib.sha1(sheet_name.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(_cache_dir(excel_file_path), f"{safe_name}_{suffix}.parquet")
+
+def _prune_stale_caches(excel_file_path):
+    """같은 워크북의 예전 내용/파서 버전 캐시 디렉토리를 지우는 함수"""
+    current = _cache_dir(excel_file_path)
+    stem = os.path.splitext(os.path.basename(excel_file_path))[0]
+    pattern = re.compile(re.escape(stem) + r'_[0-9a-f]{16}_v.+$')
+    for name in os.listdir(SHEET_CACHE_DIR):
+        path = os.path.join(SHEET_CACHE_DIR, name)
+        if path != current and pattern.match(name) and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+def _to_arrow(df):
+    """DataFrame을 Arrow 테이블로 변환하는 함수
+
+    엑셀 시트는 한 컬럼에 문자열과 숫자가 섞여 있어 그대로는 Parquet에 쓸 수 없으므로,
+    object 컬럼은 값 종류별 하위 컬럼('{위치}:{종류}')으로 나누고 원래 구성은 메타데이터에 남긴다.
+    지원하지 않는 값/컬럼명이 있으면 ValueError
+    """
+    import pyarrow as pa
+
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        raise ValueError("기본 인덱스가 아닌 DataFrame은 캐시하지 않습니다.")
+
+    arrays, names, layout = [], [], []
+    for position, (label, series) in enumerate(df.items()):
+        if not isinstance(label, (str, int, float, bool)):
+            raise ValueError(f"캐시할 수 없는 컬럼명: {label!r}")
+
+        if series.dtype != object:
+            arrays.append(pa.Array.from_pandas(series))
+            names.append(str(position))
+            layout.append({'label': label, 'dtype': str(series.dtype), 'kinds': None})
+            continue
+
+        values = series.tolist()
+        for value in values:
+            if value is not None and type(value) not in _VALUE_TYPES.values():
+                raise ValueError(f"캐시할 수 없는 셀 값 타입: {type(value).__name__}")
+
+        kinds = []
+        for kind, value_type in _VALUE_TYPES.items():
+            part = [value if type(value) is value_type else None for value in values]
+            if any(value is not None for value in part):
+                arrays.append(pa.array(part, type=pa.float64() if kind == 'float' else None))
+                names.append(f"{position}:{kind}")
+                kinds.append(kind)
+        layout.append({'label': label, 'dtype': 'object', 'kinds': kinds})
+
+    table = pa.Table.from_arrays(arrays, names=names) if arrays else pa.table({})
+    metadata = {'layout': layout, 'rows': len(df)}
+    return table.replace_schema_metadata({'workbook_loader': json.dumps(metadata, ensure_ascii=False)})
+
+def _from_arrow(table):
+    """_to_arrow로 저장한 Arrow 테이블을 원래 DataFrame으로 되돌리는 함수"""
+    metadata = json.loads(table.schema.metadata[b'workbook_loader'])
+    rows = metadata['rows']
+
+    columns = {}
+    for position, column in enumerate(metadata['layout']):
+        if column['kinds'] is None:
+            columns[position] = table.column(str(position)).to_pandas().astype(column['dtype'])
+            continue
+
+        values = [None] * rows
+        for kind in column['kinds']:
+            for row, value in enumerate(table.column(f"{position}:{kind}").to_pylist()):
+                if value is not None:
+                    values[row] = value
+        columns[position] = pd.Series(values, dtype=object)
+
+    df = pd.DataFrame(columns, index=pd.RangeIndex(rows))
+    df.columns = [column['label'] for column in metadata['layout']]
+    return df
+
+def _load_cached_sheet(excel_file_path, sheet_name):
+    """디스크 캐시에서 시트를 읽는 함수 (캐시가 없거나 pyarrow가 없으면 None)"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+
+    path = _cache_file(excel_file_path, sheet_name)
+    if not os.path.exists(path):
+        return None
+    try:
+        return _from_arrow(pq.read_table(path, memory_map=True))
+    except Exception:
+        # 손상된 캐시 파일은 무시하고 다시 파싱
+        return None
+
+def _save_cached_sheet(excel_file_path, sheet_name, df):
+    """파싱한 시트를 디스크 캐시에 저장하는 함수 (저장할 수 없는 시트는 건너뜀)"""
+    try:
+        import pyarrow.parquet as pq
+        table = _to_arrow(df)
+    except (ImportError, ValueError):
+        return
+
+    path = _cache_file(excel_file_path, sheet_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _prune_stale_caches(excel_file_path)
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(table, temp_path)
+    os.replace(temp_path, path)
+
+def read_sheet(excel_file_path, sheet_name, use_disk_cache=True):
+    """pd.read_excel(excel_file_path, sheet_name=sheet_name)과 같은 DataFrame을 반환하는 함수
+
+    실행 중 캐시 → 디스크(Parquet) 캐시 → 워크북 파싱 순으로 찾고,
+    호출 측이 수정해도 캐시가 바뀌지 않도록 복사본을 반환한다.
+    """
+    key = (_workbook_key(excel_file_path), sheet_name)
+    if key not in _sheets:
+        df = _load_cached_sheet(excel_file_path, sheet_name) if use_disk_cache else None
+        if df is None:
+            df = open_workbook(excel_file_path).parse(sheet_name)
+            if use_disk_cache:
+                _save_cached_sheet(excel_file_path, sheet_name, df)
+        _sheets[key] = df
+    return _sheets[key].copy()
+
+def get_sheet_names(excel_file_path, use_disk_cache=True):
+    """워크북의 시트 이름 목록 (디스크 캐시에 있으면 워크북을 열지 않음)"""
+    path = os.path.join(_cache_dir(excel_file_path), 'sheet_names.json')
+    if use_disk_cache and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    names = open_workbook(excel_file_path).sheet_names
+    if use_disk_cache:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _prune_stale_caches(excel_file_path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(names, f, ensure_ascii=False)
+    return names
+
+def close_workbooks():
+    """열어 둔 워크북과 시트 캐시를 정리하는 함수 (디스크 캐시는 유지)"""
+    for workbook in _workbooks.values():
+        workbook.close()
+    _workbooks.clear()
+    _sheets.clear()
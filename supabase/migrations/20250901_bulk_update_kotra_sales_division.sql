@@ -0,0 +1,56 @@
+-- KOTRA 영업조직 정보 일괄 업데이트 함수
+-- 기업명별 (sales_division, match_type, similarity) 배열을 받아 UPDATE ... FROM unnest(...) 한 문장으로 반영한다.
+-- 입력 기업명마다 업데이트된 kotra 행 수를 반환하므로 호출 측에서 행 단위 성공/실패를 알 수 있다.
+-- 같은 기업명이 여러 번 들어오면 기존 행 단위 업로드와 같이 마지막 값을 적용한다.
+
+CREATE OR REPLACE FUNCTION bulk_update_kotra_sales_division(
+    p_company_names TEXT[],
+    p_sales_divisions TEXT[],
+    p_match_types TEXT[],
+    p_similarities FLOAT[]
+)
+RETURNS TABLE (
+    company_name_kr TEXT,
+    updated_count INT
+) AS $$
+#variable_conflict use_column
+BEGIN
+    RETURN QUERY
+    WITH input AS (
+        SELECT DISTINCT ON (u.company_name_kr)
+            u.company_name_kr, u.sales_division, u.match_type, u.similarity
+        FROM unnest(p_company_names, p_sales_divisions, p_match_types, p_similarities)
+             WITH ORDINALITY AS u(company_name_kr, sales_division, match_type, similarity, ord)
+        ORDER BY u.company_name_kr, u.ord DESC
+    ),
+    updated AS (
+        UPDATE kotra k
+        SET sales_division = i.sales_division,
+            sales_division_match_type = i.match_type,
+            sales_division_similarity = i.similarity
+        FROM input i
+        WHERE k.company_name_kr = i.company_name_kr
+        RETURNING k.company_name_kr
+    )
+    SELECT i.company_name_kr, COUNT(u.company_name_kr)::INT
+    FROM input i
+    LEFT JOIN updated u ON u.company_name_kr = i.company_name_kr
+    GROUP BY i.company_name_kr;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 사용 예시
+/*
+SELECT * FROM bulk_update_kotra_sales_division(
+    ARRAY['삼성전자', '현대자동차'],
+    ARRAY['Global사업부', '제조사업부'],
+    ARRAY['exact', 'similar'],
+    ARRAY[1.0, 0.85]
+);
+
+-- Python (supabase-py)
+supabase.rpc('bulk_update_kotra_sales_division', {
+    'p_company_names': [...], 'p_sales_divisions': [...],
+    'p_match_types': [...], 'p_similarities': [...]
+}).execute()
+*/
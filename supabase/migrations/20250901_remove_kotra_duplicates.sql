@@ -0,0 +1,64 @@
+-- KOTRA 테이블 중복 제거 함수 (서버 측 일괄 처리)
+-- company_name_kr 기준으로 그룹마다 한 건만 남기고 나머지를 한 번의 DELETE로 삭제한다.
+--
+-- 유지할 레코드 선택 기준 (scripts/upload_to_supabase.py 기존 로직과 동일):
+-- 1. sales_division이 있는 레코드 우선
+-- 2. 비어 있지 않은 컬럼 수가 많은 레코드 우선
+-- 3. ID가 작은 레코드 우선 (더 오래된 데이터)
+
+CREATE OR REPLACE FUNCTION remove_kotra_duplicates()
+RETURNS TABLE (
+    duplicate_companies INT,
+    removed_count INT,
+    remaining_count INT
+) AS $$
+DECLARE
+    v_companies INT;
+    v_removed INT;
+    v_remaining INT;
+BEGIN
+    -- 중복이 있는 회사 수
+    SELECT COUNT(*) INTO v_companies
+    FROM (
+        SELECT company_name_kr
+        FROM kotra
+        WHERE company_name_kr IS NOT NULL AND company_name_kr != ''
+        GROUP BY company_name_kr
+        HAVING COUNT(*) > 1
+    ) d;
+
+    -- 그룹별 순위를 매겨 1순위가 아닌 레코드 삭제
+    WITH ranked AS (
+        SELECT
+            k.id,
+            ROW_NUMBER() OVER (
+                PARTITION BY k.company_name_kr
+                ORDER BY
+                    CASE WHEN k.sales_division IS NOT NULL AND k.sales_division != '' THEN 0 ELSE 1 END,
+                    -- 정보 완성도: NULL/빈 문자열이 아닌 컬럼 수
+                    (SELECT COUNT(*)
+                     FROM jsonb_each_text(to_jsonb(k)) AS f(key, value)
+                     WHERE f.value IS NOT NULL AND f.value != '') DESC,
+                    k.id
+            ) AS rn
+        FROM kotra k
+        WHERE k.company_name_kr IS NOT NULL AND k.company_name_kr != ''
+    )
+    DELETE FROM kotra
+    WHERE id IN (SELECT id FROM ranked WHERE rn > 1);
+
+    GET DIAGNOSTICS v_removed = ROW_COUNT;
+
+    SELECT COUNT(*) INTO v_remaining FROM kotra;
+
+    RETURN QUERY SELECT v_companies, v_removed, v_remaining;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 사용 예시
+/*
+SELECT * FROM remove_kotra_duplicates();
+
+-- Python (supabase-py)
+supabase.rpc('remove_kotra_duplicates').execute()
+*/
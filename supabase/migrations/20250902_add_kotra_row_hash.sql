@@ -0,0 +1,11 @@
+-- KOTRA 테이블 행 지문(row_hash) 컬럼 추가
+-- CSV ↔ DB 동기화 시 id와 row_hash만 조회해 변경된 행을 찾기 위한 컬럼
+-- 값은 scripts/upload_to_supabase.py 의 row_fingerprint()가 계산해 저장한다.
+
+ALTER TABLE kotra
+ADD COLUMN IF NOT EXISTS row_hash TEXT;
+
+COMMENT ON COLUMN kotra.row_hash IS 'CSV 동기화용 행 지문 (동기화 대상 컬럼 값의 MD5)';
+
+-- 동기화 비교 키 조회용 인덱스
+CREATE INDEX IF NOT EXISTS idx_kotra_company_name_kr ON kotra (company_name_kr);
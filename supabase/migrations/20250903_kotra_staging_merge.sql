@@ -0,0 +1,82 @@
+-- KOTRA 스테이징 테이블 및 병합 함수
+-- 클라이언트는 후보 행을 kotra_staging에 batch_id와 함께 일괄 INSERT한 뒤
+-- merge_kotra_staging(batch_id)를 호출해 kotra에 없는 기업만 서버에서 한 번에 추가한다.
+-- 기존 기업명 전체를 클라이언트로 내려받을 필요가 없어, 작업량이 테이블 크기가 아닌 추가분에 비례한다.
+
+CREATE TABLE IF NOT EXISTS kotra_staging (
+    staging_id BIGSERIAL PRIMARY KEY,
+    batch_id TEXT NOT NULL,
+    region TEXT,
+    country TEXT,
+    office TEXT,
+    company_name_kr TEXT,
+    company_name_en TEXT,
+    company_name_cn TEXT,
+    local_address TEXT,
+    local_zipcode TEXT,
+    entry_type TEXT,
+    investment_type TEXT,
+    parent_company TEXT,
+    industry_major TEXT,
+    industry_minor TEXT,
+    sales_division TEXT,
+    sales_division_match_type TEXT,
+    sales_division_similarity FLOAT,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_kotra_staging_batch_id ON kotra_staging (batch_id);
+
+-- 스테이징 테이블은 업로드 스크립트(service role 키)만 사용하므로 anon/authenticated에는 노출하지 않음
+-- 정책을 두지 않고 RLS만 켜면 anon/authenticated는 모든 행이 거부된다.
+-- service_role은 BYPASSRLS 역할이라 정책 없이도 읽고 쓸 수 있으므로 별도 정책을 만들지 않는다.
+ALTER TABLE kotra_staging ENABLE ROW LEVEL SECURITY;
+
+-- 스테이징 배치를 kotra에 병합 (kotra에 같은 company_name_kr이 없는 행만 추가)
+-- kotra.company_name_kr에는 유니크 제약이 없으므로 ON CONFLICT 대신 NOT EXISTS로 거른다.
+-- 배치 안에 같은 기업명이 여러 번 있으면 먼저 올라온 행 하나만 추가한다.
+CREATE OR REPLACE FUNCTION merge_kotra_staging(p_batch_id TEXT)
+RETURNS TABLE (
+    staged_count INT,
+    inserted_count INT,
+    skipped_count INT
+) AS $$
+DECLARE
+    v_staged INT;
+    v_inserted INT;
+BEGIN
+    SELECT COUNT(*) INTO v_staged FROM kotra_staging WHERE batch_id = p_batch_id;
+
+    INSERT INTO kotra (
+        region, country, office, company_name_kr, company_name_en, company_name_cn,
+        local_address, local_zipcode, entry_type, investment_type, parent_company,
+        industry_major, industry_minor, sales_division, sales_division_match_type, sales_division_similarity
+    )
+    SELECT DISTINCT ON (s.company_name_kr)
+        s.region, s.country, s.office, s.company_name_kr, s.company_name_en, s.company_name_cn,
+        s.local_address, s.local_zipcode, s.entry_type, s.investment_type, s.parent_company,
+        s.industry_major, s.industry_minor, s.sales_division, s.sales_division_match_type, s.sales_division_similarity
+    FROM kotra_staging s
+    WHERE s.batch_id = p_batch_id
+      AND s.company_name_kr IS NOT NULL AND s.company_name_kr != ''
+      AND NOT EXISTS (
+          SELECT 1 FROM kotra k WHERE k.company_name_kr = s.company_name_kr
+      )
+    ORDER BY s.company_name_kr, s.staging_id;
+
+    GET DIAGNOSTICS v_inserted = ROW_COUNT;
+
+    -- 병합이 끝난 스테이징 행 정리
+    DELETE FROM kotra_staging WHERE batch_id = p_batch_id;
+
+    RETURN QUERY SELECT v_staged, v_inserted, v_staged - v_inserted;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 사용 예시
+/*
+INSERT INTO kotra_staging (batch_id, company_name_kr, office, sales_division)
+VALUES ('20250903-001', '삼성전자', '첸나이', 'Global사업부');
+
+SELECT * FROM merge_kotra_staging('20250903-001');
+*/
@@ -0,0 +1,27 @@
+-- KOTRA 무역관별 요약 뷰
+-- 무역관(office)별 전체 기업 수, 영업조직 매칭 기업 수, 매칭 비율을 한 번에 조회한다.
+-- 목표 수치 점검 스크립트가 기업 레코드 전체 대신 이 요약만 읽도록 하기 위한 뷰
+-- security_invoker: 뷰 소유자가 아닌 조회하는 역할의 권한/RLS로 kotra를 읽는다 (Postgres 15 이상)
+
+CREATE OR REPLACE VIEW kotra_office_summary
+WITH (security_invoker = true) AS
+SELECT
+    office,
+    COUNT(*)::INT AS total_count,
+    COUNT(*) FILTER (WHERE sales_division IS NOT NULL AND sales_division != '')::INT AS matched_count,
+    ROUND(
+        COUNT(*) FILTER (WHERE sales_division IS NOT NULL AND sales_division != '') * 100.0 / COUNT(*),
+        1
+    ) AS matched_ratio
+FROM kotra
+GROUP BY office;
+
+COMMENT ON VIEW kotra_office_summary IS '무역관별 전체/영업조직 매칭 기업 수 요약';
+
+-- 사용 예시
+/*
+SELECT * FROM kotra_office_summary ORDER BY total_count DESC;
+
+-- Python (supabase-py)
+supabase.table('kotra_office_summary').select('*').execute()
+*/